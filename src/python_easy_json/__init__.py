@@ -2,8 +2,24 @@
 # This file is subject to the terms and conditions defined in the
 # file 'LICENSE', which is part of this source code package.
 #
-from .json_object import JSONObject
+from .aio import awrite_ndjson
+from .backends import JSONBackend, available_backends
+from .columns import to_columns
+from .dates import DateParser, DATEUTIL_PARSER, DEFAULT_PARSER, ISO_PARSER
+from .json_object import JSONObject, compact, set_json_backend
+from .writers import write_objects
 
 __all__ = (
-    JSONObject
+    'awrite_ndjson',
+    'JSONBackend',
+    'available_backends',
+    'DateParser',
+    'DATEUTIL_PARSER',
+    'DEFAULT_PARSER',
+    'ISO_PARSER',
+    'JSONObject',
+    'compact',
+    'set_json_backend',
+    'to_columns',
+    'write_objects'
 )
@@ -0,0 +1,169 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Asyncio readers and writers of NDJSON streams, see JSONObject.aiter_ndjson() and awrite_ndjson().
+#
+import asyncio
+import concurrent.futures
+import typing
+
+from . import readers
+
+# Maximum number of lines loaded, or objects encoded, by each executor task.
+BATCH_SIZE = 100
+# Maximum number of batches read ahead of the consumer.
+MAX_PENDING = 4
+# Number of bytes read from the stream at a time.
+READ_SIZE = 64 * 1024
+
+
+async def iter_batches(reader, batch_size: int = BATCH_SIZE, read_size: int = READ_SIZE) \
+        -> typing.AsyncIterator[list]:
+    """
+    Yield lists of up to 'batch_size' lines read from the stream. The lines of each read are yielded as soon
+    as they are complete, lines may be longer than the stream buffer limit.
+    :param reader: asyncio.StreamReader, or any object with an async 'read()' method.
+    :param batch_size: Maximum number of lines in each list
+    :param read_size: Number of bytes read at a time
+    """
+    parts = list()  # Incomplete line read so far.
+    while True:
+        chunk = await reader.read(read_size)
+        if not chunk:
+            break
+        nl = b'\n' if isinstance(chunk, bytes) else '\n'
+        if nl not in chunk:
+            parts.append(chunk)
+            continue
+        lines = chunk.split(nl)
+        if parts:
+            parts.append(lines[0])
+            lines[0] = chunk[:0].join(parts)
+        parts = [lines.pop()]
+        for x in range(0, len(lines), batch_size):
+            yield lines[x:x + batch_size]
+    if parts and parts[0]:
+        yield [parts[0][:0].join(parts)]
+
+
+def load_lines(cls: type, lines: list, first_line: int, cast_types: typing.Union[bool, str], ordered: bool,
+               lazy: bool, skip_invalid: bool, collect_errors: bool) -> tuple:
+    """
+    Executor task creating an object for each line, blank lines are ignored. See readers.iter_ndjson().
+    :return: (objects, errors, exception) tuple, errors are (line number, line, exception) tuples, or None.
+             The exception is the error raised by an invalid line, the objects are the lines before it.
+    """
+    errors = list() if collect_errors else None
+    objs = list()
+    exc = None
+    try:
+        for obj in readers.iter_ndjson(lines, cls._get_loader(cast_types, ordered, lazy), skip_invalid, errors,
+                                       loads=cls.__json_backend__.loads):
+            objs.append(obj)
+    except Exception as e:
+        exc = e
+    if errors:
+        errors = [(x + first_line - 1, line, e) for x, line, e in errors]
+    return objs, errors, exc
+
+
+async def aiter_ndjson(cls: type, reader, cast_types: typing.Union[bool, str] = False, ordered: bool = False,
+                       lazy: bool = False, batch_size: int = BATCH_SIZE,
+                       executor: typing.Optional[concurrent.futures.Executor] = None, max_pending: int = MAX_PENDING,
+                       skip_invalid: bool = False, errors: typing.Optional[list] = None,
+                       read_size: int = READ_SIZE) -> typing.AsyncIterator:
+    """
+    Async generator yielding an object for each line read from the stream, see JSONObject.aiter_ndjson().
+    """
+    if batch_size < 1:
+        raise ValueError(f"ValueError: invalid batch size '{batch_size}'")
+    if max_pending < 1:
+        raise ValueError(f"ValueError: invalid number of pending batches '{max_pending}'")
+    loop = asyncio.get_running_loop()
+    # Loading batches, in line order. Reading stops while the queue is full.
+    queue = asyncio.Queue(maxsize=max_pending)
+
+    async def produce():
+        line = 1
+        try:
+            async for lines in iter_batches(reader, batch_size, read_size):
+                await queue.put(loop.run_in_executor(executor, load_lines, cls, lines, line, cast_types, ordered,
+                                                     lazy, skip_invalid, errors is not None))
+                line += len(lines)
+        except Exception as e:
+            # Raise stream errors in the consumer, after the objects read before the error.
+            failed = loop.create_future()
+            failed.set_exception(e)
+            await queue.put(failed)
+        await queue.put(None)
+
+    task = loop.create_task(produce())
+    try:
+        while True:
+            future = await queue.get()
+            if future is None:
+                break
+            objs, batch_errors, exc = await future
+            if batch_errors:
+                errors.extend(batch_errors)
+            for obj in objs:
+                yield obj
+            if exc is not None:
+                # Raised after the objects of the lines before the invalid line, like iter_ndjson().
+                raise exc
+    finally:
+        # The consumer stopped early or a batch failed, stop reading and drop the batches not started yet.
+        task.cancel()
+        while not queue.empty():
+            future = queue.get_nowait()
+            if future is not None:
+                future.cancel()
+
+
+def encode_lines(objs: list) -> bytes:
+    """ Executor task encoding the objects as UTF-8 NDJSON lines """
+    return ''.join([obj.to_json() + '\n' for obj in objs]).encode('utf-8')
+
+
+async def awrite_ndjson(objs: typing.Union[typing.Iterable, typing.AsyncIterable], writer,
+                        batch_size: int = BATCH_SIZE,
+                        executor: typing.Optional[concurrent.futures.Executor] = None) -> int:
+    """
+    Write model objects to a stream as NDJSON (JSON Lines), one object per line. Objects are encoded in
+    batches by the executor, after each batch the writer is drained, waiting while the stream buffer is full.
+    Objects must not be changed until they are written. The lines are the same as 'write_objects()' writes.
+    :param objs: Iterable or async iterable of JSONObject objects, may be a generator.
+    :param writer: asyncio.StreamWriter, or any object with a 'write()' method and an async 'drain()' method.
+    :param batch_size: Maximum number of objects encoded by each executor task.
+    :param executor: Executor encoding the objects, by default the event loop default executor.
+    :return: Number of objects written
+    """
+    if batch_size < 1:
+        raise ValueError(f"ValueError: invalid batch size '{batch_size}'")
+    loop = asyncio.get_running_loop()
+    count = 0
+    batch = list()
+
+    async def write_batch():
+        writer.write(await loop.run_in_executor(executor, encode_lines, batch))
+        await writer.drain()
+
+    if hasattr(objs, '__aiter__'):
+        async for obj in objs:
+            batch.append(obj)
+            if len(batch) == batch_size:
+                await write_batch()
+                count += len(batch)
+                batch = list()
+    else:
+        for obj in objs:
+            batch.append(obj)
+            if len(batch) == batch_size:
+                await write_batch()
+                count += len(batch)
+                batch = list()
+    if batch:
+        await write_batch()
+        count += len(batch)
+    return count
@@ -0,0 +1,197 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# JSON encoding and decoding backends, see the JSONObject 'json_backend' class argument.
+#
+import enum
+import importlib
+import importlib.util
+import json
+import math
+import typing
+import uuid
+
+# Types accepted as JSON documents, bytes-like documents are passed to the backend without decoding them first.
+DOCUMENT_TYPES = (str, bytes, bytearray, memoryview)
+# Value types every backend encodes the same way.
+_PLAIN_TYPES = frozenset((str, int, bool, type(None)))
+
+
+def _encodes_natively(obj) -> bool:
+    """
+    Return False if the value contains non-finite floats, which 'orjson' encodes as null instead of NaN or
+    Infinity, or values 'orjson' and the 'json' module encode differently. IE: 'orjson' encodes Enum members
+    as their value and UUID objects as strings instead of passing them to 'default', and passes float
+    subclasses to 'default' instead of encoding them as numbers.
+    :param obj: Value to encode
+    """
+    stack = [obj]
+    while stack:
+        v = stack.pop()
+        t = type(v)
+        if t in _PLAIN_TYPES:
+            continue
+        if t is float:
+            if not math.isfinite(v):
+                return False
+        elif t is dict:
+            stack.extend(v.values())
+        elif t is list or t is tuple:
+            stack.extend(v)
+        elif isinstance(v, (enum.Enum, uuid.UUID, float)):
+            return False
+        elif isinstance(v, (dict, list, tuple)):
+            stack.extend(v.values() if isinstance(v, dict) else v)
+    return True
+
+
+class JSONBackend:
+    """
+    JSON backend using the python standard library 'json' module. Other backends decode the same documents
+    to the same values and encode values to the same JSON data, whitespace and escaping may differ.
+    """
+    name = 'json'
+    module = None  # Name of the module used by the backend.
+
+    def loads(self, s: typing.Union[str, bytes, bytearray, memoryview]):
+        """
+        Decode a JSON document, raises json.JSONDecodeError if the document is not valid.
+        :param s: JSON document, bytes-like documents may be encoded as UTF-8, UTF-16 or UTF-32.
+        """
+        if isinstance(s, memoryview):
+            # Decode the buffer directly, like the 'json' module does for bytes.
+            s = str(s, json.detect_encoding(bytes(s[:4])), 'surrogatepass')
+        return json.loads(s)
+
+    def dumps(self, obj, default: typing.Callable = None, indent: int = None) -> str:
+        """
+        Encode the value as a JSON string.
+        :param obj: Value to encode
+        :param default: Function returning a serializable version of values which can not be serialized.
+        :param indent: Positive integer value for formatting JSON string indenting.
+        """
+        return json.dumps(obj, default=default, indent=indent)
+
+    def iterencode(self, obj, default: typing.Callable = None, indent: int = None) -> typing.Iterator[str]:
+        """
+        Encode the value as JSON, yielding the JSON string in chunks. The chunks joined are the same as the
+        'dumps()' result.
+        :param obj: Value to encode
+        :param default: Function returning a serializable version of values which can not be serialized.
+        :param indent: Positive integer value for formatting JSON string indenting.
+        """
+        return json.JSONEncoder(default=default, indent=indent).iterencode(obj)
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.name}>'
+
+
+class OrjsonBackend(JSONBackend):
+    """
+    JSON backend using 'orjson'. Output has no whitespace after separators and non-ASCII characters are
+    not escaped. Values containing NaN, Infinity or Enum members are encoded by the 'json' module.
+    """
+    name = 'orjson'
+    module = 'orjson'
+
+    def __init__(self):
+        self.orjson = importlib.import_module('orjson')
+        # Datetime values are passed to the 'default' function, like the 'json' module does.
+        self.option = self.orjson.OPT_NON_STR_KEYS | self.orjson.OPT_PASSTHROUGH_DATETIME | \
+                      self.orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def loads(self, s: typing.Union[str, bytes, bytearray, memoryview]):
+        try:
+            return self.orjson.loads(s)
+        except self.orjson.JSONDecodeError:
+            # The 'json' module also accepts NaN, Infinity and integers larger than 64-bit, and raises the
+            # same errors as the default backend.
+            return super().loads(s)
+
+    def dumps(self, obj, default: typing.Callable = None, indent: int = None) -> str:
+        # Only an indent of 2 is supported.
+        if (indent is None or indent == 2) and _encodes_natively(obj):
+            option = self.option | self.orjson.OPT_INDENT_2 if indent else self.option
+            try:
+                return self.orjson.dumps(obj, default=default, option=option).decode('utf-8')
+            except self.orjson.JSONEncodeError:
+                pass
+        return super().dumps(obj, default, indent)
+
+    def iterencode(self, obj, default: typing.Callable = None, indent: int = None) -> typing.Iterator[str]:
+        # No incremental encoder, the value is encoded at once.
+        return iter((self.dumps(obj, default, indent),))
+
+
+class UjsonBackend(JSONBackend):
+    """ JSON backend using 'ujson'. Output has no whitespace after separators. """
+    name = 'ujson'
+    module = 'ujson'
+
+    def __init__(self):
+        self.ujson = importlib.import_module('ujson')
+
+    def loads(self, s: typing.Union[str, bytes, bytearray, memoryview]):
+        try:
+            return self.ujson.loads(s if isinstance(s, (str, bytes)) else bytes(s))
+        except ValueError:
+            return super().loads(s)
+
+    def dumps(self, obj, default: typing.Callable = None, indent: int = None) -> str:
+        try:
+            return self.ujson.dumps(obj, default=default, indent=indent or 0, escape_forward_slashes=False)
+        except (OverflowError, TypeError):
+            return super().dumps(obj, default, indent)
+
+    def iterencode(self, obj, default: typing.Callable = None, indent: int = None) -> typing.Iterator[str]:
+        # No incremental encoder, the value is encoded at once.
+        return iter((self.dumps(obj, default, indent),))
+
+
+class SimdjsonBackend(JSONBackend):
+    """ JSON backend decoding with 'pysimdjson', encoding uses the 'json' module. """
+    name = 'simdjson'
+    module = 'simdjson'
+
+    def __init__(self):
+        self.simdjson = importlib.import_module('simdjson')
+
+    def loads(self, s: typing.Union[str, bytes, bytearray, memoryview]):
+        try:
+            return self.simdjson.loads(s if isinstance(s, (str, bytes)) else bytes(s))
+        except ValueError:
+            return super().loads(s)
+
+
+# Backends in order of preference for 'auto'.
+BACKENDS = {
+    'orjson': OrjsonBackend,
+    'ujson': UjsonBackend,
+    'simdjson': SimdjsonBackend,
+    'json': JSONBackend,
+}
+
+_instances = dict()
+
+
+def available_backends() -> typing.List[str]:
+    """ Return the names of the backends which may be used, in order of preference """
+    return [name for name, cls_ in BACKENDS.items()
+            if cls_.module is None or importlib.util.find_spec(cls_.module) is not None]
+
+
+def get_backend(backend: typing.Union[str, JSONBackend] = 'auto') -> JSONBackend:
+    """
+    Return the backend object for the backend name.
+    :param backend: Backend name, 'auto' for the fastest backend available or a JSONBackend object.
+    """
+    if isinstance(backend, JSONBackend):
+        return backend
+    if backend == 'auto':
+        backend = available_backends()[0]
+    if backend not in BACKENDS:
+        raise ValueError(f"ValueError: unknown JSON backend '{backend}', use one of {list(BACKENDS)}")
+    if backend not in _instances:
+        _instances[backend] = BACKENDS[backend]()
+    return _instances[backend]
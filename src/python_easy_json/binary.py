@@ -0,0 +1,541 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Binary serialization of model objects, see JSONObject.to_bytes() and JSONObject.from_bytes().
+#
+# Values are encoded with their Python type, so decoding never casts values. Nested objects are decoded to
+# the annotated model class of the property, and Enum values to the member of the annotated Enum class.
+#
+# Format:  header (magic, format version, codec)  followed by the codec payload of the object data.
+#
+import datetime
+import decimal
+import enum
+import importlib
+import struct
+import typing
+
+from .storage import instance_data
+
+MAGIC = b'PEJB'
+# Format version, incremented when the encoding changes. Data of newer versions can not be decoded.
+VERSION = 1
+CODECS = ('struct', 'msgpack')
+
+_HEADER = struct.Struct('<4sBB')
+
+# Value tags of the 'struct' codec, also used as msgpack extension type codes.
+T_NONE, T_TRUE, T_FALSE, T_INT8, T_INT64, T_BIGINT, T_FLOAT, T_STR8, T_STR32, T_BYTES, T_LIST, T_DICT, \
+    T_OBJECT, T_DATETIME, T_DATE, T_TIME, T_DECIMAL, T_ENUM = range(18)
+
+_TAG = struct.Struct('<B')
+_TAG_INT8 = struct.Struct('<Bb')
+_TAG_INT64 = struct.Struct('<Bq')
+_TAG_FLOAT = struct.Struct('<Bd')
+_TAG_LEN8 = struct.Struct('<BB')
+_TAG_LEN32 = struct.Struct('<BI')
+_INT8 = struct.Struct('<b')
+_INT64 = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+_LEN8 = struct.Struct('<B')
+_LEN32 = struct.Struct('<I')
+_DATETIME = struct.Struct('<HBBBBBIB')
+_DATE = struct.Struct('<HBB')
+_TIME = struct.Struct('<BBBIB')
+
+# Errors raised by decoding corrupt or truncated data, raised as ValueError by the codecs.
+_DECODE_ERRORS = (struct.error, IndexError, KeyError, TypeError, ValueError, AttributeError, OverflowError,
+                  decimal.InvalidOperation)
+_INVALID = 'ValueError: invalid binary data'
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+# Time zone kinds, stored in the low bits of the date and time flags. The 'fold' attribute is bit 2.
+_TZ_NAIVE, _TZ_OFFSET, _TZ_ZONE = range(3)
+_FOLD = 4
+
+
+def _raise_invalid(e: Exception):
+    """ Raise the error of decoding corrupt or truncated data as ValueError """
+    if isinstance(e, ValueError) and str(e).startswith(_INVALID):
+        raise e
+    raise ValueError(f'{_INVALID}, {type(e).__name__}: {e}') from e
+
+
+def _check_end(buf, end: int):
+    """ Raise ValueError if a value ending at the position is longer than the remaining data """
+    if end > len(buf):
+        raise ValueError(f'{_INVALID}, truncated data')
+
+
+class RawObject(dict):
+    """ Data of a nested object decoded by msgpack, converted to the annotated model class afterwards """
+    __slots__ = ()
+
+
+class RawEnum:
+    """ Enum value decoded by msgpack, converted to the annotated Enum member afterwards """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _pack_str(v: str) -> bytes:
+    """ Return the length prefixed UTF-8 bytes of a time zone key """
+    b = v.encode('utf-8')
+    return _LEN8.pack(len(b)) + b
+
+
+def _tz_flags(tzinfo: typing.Optional[datetime.tzinfo], offset: typing.Optional[datetime.timedelta]) \
+        -> typing.Tuple[int, bytes]:
+    """ Return the time zone kind and encoded time zone of a date or time value """
+    if tzinfo is None:
+        return _TZ_NAIVE, b''
+    key = getattr(tzinfo, 'key', None)
+    if isinstance(key, str):
+        return _TZ_ZONE, _pack_str(key)  # IE: zoneinfo.ZoneInfo
+    # Other time zones are stored as the fixed UTC offset of the value.
+    return _TZ_OFFSET, _INT64.pack(offset // datetime.timedelta(microseconds=1))
+
+
+def pack_datetime(v: datetime.datetime) -> bytes:
+    """ Return the encoded datetime value """
+    kind, tz = _tz_flags(v.tzinfo, v.utcoffset())
+    return _DATETIME.pack(v.year, v.month, v.day, v.hour, v.minute, v.second, v.microsecond,
+                          kind | (_FOLD if v.fold else 0)) + tz
+
+
+def pack_time(v: datetime.time) -> bytes:
+    """ Return the encoded time value """
+    kind, tz = _tz_flags(v.tzinfo, v.utcoffset())
+    return _TIME.pack(v.hour, v.minute, v.second, v.microsecond, kind | (_FOLD if v.fold else 0)) + tz
+
+
+def _unpack_tz(buf, pos: int, flags: int) -> typing.Tuple[typing.Optional[datetime.tzinfo], int]:
+    """ Return the decoded time zone and the position following it """
+    kind = flags & 3
+    if kind == _TZ_NAIVE:
+        return None, pos
+    if kind == _TZ_OFFSET:
+        offset, = _INT64.unpack_from(buf, pos)
+        return datetime.timezone(datetime.timedelta(microseconds=offset)), pos + 8
+    n = buf[pos]
+    _check_end(buf, pos + 1 + n)
+    key = str(buf[pos + 1:pos + 1 + n], 'utf-8')
+    return importlib.import_module('zoneinfo').ZoneInfo(key), pos + 1 + n
+
+
+def unpack_datetime(buf, pos: int) -> typing.Tuple[datetime.datetime, int]:
+    """ Return the decoded datetime value and the position following it """
+    y, m, d, hh, mm, ss, us, flags = _DATETIME.unpack_from(buf, pos)
+    tz, pos = _unpack_tz(buf, pos + _DATETIME.size, flags)
+    return datetime.datetime(y, m, d, hh, mm, ss, us, tz, fold=1 if flags & _FOLD else 0), pos
+
+
+def unpack_time(buf, pos: int) -> typing.Tuple[datetime.time, int]:
+    """ Return the decoded time value and the position following it """
+    hh, mm, ss, us, flags = _TIME.unpack_from(buf, pos)
+    tz, pos = _unpack_tz(buf, pos + _TIME.size, flags)
+    return datetime.time(hh, mm, ss, us, tz, fold=1 if flags & _FOLD else 0), pos
+
+
+def object_items(obj, base: type) -> typing.Iterable[tuple]:
+    """
+    Return the (key, value) pairs of the object data, lazily loaded values are loaded first.
+    :param obj: Model object
+    :param base: JSONObject class
+    """
+    lazy = obj.__lazy__
+    if lazy:
+        for k in list(lazy):
+            getattr(obj, k)
+    if obj.__single_storage__:
+        return instance_data(obj).items()
+    return obj.__data_dict__.items()
+
+
+def nested_class(field, base: type) -> type:
+    """ Return the model class of nested objects of the property """
+    t = field.nested_cls if field is not None else base
+    return t if isinstance(t, type) and issubclass(t, base) else base
+
+
+def enum_member(field, v):
+    """ Return the member of the annotated Enum class for the value, or the value if there is none """
+    if field is not None:
+        for table in field.enum_tables.values():
+            m = table.get(v)
+            if m is not None:
+                return m
+    return v
+
+
+def restore(cls: type, data: dict):
+    """ Create an object of the model class holding the decoded data, without casting the values """
+    obj = cls.__new__(cls)
+    obj.__setstate__((data, None))
+    if cls.__track_changes__:
+        obj.mark_clean()
+    return obj
+
+
+class StructCodec:
+    """ Binary encoding using only the 'struct' module """
+    name = 'struct'
+
+    def __init__(self, base: type):
+        """
+        :param base: JSONObject class
+        """
+        self.base = base
+
+    def dumps(self, obj) -> bytes:
+        """ Return the encoded object data """
+        out = list()
+        self._encode(obj, out.append)
+        return b''.join(out)
+
+    def _encode(self, v, append: typing.Callable):
+        """ Append the encoded value """
+        t = type(v)
+        if t is str:
+            b = v.encode('utf-8', 'surrogatepass')
+            n = len(b)
+            append(_TAG_LEN8.pack(T_STR8, n) if n < 256 else _TAG_LEN32.pack(T_STR32, n))
+            append(b)
+        elif t is int:
+            if -128 <= v < 128:
+                append(_TAG_INT8.pack(T_INT8, v))
+            elif _INT64_MIN <= v <= _INT64_MAX:
+                append(_TAG_INT64.pack(T_INT64, v))
+            else:
+                b = str(v).encode('ascii')
+                append(_TAG_LEN32.pack(T_BIGINT, len(b)))
+                append(b)
+        elif v is None:
+            append(_TAG.pack(T_NONE))
+        elif t is bool:
+            append(_TAG.pack(T_TRUE if v else T_FALSE))
+        elif t is float:
+            append(_TAG_FLOAT.pack(T_FLOAT, v))
+        elif isinstance(v, self.base):
+            items = object_items(v, self.base)
+            append(_TAG_LEN32.pack(T_OBJECT, len(items)))
+            for k, i in items:
+                self._encode(k, append)
+                self._encode(i, append)
+        elif isinstance(v, enum.Enum):
+            append(_TAG.pack(T_ENUM))
+            self._encode(v.value, append)
+        elif isinstance(v, (list, tuple)):
+            append(_TAG_LEN32.pack(T_LIST, len(v)))
+            for i in v:
+                self._encode(i, append)
+        elif isinstance(v, datetime.datetime):
+            append(_TAG.pack(T_DATETIME))
+            append(pack_datetime(v))
+        elif isinstance(v, datetime.date):
+            append(_TAG.pack(T_DATE))
+            append(_DATE.pack(v.year, v.month, v.day))
+        elif isinstance(v, datetime.time):
+            append(_TAG.pack(T_TIME))
+            append(pack_time(v))
+        elif isinstance(v, dict):
+            append(_TAG_LEN32.pack(T_DICT, len(v)))
+            for k, i in v.items():
+                self._encode(k, append)
+                self._encode(i, append)
+        elif isinstance(v, decimal.Decimal):
+            b = str(v).encode('ascii')
+            append(_TAG_LEN32.pack(T_DECIMAL, len(b)))
+            append(b)
+        elif isinstance(v, (bytes, bytearray, memoryview)):
+            append(_TAG_LEN32.pack(T_BYTES, len(v)))
+            append(bytes(v))
+        # Subclasses of the basic types, except bool, which can not be subclassed.
+        elif isinstance(v, str):
+            self._encode(str(v), append)
+        elif isinstance(v, int):
+            self._encode(int(v), append)
+        elif isinstance(v, float):
+            self._encode(float(v), append)
+        else:
+            raise TypeError(f"TypeError: can not encode value of type '{t.__name__}'")
+
+    def loads(self, cls: type, buf: bytes, pos: int):
+        """ Return the decoded object, starting at the position """
+        if len(buf) <= pos or buf[pos] != T_OBJECT:
+            raise ValueError('ValueError: binary data does not hold an object')
+        try:
+            obj, pos = self._decode_object(buf, pos + 1, cls)
+        except _DECODE_ERRORS as e:
+            _raise_invalid(e)
+        if pos != len(buf):
+            raise ValueError('ValueError: invalid binary data, unexpected data after the object')
+        return obj
+
+    def _decode_object(self, buf: bytes, pos: int, cls: type) -> tuple:
+        """
+        Return the decoded object and the position following it.
+        :param buf: Encoded data
+        :param pos: Position following the object tag
+        :param cls: Model class of the object
+        """
+        n, = _LEN32.unpack_from(buf, pos)
+        pos += 4
+        fields = cls._get_schema().fields
+        data = cls.__dict_cls__()
+        decode = self._decode
+        size = len(buf)
+        for _ in range(n):
+            # Short string keys and the most common values are decoded here instead of calling '_decode()'.
+            if buf[pos] == T_STR8:
+                end = pos + 2 + buf[pos + 1]
+                if end > size:
+                    _check_end(buf, end)
+                k = buf[pos + 2:end].decode('utf-8', 'surrogatepass')
+                pos = end
+            else:
+                k, pos = decode(buf, pos, None, None)
+            tag = buf[pos]
+            if tag == T_STR8:
+                end = pos + 2 + buf[pos + 1]
+                if end > size:
+                    _check_end(buf, end)
+                data[k] = buf[pos + 2:end].decode('utf-8', 'surrogatepass')
+                pos = end
+            elif tag == T_INT8:
+                data[k] = _INT8.unpack_from(buf, pos + 1)[0]
+                pos += 2
+            elif tag == T_NONE:
+                data[k] = None
+                pos += 1
+            else:
+                data[k], pos = decode(buf, pos, None, fields.get(k))
+        return restore(cls, data), pos
+
+    def _decode(self, buf: bytes, pos: int, cls: typing.Optional[type], field) -> tuple:
+        """
+        Return the decoded value and the position following it.
+        :param buf: Encoded data
+        :param pos: Position of the value tag
+        :param cls: Model class of object values, if known.
+        :param field: FieldSchema of the property holding the value, if annotated.
+        """
+        tag = buf[pos]
+        pos += 1
+        if tag == T_STR8:
+            n = buf[pos]
+            pos += 1
+            _check_end(buf, pos + n)
+            return buf[pos:pos + n].decode('utf-8', 'surrogatepass'), pos + n
+        if tag == T_INT8:
+            return _INT8.unpack_from(buf, pos)[0], pos + 1
+        if tag == T_NONE:
+            return None, pos
+        if tag == T_OBJECT:
+            return self._decode_object(buf, pos, cls or nested_class(field, self.base))
+        if tag == T_INT64:
+            return _INT64.unpack_from(buf, pos)[0], pos + 8
+        if tag == T_FLOAT:
+            return _FLOAT.unpack_from(buf, pos)[0], pos + 8
+        if tag == T_TRUE:
+            return True, pos
+        if tag == T_FALSE:
+            return False, pos
+        if tag == T_DATETIME:
+            return unpack_datetime(buf, pos)
+        if tag == T_DATE:
+            return datetime.date(*_DATE.unpack_from(buf, pos)), pos + _DATE.size
+        if tag == T_LIST:
+            n, = _LEN32.unpack_from(buf, pos)
+            pos += 4
+            values = list()
+            for _ in range(n):
+                v, pos = self._decode(buf, pos, None, field)
+                values.append(v)
+            return values, pos
+        if tag == T_ENUM:
+            v, pos = self._decode(buf, pos, None, None)
+            return enum_member(field, v), pos
+        if tag == T_DICT:
+            n, = _LEN32.unpack_from(buf, pos)
+            pos += 4
+            data = dict()
+            for _ in range(n):
+                k, pos = self._decode(buf, pos, None, None)
+                data[k], pos = self._decode(buf, pos, None, None)
+            return data, pos
+        if tag == T_TIME:
+            return unpack_time(buf, pos)
+        if tag in (T_STR32, T_BIGINT, T_DECIMAL, T_BYTES):
+            n, = _LEN32.unpack_from(buf, pos)
+            pos += 4
+            _check_end(buf, pos + n)
+            b = buf[pos:pos + n]
+            if tag == T_STR32:
+                v = b.decode('utf-8', 'surrogatepass')
+            elif tag == T_BYTES:
+                v = b
+            else:
+                v = int(b.decode('ascii')) if tag == T_BIGINT else decimal.Decimal(b.decode('ascii'))
+            return v, pos + n
+        raise ValueError(f"ValueError: invalid binary data, unknown value tag '{tag}'")
+
+
+class MsgpackCodec:
+    """
+    Binary encoding using the 'msgpack' package. Values msgpack does not support, and nested objects, are
+    encoded as msgpack extension types.
+    """
+    name = 'msgpack'
+
+    def __init__(self, base: type):
+        """
+        :param base: JSONObject class
+        """
+        self.base = base
+        self.msgpack = importlib.import_module('msgpack')
+
+    def _pack(self, v) -> bytes:
+        # Strict types pass Enum members and other subclasses of the basic types to '_default()'.
+        return self.msgpack.packb(v, default=self._default, use_bin_type=True, strict_types=True)
+
+    def _default(self, v):
+        """ Return a msgpack supported version of the value """
+        ext = self.msgpack.ExtType
+        if isinstance(v, self.base):
+            return ext(T_OBJECT, self._pack(dict(object_items(v, self.base))))
+        if isinstance(v, enum.Enum):
+            return ext(T_ENUM, self._pack(v.value))
+        if isinstance(v, datetime.datetime):
+            return ext(T_DATETIME, pack_datetime(v))
+        if isinstance(v, datetime.date):
+            return ext(T_DATE, _DATE.pack(v.year, v.month, v.day))
+        if isinstance(v, datetime.time):
+            return ext(T_TIME, pack_time(v))
+        if isinstance(v, decimal.Decimal):
+            return ext(T_DECIMAL, str(v).encode('ascii'))
+        for t in (dict, list, str, bytes, bool, int, float):
+            if isinstance(v, t):
+                return t(v)
+        if isinstance(v, (tuple, bytearray, memoryview)):
+            return list(v) if isinstance(v, tuple) else bytes(v)
+        raise TypeError(f"TypeError: can not encode value of type '{type(v).__name__}'")
+
+    def dumps(self, obj) -> bytes:
+        """ Return the encoded object data """
+        try:
+            return self._pack(obj)
+        except OverflowError as e:
+            raise ValueError(f'ValueError: msgpack can not encode integers larger than 64-bit, {e}') from e
+
+    def _ext_hook(self, code: int, data: bytes):
+        """ Return the decoded extension type value """
+        if code == T_OBJECT:
+            return RawObject(self._unpack(data))
+        if code == T_ENUM:
+            return RawEnum(self._unpack(data))
+        if code == T_DATETIME:
+            return unpack_datetime(data, 0)[0]
+        if code == T_DATE:
+            return datetime.date(*_DATE.unpack(data))
+        if code == T_TIME:
+            return unpack_time(data, 0)[0]
+        if code == T_DECIMAL:
+            return decimal.Decimal(str(data, 'ascii'))
+        return self.msgpack.ExtType(code, data)
+
+    def _unpack(self, data):
+        return self.msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+    def loads(self, cls: type, buf: bytes, pos: int):
+        """ Return the decoded object, starting at the position """
+        try:
+            data = self._unpack(memoryview(buf)[pos:])
+        except Exception as e:
+            # msgpack raises its own exception types for corrupt data.
+            _raise_invalid(e)
+        if not isinstance(data, RawObject):
+            raise ValueError('ValueError: binary data does not hold an object')
+        try:
+            return self._build(cls, data)
+        except _DECODE_ERRORS as e:
+            _raise_invalid(e)
+
+    def _build(self, cls: type, data: RawObject):
+        """ Create the object of the model class, converting nested objects and Enum values """
+        fields = cls._get_schema().fields
+        result = cls.__dict_cls__()
+        for k, v in data.items():
+            if type(v) in (RawObject, RawEnum, list, dict):
+                v = self._convert(v, fields.get(k))
+            result[k] = v
+        return restore(cls, result)
+
+    def _convert(self, v, field):
+        """ Return the value with nested objects and Enum values converted """
+        t = type(v)
+        if t is RawObject:
+            return self._build(nested_class(field, self.base), v)
+        if t is RawEnum:
+            return enum_member(field, v.value)
+        if t is list:
+            return [self._convert(i, field) for i in v]
+        if t is dict:
+            return {k: self._convert(i, None) for k, i in v.items()}
+        return v
+
+
+_instances = dict()
+
+
+def get_codec(name: str, base: type):
+    """
+    Return the codec object.
+    :param name: Codec name, one of CODECS.
+    :param base: JSONObject class
+    """
+    codec = _instances.get((name, base))
+    if codec is None:
+        if name == 'struct':
+            codec = StructCodec(base)
+        elif name == 'msgpack':
+            codec = MsgpackCodec(base)
+        else:
+            raise ValueError(f"ValueError: unknown binary codec '{name}', use one of {list(CODECS)}")
+        _instances[(name, base)] = codec
+    return codec
+
+
+def dumps(obj, codec: str, base: type) -> bytes:
+    """
+    Return the object encoded with the binary format.
+    :param obj: Model object
+    :param codec: Codec name, one of CODECS.
+    :param base: JSONObject class
+    """
+    c = get_codec(codec, base)
+    return _HEADER.pack(MAGIC, VERSION, CODECS.index(c.name)) + c.dumps(obj)
+
+
+def loads(cls: type, data: typing.Union[bytes, bytearray, memoryview], base: type):
+    """
+    Return the object decoded from the binary format, the codec is read from the header.
+    :param cls: Model class of the object
+    :param data: Encoded data
+    :param base: JSONObject class
+    """
+    buf = data if isinstance(data, bytes) else bytes(data)
+    if len(buf) < _HEADER.size:
+        raise ValueError('ValueError: invalid binary data, missing header')
+    magic, version, codec = _HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError('ValueError: invalid binary data, unknown format')
+    if version > VERSION:
+        raise ValueError(f"ValueError: unsupported binary format version '{version}', expected {VERSION} or lower")
+    if codec >= len(CODECS):
+        raise ValueError(f"ValueError: unknown binary codec '{codec}'")
+    return get_codec(CODECS[codec], base).loads(cls, buf, _HEADER.size)
@@ -0,0 +1,67 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Cached exports of model objects, see the JSONObject 'cache_exports' class argument.
+#
+import typing
+import weakref
+
+
+class ExportCache:
+    """
+    Exported JSON strings and dicts of an object, and the parent objects whose cached exports contain the
+    object. Changing the object discards its cached exports and notifies each parent, so parents never
+    return exports of stale nested objects.
+    """
+    __slots__ = ('owner', 'exports', 'parents')
+
+    def __init__(self, owner: int):
+        """
+        :param owner: Object id of the object, shallow copies of the object share the '__dict__' values
+                      including the cache and must not use it.
+        """
+        self.owner = owner
+        # Exported values keyed by the export arguments, None until the object has been tracked.
+        self.exports: typing.Optional[dict] = None
+        self.parents: typing.Optional[weakref.WeakSet] = None
+
+    def __reduce__(self):
+        # Copied and unpickled objects start with an empty cache and no parents.
+        return ExportCache, (None,)
+
+    def add_parent(self, parent):
+        """
+        Notify the parent object when this object changes.
+        :param parent: JSONObject object holding this object as a property value, or in a list property value.
+        """
+        if self.parents is None:
+            self.parents = weakref.WeakSet()
+        self.parents.add(parent)
+
+    def invalidate(self):
+        """ Discard the cached exports of the object and of every parent object, recursively """
+        self.exports = None
+        parents = self.parents
+        if parents:
+            # Parents register again the next time they cache an export.
+            self.parents = None
+            for parent in parents:
+                parent.__export_cache__.invalidate()
+
+
+def copy_export(value):
+    """
+    Return a copy of a cached exported dict, nested dicts and lists are copied as well. Cached exports are
+    shared by every caller, the copy may be changed without changing the cache.
+    :param value: Exported dict, or a value of it.
+    """
+    if isinstance(value, dict):
+        value = value.copy()
+        for k, v in value.items():
+            if isinstance(v, (dict, list)):
+                value[k] = copy_export(v)
+        return value
+    if isinstance(value, list):
+        return [copy_export(i) if isinstance(i, (dict, list)) else i for i in value]
+    return value
@@ -0,0 +1,46 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Changed property tracking of model objects, see JSONObject.mark_clean() and JSONObject.to_patch().
+#
+
+
+class ChangeTracker:
+    """
+    Properties changed since an object was marked clean. Property writes are recorded by '__setattr__()',
+    list and dict values are compared to a shallow copy to detect changes made in place.
+    """
+    __slots__ = ('keys', 'changed', 'values')
+
+    def __init__(self, data: dict):
+        """
+        :param data: Object data when the object is marked clean
+        """
+        self.keys = frozenset(data)
+        self.changed = set()
+        self.values = {k: (list(v) if isinstance(v, list) else dict(v))
+                       for k, v in data.items() if isinstance(v, (list, dict))}
+
+    def copy(self) -> 'ChangeTracker':
+        """ Return a tracker of a copied object, the changes of the copies are tracked separately """
+        tracker = ChangeTracker.__new__(ChangeTracker)
+        tracker.keys = self.keys
+        tracker.changed = set(self.changed)
+        tracker.values = dict(self.values)
+        return tracker
+
+    def snapshot(self, key: str, value):
+        """
+        Replace the copy of a list or dict value, used when a lazily loaded value is converted to objects.
+        :param key: Property name
+        :param value: Property value
+        """
+        if isinstance(value, (list, dict)):
+            self.values[key] = list(value) if isinstance(value, list) else dict(value)
+
+
+def escape_pointer(key: str) -> str:
+    """ Escape a property name for use in a JSON pointer (RFC 6901) """
+    return key.replace('~', '~0').replace('/', '~1')
+
@@ -0,0 +1,137 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Generate a specialized, straight-line constructor for a JSONObject model class.
+#
+import typing
+
+from .backends import DOCUMENT_TYPES
+from .schema import ModelSchema, is_simple_type
+
+
+def make_init(model: type, schema: ModelSchema, base_cls: type) -> typing.Callable:
+    """
+    Generate the source code of a constructor specialized for the model class and 'exec' it. The
+    generated constructor must produce objects identical to the generic JSONObject.__init__() code path.
+    :param model: JSONObject model class
+    :param schema: Compiled model schema
+    :param base_cls: The JSONObject class, used for nested values of properties that are not annotated.
+    :return: function(self, data, cast_types, ordered)
+    """
+    fields = list(schema.fields.values())
+    # Names available to the generated code as closure variables.
+    env = {
+        'dict_cls': model.__dict_cls__,
+        'loads': model.__json_backend__.loads,
+        'document_types': DOCUMENT_TYPES,
+        'clean_key': model._clean_key,
+        'clean_value': model._clean_value,
+        'convert_list': model._convert_list,
+        'nested_types': (dict, list),
+        'nested_cls': {f.name: f.nested_cls for f in fields},
+        'base_cls': base_cls,
+    }
+    # Only inline key and value cleaning when the default implementation has not been overridden.
+    inline_clean = model._clean_key is base_cls._clean_key and model._clean_value is base_cls._clean_value
+
+    # Single storage objects keep their data directly in the object '__dict__'.
+    single_storage = model.__single_storage__
+    if single_storage:
+        lines = [
+            'def __init__(self, data, cast_types, ordered):',
+            '    dd = self.__dict__',
+            '    if isinstance(data, document_types):',
+            '        data = loads(data)',
+            '    if data:',
+            '        nested = []',
+            '        for k, v in data.items():',
+        ]
+    else:
+        lines = [
+            'def __init__(self, data, cast_types, ordered):',
+            '    self_dict = self.__dict__',
+            "    self_dict['__data_dict__'] = dd = dict_cls()",
+            '    if isinstance(data, document_types):',
+            '        data = loads(data)',
+            '    if data:',
+            "        self_dict['__nested_keys__'] = nested = []",
+            '        for k, v in data.items():',
+        ]
+    if inline_clean:
+        lines += [
+            '            if k.__class__ is not str:',
+            '                k = clean_key(k)',
+            "            elif '-' in k:",
+            "                k = k.replace('-', '_')",
+            '            if isinstance(v, nested_types):',
+            '                nested.append(k)',
+            '            elif isinstance(v, bytes):',
+            "                v = str(v, 'utf-8')",
+            '            dd[k] = v',
+        ]
+    else:
+        lines += [
+            '            k = clean_key(k)',
+            '            if isinstance(v, nested_types):',
+            '                nested.append(k)',
+            '            dd[k] = clean_value(v)',
+        ]
+    lines += [
+        '    else:',
+        '        nested = ()' if single_storage else "        self_dict['__nested_keys__'] = nested = dict_cls()",
+    ]
+
+    # Inline casting of each annotated property.
+    if fields:
+        lines.append('    if cast_types is True:')
+        for x, f in enumerate(fields):
+            env[f'types_{x}'] = f.types
+            lines += [
+                f'        v = dd.get({f.name!r})',
+                f'        if v is not None and v.__class__ not in types_{x} and not isinstance(v, nested_types):',
+            ]
+            if len(f.types) == 1 and is_simple_type(f.types[0]):
+                env[f'type_{x}'] = f.types[0]
+                lines += [
+                    '            try:',
+                    f'                dd[{f.name!r}] = type_{x}(v)',
+                    '            except (TypeError, ValueError):',
+                    '                pass',
+                ]
+            else:
+                env[f'cast_{x}'] = f.cast
+                lines.append(f'            dd[{f.name!r}] = cast_{x}(v)')
+
+    # Default values for any properties missing from the data.
+    for x, (k, v) in enumerate(schema.defaults):
+        env[f'default_{x}'] = v
+        lines += [
+            f'    if {k!r} not in dd:',
+            f'        dd[{k!r}] = default_{x}',
+        ]
+
+    # Nested dict and list values.
+    lines += [
+        '    for k in nested:',
+        '        v = dd[k]',
+        '        t = nested_cls.get(k, base_cls)',
+        '        if isinstance(v, dict):',
+        '            try:',
+        '                dd[k] = t(v, cast_types=cast_types, ordered=ordered)',
+        '            except TypeError:',
+        '                raise TypeError(f"TypeError: error casting to type \'{str(t)}\' for property \'{k}\'")',
+        '        elif isinstance(v, list):',
+        '            dd[k] = convert_list(t, v, cast_types, ordered)',
+    ]
+    if not single_storage:
+        lines.append('    self_dict.update(dd)')
+
+    # Bind the environment as closure variables of the generated function, like the 'dataclasses' module does.
+    body = '\n'.join(f'    {line}' for line in lines)
+    src = f"def __create_fn__({', '.join(env.keys())}):\n{body}\n    return __init__"
+    ns = dict()
+    exec(src, {}, ns)
+    fn = ns['__create_fn__'](**env)
+    fn.__qualname__ = f'{model.__qualname__}.__init__'
+    return fn
@@ -0,0 +1,109 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Columnar export of model objects, see to_columns().
+#
+import array
+import datetime
+import importlib
+import typing
+
+from .json_object import JSONObject
+from .storage import instance_data
+
+# 'array.array' type codes of annotated numeric property types.
+ARRAY_TYPECODES = {int: 'q', float: 'd'}
+# NumPy dtypes of annotated property types.
+NUMPY_DTYPES = {int: 'int64', float: 'float64', bool: 'bool'}
+
+_MISSING = object()
+# Types of values exported unchanged, checked before the slower isinstance() checks.
+_PLAIN_TYPES = frozenset((str, int, float, bool, type(None), datetime.datetime, datetime.date))
+
+
+def _export(v):
+    """ Export a property value like JSONObject.to_dict() does """
+    if isinstance(v, JSONObject):
+        return v.to_dict()
+    if isinstance(v, list):
+        return [i.to_dict() if isinstance(i, JSONObject) else i for i in v]
+    return v
+
+
+def _numeric_column(col: list, t: type) -> typing.Union[array.array, list]:
+    """ Return the column as an 'array.array' if every value is of the numeric type, otherwise unchanged """
+    if all(type(v) is t for v in col):
+        try:
+            return array.array(ARRAY_TYPECODES[t], col)
+        except OverflowError:
+            pass  # Integers larger than 64-bit.
+    return col
+
+
+def _numpy_column(np, col: typing.Union[array.array, list], t: typing.Optional[type]):
+    """ Return the column as a NumPy masked array, masking missing values """
+    if isinstance(col, array.array):
+        # Numeric columns without missing values share the array buffer.
+        return np.ma.masked_array(np.frombuffer(col, dtype=NUMPY_DTYPES[t]))
+    mask = np.fromiter((v is None for v in col), dtype=bool, count=len(col))
+    if t in NUMPY_DTYPES:
+        try:
+            values = np.array([t() if v is None else v for v in col], dtype=NUMPY_DTYPES[t])
+            return np.ma.masked_array(values, mask=mask)
+        except (TypeError, ValueError, OverflowError):
+            pass  # Values which have not been cast, or integers larger than 64-bit.
+    return np.ma.masked_array(np.fromiter(col, dtype=object, count=len(col)), mask=mask)
+
+
+def to_columns(objs: typing.Iterable, fields: typing.Optional[typing.Sequence[str]] = None,
+               numpy: bool = False) -> dict:
+    """
+    Export model objects as a dict of columns, one list of values for each property, in a single pass over
+    the objects. The columns are the same as exporting each object with 'to_dict()' and transposing the
+    dicts, properties missing from an object are None. Columns of properties annotated as int or float are
+    'array.array' objects when every value is of the annotated type.
+    :param objs: Iterable of objects of the same model class, may be a generator.
+    :param fields: Property names to export, by default every property found in the objects, in the order
+                   first found.
+    :param numpy: Return NumPy masked arrays, with missing values masked. Properties annotated as int, float
+                  or bool use a numeric dtype, others use the object dtype. Requires NumPy.
+    :return: Dict of property names and columns
+    """
+    np = importlib.import_module('numpy') if numpy else None
+    columns = {k: list() for k in fields} if fields is not None else dict()
+    fixed = fields is not None
+    schema = None
+    count = 0
+    for obj in objs:
+        if schema is None:
+            schema = obj._get_schema()
+        # Lazily loaded values may need loading or casting to be exported the same as 'to_dict()'.
+        if obj.__lazy__:
+            data = obj.to_dict()
+        else:
+            data = instance_data(obj) if obj.__single_storage__ else obj.__data_dict__
+        found = 0
+        for k, col in columns.items():
+            v = data.get(k, _MISSING)
+            if v is _MISSING:
+                col.append(None)
+                continue
+            found += 1
+            col.append(v if type(v) in _PLAIN_TYPES else _export(v))
+        if not fixed and found < len(data):
+            for k, v in data.items():
+                if k not in columns:
+                    columns[k] = [None] * count
+                    columns[k].append(_export(v))
+        count += 1
+
+    fields_schema = schema.fields if schema is not None else dict()
+    for k, col in columns.items():
+        field = fields_schema.get(k)
+        t = field.types[0] if field is not None and len(field.types) == 1 else None
+        if t in ARRAY_TYPECODES:
+            col = columns[k] = _numeric_column(col, t)
+        if np is not None:
+            columns[k] = _numpy_column(np, col, t)
+    return columns
@@ -0,0 +1,134 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Date and datetime parsing used when casting values, see the JSONObject 'date_parser' class argument.
+#
+import datetime
+import functools
+import typing
+
+from dateutil import parser as dt_parser
+
+# Common date formats tried after ISO 8601, these are parsed the same way by dateutil.
+COMMON_FORMATS = (
+    '%Y/%m/%d %H:%M:%S',
+    '%Y/%m/%d',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y',
+)
+
+_EPOCH_UNITS = {None: None, 'seconds': 1, 'milliseconds': 1000}
+
+
+class CacheInfo(typing.NamedTuple):
+    """ Parse cache statistics of a DateParser """
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class DateParser:
+    """
+    Date and datetime parsing strategy of a model class. Values are parsed with 'datetime.fromisoformat()'
+    first, then the fixed formats, and finally with the 'dateutil' parser.
+    """
+    __slots__ = ('iso', 'formats', 'epoch', 'fallback', 'cache_size', '_divisor', '_datetime', '_date')
+
+    def __init__(self, iso: bool = True, formats: typing.Sequence[str] = COMMON_FORMATS,
+                 epoch: typing.Optional[str] = None, fallback: bool = True, cache_size: int = 0):
+        """
+        :param iso: Try to parse ISO 8601 strings with 'datetime.fromisoformat()'.
+        :param formats: 'datetime.strptime()' formats to try if the value is not an ISO 8601 string.
+        :param epoch: Parse int and float values as a Unix timestamp, either 'seconds' or 'milliseconds'.
+                      Timestamps are converted to UTC datetime values.
+        :param fallback: Parse the value with the 'dateutil' parser if all else fails, otherwise
+                         raise ValueError.
+        :param cache_size: Keep up to this many parsed datetime values, and as many date values, in a least
+                           recently used cache keyed by the value parsed. Useful when the same values repeat
+                           often, like batch timestamps.
+        """
+        if epoch not in _EPOCH_UNITS:
+            raise ValueError(f"ValueError: invalid epoch unit '{epoch}', use 'seconds' or 'milliseconds'")
+        self.iso = iso
+        self.formats = tuple(formats)
+        self.epoch = epoch
+        self.fallback = fallback
+        self._divisor = _EPOCH_UNITS[epoch]
+        self.cache_size = cache_size
+        self._datetime = self._parse_datetime
+        self._date = self._parse_date
+        if cache_size:
+            # Parsed values are immutable, so cached values may be shared between objects and threads.
+            self._datetime = functools.lru_cache(maxsize=cache_size, typed=True)(self._parse_datetime)
+            self._date = functools.lru_cache(maxsize=cache_size, typed=True)(self._parse_date)
+
+    def __repr__(self):
+        return f'DateParser(iso={self.iso}, formats={self.formats}, epoch={self.epoch!r}, ' \
+               f'fallback={self.fallback}, cache_size={self.cache_size})'
+
+    def cache_info(self) -> CacheInfo:
+        """ Return the parse cache statistics, combined for date and datetime values """
+        if not self.cache_size:
+            return CacheInfo(0, 0, 0, 0)
+        dt_info = self._datetime.cache_info()
+        d_info = self._date.cache_info()
+        return CacheInfo(dt_info.hits + d_info.hits, dt_info.misses + d_info.misses, self.cache_size * 2,
+                         dt_info.currsize + d_info.currsize)
+
+    def cache_clear(self):
+        """ Remove all parsed values from the cache and reset the statistics """
+        if self.cache_size:
+            self._datetime.cache_clear()
+            self._date.cache_clear()
+
+    def parse_datetime(self, v) -> datetime.datetime:
+        """
+        Parse the value to a datetime.
+        :param v: Value to parse
+        """
+        return self._datetime(v)
+
+    def parse_date(self, v) -> datetime.date:
+        """
+        Parse the value to a date.
+        :param v: Value to parse
+        """
+        return self._date(v)
+
+    def _parse_datetime(self, v) -> datetime.datetime:
+        """ Parse the value to a datetime without using the cache """
+        if self._divisor and isinstance(v, (int, float)) and not isinstance(v, bool):
+            return datetime.datetime.fromtimestamp(v / self._divisor, datetime.timezone.utc)
+        s = str(v)
+        if self.iso:
+            try:
+                return datetime.datetime.fromisoformat(s)
+            except ValueError:
+                pass
+        for fmt in self.formats:
+            try:
+                return datetime.datetime.strptime(s, fmt)
+            except ValueError:
+                pass
+        if self.fallback:
+            return dt_parser.parse(s)
+        raise ValueError(f"ValueError: unable to parse date value '{s}'")
+
+    def _parse_date(self, v) -> datetime.date:
+        """ Parse the value to a date without using the cache """
+        if self.iso and isinstance(v, str) and len(v) == 10:
+            try:
+                return datetime.date.fromisoformat(v)
+            except ValueError:
+                pass
+        return self._parse_datetime(v).date()
+
+
+# Try ISO 8601 and common formats before falling back to the 'dateutil' parser, used by default.
+DEFAULT_PARSER = DateParser()
+# Only parse ISO 8601 strings, never guess.
+ISO_PARSER = DateParser(formats=(), fallback=False)
+# Parse every value with the 'dateutil' parser.
+DATEUTIL_PARSER = DateParser(iso=False, formats=())
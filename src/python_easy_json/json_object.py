@@ -2,27 +2,32 @@
 # This file is subject to the terms and conditions defined in the
 # file 'LICENSE', which is part of this source code package.
 #
+import concurrent.futures
 import datetime
-import enum
-import json
+import os
 import re
 import sys
 import typing
 
 from collections import OrderedDict
-from dateutil import parser as dt_parser
 from json import JSONDecodeError
 
-# 3.14 introduced lazy annotation loading, we must use the 'annotationlib' to inspect annotations.
-if not (sys.version_info.major == 3 and sys.version_info.minor < 14):
-    from annotationlib import get_annotations, Format as annot_format
-
-_enum_t = type(enum.Enum)
+from . import aio, binary, parallel, readers, writers
+from .cache import ExportCache, copy_export
+from .changes import ChangeTracker, escape_pointer
+from .backends import DOCUMENT_TYPES, JSONBackend, get_backend
+from .codegen import make_init
+from .dates import DEFAULT_PARSER, DateParser
+from .schema import ModelSchema, bump_generation, collect_annotations
+from .lazy import RawExportError, install_lazy_attributes, is_shadowed, raw_to_dict, raw_to_json
+from .storage import InstanceDictStorage, SlotStorage, compact_getattr, compact_setattr, instance_data
+from .views import ColumnTable, make_view_class, make_views
 
 # Support OrderedDict for Python versions 3.6 or below.
 _OLD_DICT_VERSION = True if sys.version_info.major == 3 and sys.version_info.minor < 7 else False
 _REGEX_HIDDEN_PROP = re.compile(r'__')
-
+# Hidden properties of the object '__dict__' left out of the pickled state, see JSONObject.__getstate__().
+_UNPICKLED_PROPS = frozenset(('__data_dict__', '__nested_keys__', '__export_cache__'))
 class JSONObject:
     """
     Simple object to recursively convert a dict or json string to object properties
@@ -30,6 +35,16 @@ class JSONObject:
     # Support OrderedDict for Python versions 3.6 or below.
     __dict_cls__ = OrderedDict if _OLD_DICT_VERSION is True else dict
     __data_dict__ = None  # Holds a clean copy of the data added to this object.
+    __codegen__ = False  # Use a generated constructor specialized for the model class.
+    __single_storage__ = False  # Store data only in the object '__dict__', see 'InstanceDictStorage'.
+    __date_parser__ = DEFAULT_PARSER  # Date and datetime parsing strategy used when casting values.
+    __json_backend__ = get_backend('json')  # JSON encoder and decoder, see 'set_json_backend()'.
+    __compact__ = None  # Compact model classes store data in '__slots__', see 'compact()'.
+    __lazy__ = None  # Raw values waiting to be converted to objects or cast, see 'self._load_lazy()'.
+    __cache_exports__ = False  # Cache exported JSON strings and dicts until the object changes.
+    __export_cache__ = None  # Cached exports and parent objects to notify of changes, see 'ExportCache'.
+    __track_changes__ = False  # Track changed properties from construction, see 'self.mark_clean()'.
+    __changes__ = None  # Properties changed since the object was marked clean, see 'ChangeTracker'.
 
     @staticmethod
     def _get_annot_cls(annots: dict, key: str, ignore_builtins = False) -> typing.List:
@@ -67,25 +82,86 @@ class JSONObject:
 
         return cls_types
 
-    def _collect_annotations(self, cls_: object):
+    @classmethod
+    def _get_schema(cls) -> ModelSchema:
         """
-        Recursively collect annotation dictionary values from class and base classes.
-        :param cls_: Child object to inspect
+        Return the compiled annotation schema for this class, compiling it on first use.
         """
-        annots = dict()
-        if hasattr(cls_, '__bases__') and cls_.__bases__:
-            for base in cls_.__bases__:
-                if base.__name__ == 'object':
-                    continue
-                result = self._collect_annotations(base)
-                annots.update(result)
-        # 3.14 introduced breaking changes to annotation inspection due to lazy annotation loading.
-        if sys.version_info.major == 3 and sys.version_info.minor < 14:
-            if hasattr(cls_, '__annotations__'):
-                annots.update(cls_.__annotations__)
-        else:
-            annots.update(get_annotations(cls_, format=annot_format.VALUE))
-        return annots
+        # Look in the class dict directly, a subclass must never use the schema of a parent class.
+        schema = cls.__dict__.get('__schema__')
+        if schema is None or schema.stale:
+            schema = ModelSchema(cls)
+            type.__setattr__(cls, '__schema__', schema)
+        return schema
+
+    @classmethod
+    def invalidate_schema(cls):
+        """
+        Discard the compiled annotation schema for this class and all subclasses. Replaced class attribute
+        defaults, annotations and date parsers are detected automatically, call this after changing the
+        annotations dict in place.
+        """
+        if '__schema__' in cls.__dict__:
+            type.__delattr__(cls, '__schema__')
+        for sub_cls in cls.__subclasses__():
+            sub_cls.invalidate_schema()
+
+    @classmethod
+    def _get_init(cls) -> typing.Optional[typing.Callable]:
+        """
+        Return the generated constructor for this class, generating it on first use.
+        Returns None if the class overrides '__setattr__()', which the generated constructor bypasses.
+        """
+        schema = cls._get_schema()
+        if schema.init is None:
+            schema.init = make_init(cls, schema, JSONObject) if cls.__setattr__ is JSONObject.__setattr__ else False
+        return schema.init or None
+
+    def __init_subclass__(cls, codegen: bool = None, single_storage: bool = None,
+                          date_parser: DateParser = None, json_backend: typing.Union[str, JSONBackend] = None,
+                          cache_exports: bool = None, track_changes: bool = None, **kwargs):
+        """
+        :param codegen: Construct objects of this class using a generated constructor specialized for the class.
+        :param single_storage: Store data only in the object '__dict__', instead of also keeping a copy in
+                               '__data_dict__'. In this mode every object attribute is exported as data, except
+                               hidden attributes, IE: names containing '__' such as private attributes.
+        :param date_parser: Date and datetime parsing strategy used when casting values, see 'DateParser'.
+        :param json_backend: JSON encoder and decoder name or object, see 'set_json_backend()'.
+        :param cache_exports: Cache the results of 'to_json()' and 'to_dict()' until this object, or a nested
+                              object, changes. Cached dicts are shared and must not be modified.
+        :param track_changes: Track the properties changed since the object was constructed, see
+                              'self.changed_fields()' and 'self.to_patch()'.
+        """
+        super().__init_subclass__(**kwargs)
+        if codegen is not None:
+            cls.__codegen__ = codegen
+        if single_storage is not None:
+            cls.__single_storage__ = single_storage
+            cls.__data_dict__ = InstanceDictStorage() if single_storage else None
+        if date_parser is not None:
+            cls.__date_parser__ = date_parser
+        if json_backend is not None:
+            cls.__json_backend__ = get_backend(json_backend)
+        if cache_exports is not None:
+            cls.__cache_exports__ = cache_exports
+        if track_changes is not None:
+            cls.__track_changes__ = track_changes
+        # Every '__dict__' value of single storage objects is exported, there is no place for the cache or
+        # change tracking.
+        if cls.__cache_exports__ and cls.__single_storage__:
+            raise TypeError(f"TypeError: '{cls.__name__}' uses single storage and can not cache exports")
+        if cls.__track_changes__ and cls.__single_storage__:
+            raise TypeError(f"TypeError: '{cls.__name__}' uses single storage and can not track changes")
+        if cls.__compact__ is not None and '__compact_base__' not in cls.__dict__:
+            # The slots of a compact class are fixed, class attribute defaults of new properties would hide
+            # the values stored in the overflow dict.
+            added = [k for k in collect_annotations(cls) if k.isidentifier() and '__' not in k and
+                     k not in cls.__compact__.names]
+            if added:
+                raise TypeError(f"TypeError: '{cls.__name__}' adds properties to compact class "
+                                f"'{cls.__compact_base__.__name__}', apply 'compact' to a subclass of the "
+                                f"original model class instead")
+        bump_generation()
 
     @staticmethod
     def _clean_key(k):
@@ -103,129 +179,472 @@ class JSONObject:
             return str(v, 'utf-8')
         return v
 
-    @classmethod
-    def _cast_to_type(cls, annots, k, v):
-        """ Try to cast the value to the type"""
-        if k not in annots or v is None:
-            return v
-
-        # Support Unions types which may have multiple types defined.
-        annot_types = cls._get_annot_cls(annots, k)
-        # Check to see if the value is already in the correct type.
-        if type(v) in annot_types:
-            return v
-
-        for t in annot_types:
-            if t == datetime.date and not isinstance(v, datetime.date):
-                v = dt_parser.parse(str(v)).date()
-            elif t == datetime.datetime and not isinstance(v, datetime.datetime):
-                v = dt_parser.parse(str(v))
-            elif isinstance(t, _enum_t):
-                # Try setting the Enum class by value
+    @staticmethod
+    def _convert_list(t: type, values: list, cast_types: bool, ordered: bool, lazy: bool = False) -> list:
+        """
+        Convert dict values, or JSON strings of dict values, in a list to objects.
+        :param t: Class to convert the dict values to.
+        :param values: List of values
+        :param cast_types: If properties of this class are type annotated, try to cast them.
+        :param ordered: Use OrderedDict() if set, otherwise use dict().
+        :param lazy: Load nested values of the objects when first accessed.
+        """
+        is_model = isinstance(t, type) and issubclass(t, JSONObject)
+        kwargs = {'lazy': True} if lazy and is_model else {}
+        loads = t.__json_backend__.loads if is_model else JSONObject.__json_backend__.loads
+        _tmp = list()
+        for i in values:
+            if isinstance(i, dict):
+                _tmp.append(t(i, cast_types=cast_types, ordered=ordered, **kwargs))
+            elif isinstance(i, str):
                 try:
-                    v = t(v)
-                    break
-                except ValueError:
-                    # try converting type to string and set Enum class by value.
-                    try:
-                        v = t(str(v))
-                        break
-                    except ValueError:
-                        # Try setting the Enum value by Key instead of value
-                        # Hyphens in an enum property is not allowed, convert to underscore.
-                        if isinstance(v, str) and '-' in v:
-                            v = v.replace('-', '_')
-                        v = t[str(v)]
-                        break
+                    _tmp_data = loads(i)
+                    if _tmp_data and isinstance(_tmp_data, dict):
+                        _tmp.append(t(_tmp_data, cast_types=cast_types, ordered=ordered, **kwargs))
+                    else:
+                        _tmp.append(i)  # For when the value is a string = 'null'.
+                except JSONDecodeError:
+                    _tmp.append(i)
             else:
-                try:
-                    v = t(v)
-                    break
-                except (TypeError, ValueError):
-                    pass
+                _tmp.append(i)
+        return _tmp
 
+    def _convert_nested(self, t: type, k: str, v, cast_types: bool, ordered: bool, lazy: bool = False):
+        """
+        Convert a nested dict value, or list of dict values, to objects.
+        :param t: Class to convert the dict values to.
+        :param k: Property name
+        :param v: Property value
+        :param cast_types: If properties of this class are type annotated, try to cast them.
+        :param ordered: Use OrderedDict() if set, otherwise use dict().
+        :param lazy: Load nested values of the objects when first accessed.
+        """
+        if isinstance(v, dict):
+            try:
+                if lazy and isinstance(t, type) and issubclass(t, JSONObject):
+                    return t(v, cast_types=cast_types, ordered=ordered, lazy=True)
+                return t(v, cast_types=cast_types, ordered=ordered)
+            except TypeError:
+                raise TypeError(f"TypeError: error casting to type '{str(t)}' for property '{k}'")
+        elif isinstance(v, list):
+            return self._convert_list(t, v, cast_types, ordered, lazy)
         return v
 
-    def __init__(self, data: typing.Union[typing.Dict, str, None] = None, cast_types: bool = False,
-                 ordered: bool = False):
+    def _load_lazy(self, key: str):
+        """
+        Convert a lazily loaded nested value to objects, or cast a lazily cast value, and store it.
+        :param key: Property name
+        :return: Property value
+        """
+        # The value stays pending if converting or casting raises, so the error is raised again on access.
+        raw, t, cast_types, ordered = self.__lazy__[key]
+        if t is None:
+            value = self._get_schema().fields[key].cast(raw)
+        else:
+            value = self._convert_nested(t, key, raw, cast_types, ordered, lazy=True)
+        self._store_value(key, value)
+        self.__lazy__.pop(key)
+        if self.__changes__ is not None and t is not None:
+            # Loading is not a change, track the loaded objects from here on.
+            self.__changes__.snapshot(key, value)
+            self._mark_nested_clean(value)
+        if self.__export_cache__ is not None:
+            # Cast values are exported differently and loaded objects are not tracked yet.
+            self.__export_cache__.invalidate()
+        return value
+
+    def _store_value(self, key: str, value):
+        """
+        Store a property value, without the side effects of 'self.__setattr__()'.
+        :param key: Property name
+        :param value: Property value
+        """
+        if self.__compact__ is not None:
+            self.__compact__.set(self, key, value)
+            return
+        if not self.__single_storage__:
+            self.__data_dict__[key] = value
+        object.__setattr__(self, key, value)
+
+    def __getattr__(self, key):
+        # Only called when normal attribute lookup fails, check for lazily loaded values.
+        lazy = self.__lazy__
+        if lazy and key in lazy:
+            return self._load_lazy(key)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{key}'")
+
+    def __init__(self, data: typing.Union[typing.Dict, str, bytes, bytearray, memoryview, None] = None,
+                 cast_types: typing.Union[bool, str] = False, ordered: bool = False, lazy: bool = False):
         """
         Load the dictionary or JSON string data argument into ourselves as properties.
-        :param data: Dictionary or valid JSON string.
-        :param cast_types: If properties of this class are type annotated, try to cast them.
+        :param data: Dictionary or valid JSON string. JSON documents may also be bytes, bytearray or memoryview
+                     objects, which are passed to the JSON backend without decoding them first.
+        :param cast_types: If properties of this class are type annotated, try to cast them. If 'lazy', cast
+                           values when first accessed, values never accessed are exported unchanged.
         :param ordered: Use OrderedDict() if set, otherwise use dict().
+        :param lazy: Convert nested dict values and lists of dict values to objects when first accessed.
+                     Ignored by single storage model classes.
         """
         # 'self.__data_dict__' may have data already due to self.__setattr__ being called before reaching here.
-        if self.__data_dict__ is None:
-            self.__data_dict__ = self.__dict_cls__()
+        single_storage = self.__single_storage__
+        compact_storage = self.__compact__
+        if single_storage:
+            # Single storage objects can not hide raw values from attribute access.
+            lazy = False
+            if cast_types == 'lazy':
+                cast_types = True
+        lazy_cast = cast_types == 'lazy'
+        dd = self.__data_dict__
+        if dd is None or (single_storage and not dd):
+            if self.__codegen__ is True and not lazy and not lazy_cast:
+                init = self._get_init()
+                if init is not None:
+                    init(self, data, cast_types, ordered)
+                    if self.__track_changes__:
+                        self.mark_clean()
+                    return
+            if dd is None:
+                dd = self.__data_dict__ = self.__dict_cls__()
 
-        if isinstance(data, str):
-            data = json.loads(data)
+        if isinstance(data, DOCUMENT_TYPES):
+            data = self.__json_backend__.loads(data)
 
-        # Collect the class annotations, along with any base class annotations.
-        annots = self._collect_annotations(self.__class__)
+        # Compiled class annotations, along with any base class annotations.
+        schema = self._get_schema()
+        fields = schema.fields
         # List of keys in the data which contain nested data, IE: list or dict objects.
         if data:
-            self.__nested_keys__ = [self._clean_key(k) for k in data.keys() if isinstance(data[k], (dict, list))]
+            nested_keys = [self._clean_key(k) for k in data.keys() if isinstance(data[k], (dict, list))]
             # Ensure keys and values are not byte strings and ensure keys value may be used as a property.
             for k, v in data.items():
-                self.__data_dict__[self._clean_key(k)] = self._clean_value(v)
+                dd[self._clean_key(k)] = self._clean_value(v)
         else:
-            # cleaned_data = self.__dict_cls__()
-            self.__nested_keys__ = self.__dict_cls__()
+            nested_keys = self.__dict_cls__()
+        if not single_storage and compact_storage is None:
+            self.__nested_keys__ = nested_keys
 
-        if annots:
-            if cast_types is True:
+        lazy_keys = None
+        if schema.annotations:
+            if cast_types is True and fields:
                 # If 'cast_types' is True, try to cast values to correct type.
-                for k in self.__data_dict__.keys():
-                    if k in self.__nested_keys__:
+                for k, v in dd.items():
+                    if v is None or k in nested_keys or k not in fields:
                         continue
                     # Attempt to cast the value to the annotation type
-                    self.__data_dict__[k] = self._cast_to_type(annots, k, self.__data_dict__[k])
+                    dd[k] = fields[k].cast(v)
+            elif lazy_cast and fields:
+                # Keep the raw values that need casting until the property is first accessed.
+                lazy_keys = dict()
+                for k, v in dd.items():
+                    if v is None or k in nested_keys or k not in fields or type(v) in fields[k].types:
+                        continue
+                    if is_shadowed(type(self), k, schema.annotations, JSONObject):
+                        dd[k] = fields[k].cast(v)
+                        continue
+                    lazy_keys[k] = (v, None, cast_types, ordered)
 
             # Set default values for any keys that are missing in the 'data' dict.
-            for k in annots.keys():
-                if k in self.__class__.__dict__:
-                    v = getattr(self.__class__, k)
-                    # Only set default values that are not None
-                    if k not in self.__data_dict__ and v is not None:
-                        self.__data_dict__[k] = v
+            for k, v in schema.defaults:
+                if k not in dd:
+                    dd[k] = v
 
         # If there are any nested keys, recursively process them.
-        for k in self.__nested_keys__:
+        for k in nested_keys:
             # Fetch annotation class type or JSONObject
-            t = self._get_annot_cls(annots, k, ignore_builtins=True)[0]
+            t = fields[k].nested_cls if k in fields else JSONObject
 
-            if isinstance(self.__data_dict__[k], dict):
-                try:
-                    self.__data_dict__[k] = t(self.__data_dict__[k], cast_types=cast_types, ordered=ordered)
-                except TypeError:
-                    raise TypeError(f"TypeError: error casting to type '{str(t)}' for property '{k}'")
-            elif isinstance(self.__data_dict__[k], list):
-                _tmp = list()
-                for i in self.__data_dict__[k]:
-                    if isinstance(i, dict):
-                        _tmp.append(t(i, cast_types=cast_types, ordered=ordered))
-                    elif isinstance(i, str):
-                        try:
-                            _tmp_data = json.loads(i)
-                            if _tmp_data and isinstance(_tmp_data, dict):
-                                _tmp.append(t(_tmp_data, cast_types=cast_types, ordered=ordered))
-                            else:
-                                _tmp.append(i)  # For when the value is a string = 'null'.
-                        except JSONDecodeError:
-                            _tmp.append(i)
-                    else:
-                        _tmp.append(i)
-                self.__data_dict__[k] = _tmp
+            if lazy and isinstance(dd[k], (dict, list)) and \
+                    not is_shadowed(type(self), k, schema.annotations, JSONObject):
+                # Keep the raw value until the property is first accessed, see self._load_lazy().
+                if lazy_keys is None:
+                    lazy_keys = dict()
+                lazy_keys[k] = (dd[k], t, cast_types, ordered)
+                continue
+            dd[k] = self._convert_nested(t, k, dd[k], cast_types, ordered)
 
-        # Save data to the object properties
-        for k, v in self.__data_dict__.items():
-            self.__dict__[k] = v
+        # Save data to the object properties, in single storage mode the data is already stored there.
+        if compact_storage is not None:
+            compact_storage.store(self, dd, lazy_keys)
+        elif not single_storage:
+            self.__dict__.update(dd)
+            if lazy_keys:
+                for k in lazy_keys:
+                    del self.__dict__[k]
+                self.__lazy__ = lazy_keys
+                if not schema.lazy_ready:
+                    install_lazy_attributes(type(self), schema.annotations, JSONObject)
+                    schema.lazy_ready = True
+        if self.__track_changes__:
+            self.mark_clean()
+
+    @classmethod
+    def from_records(cls, records: typing.Iterable[typing.Union[typing.Dict, str]],
+                     cast_types: typing.Union[bool, str] = False, ordered: bool = False, lazy: bool = False,
+                     generator: bool = False, errors: typing.Optional[list] = None):
+        """
+        Create an object of this class for each record. The class schema and constructor are looked up
+        once for all records, which is faster than creating each object separately.
+        :param records: Iterable of dictionaries or valid JSON strings.
+        :param cast_types: See '__init__()'.
+        :param ordered: See '__init__()'.
+        :param lazy: See '__init__()'.
+        :param generator: Return a generator instead of a list.
+        :param errors: If a list is given, records which fail to load are skipped and an
+                       (index, record, exception) tuple is appended to the list, instead of raising.
+        :return: List or generator of objects
+        """
+        objs = cls._iter_records(records, cls._get_loader(cast_types, ordered, lazy), errors)
+        return objs if generator else list(objs)
+
+    @classmethod
+    def from_columns(cls, columns: typing.Dict[str, typing.Sequence], cast_types: typing.Union[bool, str] = False,
+                     ordered: bool = False, lazy: bool = False, views: bool = False) -> list:
+        """
+        Create an object of this class for each row of column oriented data, IE: the result of 'to_columns()'.
+        The objects are the same as creating them from records, but values are cast once for each column
+        instead of once for each value.
+        :param columns: Dict of property names and columns of equal length. Columns may be lists, tuples or
+                        any sequence, objects with a 'tolist()' method, like NumPy arrays, are converted first.
+        :param cast_types: See '__init__()'. Columns are always cast when the objects are created.
+        :param ordered: See '__init__()'.
+        :param lazy: See '__init__()'.
+        :param views: Return row view objects reading their values from the columns, which are shared by all
+                      objects instead of being copied. Values set on a row view are kept by the object and
+                      never change the columns. Nested values are converted to objects when first accessed.
+                      Row view objects are not created with the class constructor.
+        :return: List of objects
+        """
+        if views and (cls.__compact__ is not None or cls.__single_storage__):
+            raise TypeError(f"TypeError: '{cls.__name__}' stores data in the object and can not use row views")
+        size = None
+        cols = dict()
+        for k, col in columns.items():
+            col = col.tolist() if hasattr(col, 'tolist') else list(col)
+            if size is None:
+                size = len(col)
+            elif len(col) != size:
+                raise ValueError(f"ValueError: column '{k}' has {len(col)} values, expected {size}")
+            if any(isinstance(v, bytes) for v in col):
+                col = [cls._clean_value(v) for v in col]
+            cols[cls._clean_key(k)] = col
+        if not size:
+            return list()
+
+        schema = cls._get_schema()
+        fields = schema.fields
+        if cast_types:
+            # Cast each annotated column as a whole, nested dict and list values are cast when converted.
+            for k, col in cols.items():
+                if k in fields:
+                    cols[k] = fields[k].cast_column(col)
+            cast_types = True
+        nested_cls = {k: fields[k].nested_cls if k in fields else JSONObject for k in cols}
+
+        if views:
+            view_cls = schema.view_cls
+            if view_cls is None:
+                view_cls = schema.view_cls = make_view_class(cls)
+            defaults = [(k, v) for k, v in schema.defaults if k not in cols]
+            objs = make_views(view_cls, ColumnTable(cols, nested_cls, defaults, cast_types, ordered))
+            if cls.__track_changes__:
+                for obj in objs:
+                    obj.mark_clean()
+            return objs
+
+        if cast_types and not lazy:
+            # Convert nested values here, so the objects are created without casting the cast columns again.
+            for k, col in cols.items():
+                t = nested_cls[k]
+                if any(isinstance(v, (dict, list)) for v in col):
+                    cols[k] = [t(v, cast_types=True, ordered=ordered) if isinstance(v, dict) else
+                               cls._convert_list(t, v, True, ordered) if isinstance(v, list) else v for v in col]
+            load = cls._get_loader(False, ordered, False)
+        else:
+            load = cls._get_loader(cast_types, ordered, lazy)
+        keys = tuple(cols)
+        return [load(dict(zip(keys, row))) for row in zip(*cols.values())]
+
+    @classmethod
+    def from_cursor(cls, cursor, cast_types: typing.Union[bool, str] = False, ordered: bool = False,
+                    lazy: bool = False, views: bool = False) -> list:
+        """
+        Create an object of this class for each row of a DB-API cursor result set, using the cursor column
+        names as property names. See 'from_columns()'.
+        :param cursor: DB-API cursor with an executed query, the remaining rows are fetched.
+        :param cast_types: See '__init__()'.
+        :param ordered: See '__init__()'.
+        :param lazy: See '__init__()'.
+        :param views: See 'from_columns()'.
+        :return: List of objects
+        """
+        names = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+        columns = dict(zip(names, zip(*rows))) if rows else {k: () for k in names}
+        return cls.from_columns(columns, cast_types=cast_types, ordered=ordered, lazy=lazy, views=views)
+
+    @classmethod
+    def iter_ndjson(cls, source: typing.Union[str, os.PathLike, typing.IO],
+                    cast_types: typing.Union[bool, str] = False, ordered: bool = False, lazy: bool = False,
+                    batch_size: int = None, skip_invalid: bool = False, errors: typing.Optional[list] = None,
+                    memory_map: bool = False):
+        """
+        Generator yielding an object of this class for each line of a NDJSON (JSON Lines) file. The file is
+        read one line at a time, blank lines are ignored.
+        :param source: File path, binary file object, text file object or memory map.
+        :param cast_types: See '__init__()'.
+        :param ordered: See '__init__()'.
+        :param lazy: See '__init__()'.
+        :param batch_size: Yield lists of up to this many objects instead of single objects.
+        :param skip_invalid: Skip lines which fail to load instead of raising.
+        :param errors: If a list is given, lines which fail to load are skipped and a
+                       (line number, line, exception) tuple is appended to the list.
+        :param memory_map: Memory map the file when the source is a path. Processes reading the same file
+                           share the operating system page cache instead of each copying the data.
+        """
+        objs = readers.iter_ndjson(source, cls._get_loader(cast_types, ordered, lazy), skip_invalid, errors,
+                                   memory_map, cls.__json_backend__.loads)
+        return readers.batched(objs, batch_size) if batch_size else objs
+
+    @classmethod
+    def iter_json_array(cls, source: typing.Union[str, os.PathLike, typing.IO], pointer: str = '',
+                        cast_types: typing.Union[bool, str] = False, ordered: bool = False, lazy: bool = False,
+                        batch_size: int = None, skip_invalid: bool = False, errors: typing.Optional[list] = None,
+                        memory_map: bool = False):
+        """
+        Generator yielding an object of this class for each element of a JSON array in a file. Elements are
+        decoded one at a time, memory use is bounded by the largest element instead of the file size.
+        :param source: File path, binary file object, text file object or memory map.
+        :param pointer: JSON pointer (RFC 6901) of the array, IE: '/data/items'. By default the whole
+                        document must be an array.
+        :param cast_types: See '__init__()'.
+        :param ordered: See '__init__()'.
+        :param lazy: See '__init__()'.
+        :param batch_size: Yield lists of up to this many objects instead of single objects.
+        :param skip_invalid: Skip elements which fail to load instead of raising.
+        :param errors: If a list is given, elements which fail to load are skipped and a
+                       (index, element, exception) tuple is appended to the list.
+        :param memory_map: See 'iter_ndjson()'.
+        """
+        objs = readers.iter_json_array(source, cls._get_loader(cast_types, ordered, lazy), pointer, skip_invalid,
+                                       errors, memory_map)
+        return readers.batched(objs, batch_size) if batch_size else objs
+
+    @classmethod
+    def iter_records_parallel(cls, records: typing.Iterable[typing.Union[typing.Dict, str, bytes]],
+                              cast_types: typing.Union[bool, str] = False, ordered: bool = False,
+                              lazy: bool = False, workers: int = None, chunk_size: int = parallel.CHUNK_SIZE,
+                              preserve_order: bool = True, reduce: typing.Optional[typing.Callable] = None,
+                              skip_invalid: bool = False,
+                              executor: typing.Optional[concurrent.futures.Executor] = None):
+        """
+        Generator yielding an object of this class for each record, the records are loaded in chunks by a
+        pool of worker processes. Objects are pickled to return them from the workers, this class must be
+        importable by the workers.
+        :param records: Iterable of dictionaries or JSON documents, may be a generator.
+        :param cast_types: See '__init__()'.
+        :param ordered: See '__init__()'.
+        :param lazy: See '__init__()'.
+        :param workers: Number of worker processes, by default the number of CPUs.
+        :param chunk_size: Number of records loaded by each worker task.
+        :param preserve_order: Yield objects in record order, otherwise in the order chunks finish loading.
+        :param reduce: Module level function called by the worker with the list of objects of each chunk,
+                       the function results are yielded instead of the objects.
+        :param skip_invalid: Skip records which fail to load instead of raising.
+        :param executor: Run the tasks with this executor instead of creating a process pool.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"ValueError: invalid chunk size '{chunk_size}'")
+        tasks = ((cls, chunk, cast_types, ordered, lazy, skip_invalid, reduce)
+                 for chunk in readers.batched(records, chunk_size))
+        return parallel.run_tasks(parallel.load_records, tasks, workers, executor, preserve_order, reduce is None)
+
+    @classmethod
+    def iter_ndjson_parallel(cls, path: typing.Union[str, os.PathLike], cast_types: typing.Union[bool, str] = False,
+                             ordered: bool = False, lazy: bool = False, workers: int = None,
+                             chunk_size: int = parallel.RANGE_SIZE, preserve_order: bool = True,
+                             reduce: typing.Optional[typing.Callable] = None, skip_invalid: bool = False,
+                             executor: typing.Optional[concurrent.futures.Executor] = None):
+        """
+        Generator yielding an object of this class for each line of a NDJSON (JSON Lines) file. The file is
+        split into byte ranges of whole lines, each worker process reads and loads its own ranges. See
+        'iter_records_parallel()'.
+        :param path: File path
+        :param chunk_size: Number of bytes loaded by each worker task, extended to the end of a line.
+        """
+        tasks = ((cls, path, start, end, cast_types, ordered, lazy, skip_invalid, reduce)
+                 for start, end in parallel.ndjson_ranges(path, chunk_size))
+        return parallel.run_tasks(parallel.load_ndjson_range, tasks, workers, executor, preserve_order,
+                                  reduce is None)
+
+    @classmethod
+    def aiter_ndjson(cls, reader, cast_types: typing.Union[bool, str] = False, ordered: bool = False,
+                     lazy: bool = False, batch_size: int = aio.BATCH_SIZE,
+                     executor: typing.Optional[concurrent.futures.Executor] = None,
+                     max_pending: int = aio.MAX_PENDING, skip_invalid: bool = False,
+                     errors: typing.Optional[list] = None):
+        """
+        Async generator yielding an object of this class for each line of a NDJSON (JSON Lines) stream,
+        IE: 'async for obj in Model.aiter_ndjson(reader)'. Lines are read without blocking the event loop and
+        loaded in batches by the executor. Reading pauses while 'max_pending' batches wait for the consumer.
+        Blank lines are ignored.
+        :param reader: asyncio.StreamReader, or any object with an async 'read()' method returning bytes.
+        :param cast_types: See '__init__()'.
+        :param ordered: See '__init__()'.
+        :param lazy: See '__init__()'.
+        :param batch_size: Maximum number of lines loaded by each executor task.
+        :param executor: Executor loading the lines, by default the event loop default executor. With a
+                         process pool, this class must be importable by the workers.
+        :param max_pending: Maximum number of batches read ahead of the consumer.
+        :param skip_invalid: See 'iter_ndjson()'.
+        :param errors: See 'iter_ndjson()'.
+        """
+        return aio.aiter_ndjson(cls, reader, cast_types, ordered, lazy, batch_size, executor, max_pending,
+                                skip_invalid, errors)
+
+    @classmethod
+    def _get_loader(cls, cast_types: typing.Union[bool, str], ordered: bool, lazy: bool) -> typing.Callable:
+        """
+        Return a function creating an object of this class from a single record, used to load many records.
+        :param cast_types: See '__init__()'.
+        :param ordered: See '__init__()'.
+        :param lazy: See '__init__()'.
+        """
+        # The generated constructor creates identical objects, use it when the class supports it.
+        init = None
+        if cls.__init__ is JSONObject.__init__ and cls.__new__ is object.__new__ and cls.__compact__ is None \
+                and not lazy and cast_types != 'lazy' and not cls.__track_changes__:
+            init = cls._get_init()
+        if init is None:
+            # Overridden constructors may not accept the 'lazy' argument.
+            kwargs = {'lazy': True} if lazy else {}
+            return lambda r: cls(r, cast_types=cast_types, ordered=ordered, **kwargs)
+
+        new = cls.__new__
+
+        def load(r):
+            obj = new(cls)
+            init(obj, r, cast_types, ordered)
+            return obj
+
+        return load
+
+    @staticmethod
+    def _iter_records(records: typing.Iterable, load: typing.Callable, errors: typing.Optional[list]):
+        """ Generator for 'from_records()' """
+        for x, r in enumerate(records):
+            try:
+                obj = load(r)
+            except Exception as e:
+                if errors is None:
+                    raise
+                errors.append((x, r, e))
+                continue
+            yield obj
 
     def __setattr__(self, key, value):
         super().__setattr__(key, value)
         # Regex search is slightly faster than 'key.startswith()'.
-        if _REGEX_HIDDEN_PROP.search(key):
+        if self.__single_storage__ or _REGEX_HIDDEN_PROP.search(key):
             return
         # If we are here and self.__data_dict__ is None, we should initialize it and store the value. This
         # probably means the __init__() method has been overridden and we are still waiting for our __init__()
@@ -233,6 +652,189 @@ class JSONObject:
         if not self.__data_dict__:
             self.__data_dict__ = self.__dict_cls__()
         self.__data_dict__[key] = value
+        # A new value replaces any lazily loaded value.
+        if self.__lazy__ and key in self.__lazy__:
+            del self.__lazy__[key]
+        if self.__changes__ is not None:
+            self.__changes__.changed.add(key)
+        if self.__export_cache__ is not None:
+            self.__export_cache__.invalidate()
+
+    def invalidate_exports(self):
+        """
+        Discard the cached exports of this object and of every object containing it. Changing properties
+        does this automatically, call it after changing list or dict property values in place.
+        """
+        if self.__export_cache__ is not None:
+            self.__export_cache__.invalidate()
+
+    def _get_export(self, key: tuple):
+        """
+        Return the cached export, or None if it is not cached.
+        :param key: Export name and arguments
+        """
+        cache = self.__export_cache__
+        if cache is not None and cache.exports and cache.owner == id(self):
+            return cache.exports.get(key)
+        return None
+
+    def _set_export(self, key: tuple, value):
+        """
+        Cache the export until this object or a nested object changes.
+        :param key: Export name and arguments
+        :param value: Exported JSON string or dict
+        """
+        cache = self.__export_cache__
+        if cache is None or cache.owner != id(self):
+            if self.__single_storage__:
+                return
+            cache = self.__export_cache__ = ExportCache(id(self))
+        if cache.exports is None:
+            if not self._track_nested():
+                return
+            cache.exports = dict()
+        cache.exports[key] = value
+
+    def _track_nested(self) -> bool:
+        """
+        Register this object as a parent of the nested objects, recursively, so changes to nested objects
+        invalidate the cached exports of this object.
+        :return: False if a nested object can not notify parents, IE: single storage objects.
+        """
+        for v in self.__data_dict__.values():
+            if not isinstance(v, (list, JSONObject)):
+                continue
+            for child in (v if isinstance(v, list) else (v,)):
+                if not isinstance(child, JSONObject):
+                    continue
+                if child.__single_storage__:
+                    return False
+                cache = child.__export_cache__
+                if cache is None or cache.owner != id(child):
+                    cache = child.__export_cache__ = ExportCache(id(child))
+                elif cache.exports is not None or (cache.parents and self in cache.parents):
+                    # Changes to nested objects clear the parents of every object up the tree, objects
+                    # with cached exports or still tracked by this object have tracked their nested objects.
+                    cache.add_parent(self)
+                    continue
+                cache.add_parent(self)
+                if not child._track_nested():
+                    return False
+        return True
+
+    def mark_clean(self):
+        """
+        Start tracking changed properties of this object and of nested objects, forgetting any changes made
+        so far. Objects of model classes with the 'track_changes' class argument are marked clean when
+        constructed.
+        """
+        if self.__single_storage__:
+            raise TypeError(f"TypeError: '{type(self).__name__}' uses single storage and can not track changes")
+        data = self.__data_dict__
+        self.__changes__ = ChangeTracker(data)
+        for v in data.values():
+            self._mark_nested_clean(v)
+
+    @staticmethod
+    def _mark_nested_clean(v):
+        """ Mark nested objects of a property value clean, nested single storage objects are not tracked """
+        if isinstance(v, JSONObject):
+            if not v.__single_storage__:
+                v.mark_clean()
+        elif isinstance(v, list):
+            for i in v:
+                if isinstance(i, JSONObject) and not i.__single_storage__:
+                    i.mark_clean()
+
+    def _get_changes(self) -> ChangeTracker:
+        """ Return the change tracker, raise ValueError if the object is not tracking changes """
+        changes = self.__changes__
+        if changes is None:
+            raise ValueError(f"ValueError: '{type(self).__name__}' object is not tracking changes, "
+                             f"call 'mark_clean()' first")
+        return changes
+
+    @staticmethod
+    def _is_changed(changes: ChangeTracker, key: str, value) -> bool:
+        """ Return True if the property was set, or the value was changed in place, since marked clean """
+        if key in changes.changed:
+            return True
+        if isinstance(value, JSONObject):
+            return value.__changes__ is not None and bool(value.changed_fields())
+        if isinstance(value, (list, dict)):
+            if value != changes.values.get(key):
+                return True
+            if isinstance(value, list):
+                return any(isinstance(i, JSONObject) and i.__changes__ is not None and i.changed_fields()
+                           for i in value)
+        return False
+
+    def changed_fields(self) -> typing.List[str]:
+        """
+        Return the names of the properties changed since the object was marked clean, including properties
+        holding nested objects, or lists of nested objects, which changed.
+        """
+        changes = self._get_changes()
+        return [k for k, v in self.__data_dict__.items() if self._is_changed(changes, k, v)]
+
+    def _export_value(self, value, dates_to_str: bool):
+        """ Export a single property value, like 'self.to_dict()' does """
+        if isinstance(value, JSONObject):
+            return value.to_dict(dates_to_str=dates_to_str)
+        if isinstance(value, list):
+            return [i.to_dict(dates_to_str=dates_to_str) if isinstance(i, JSONObject) else i for i in value]
+        if dates_to_str and isinstance(value, (datetime.datetime, datetime.date)):
+            return self._json_serial(value)
+        return value
+
+    def to_patch(self, json_patch: bool = False, dates_to_str: bool = False) -> typing.Union[dict, list]:
+        """
+        Export the changes since the object was marked clean as a JSON Merge Patch (RFC 7386) dict. Nested
+        objects which changed are patched recursively, changed lists are replaced. A None value removes the
+        property when the patch is applied, see RFC 7386.
+        :param json_patch: Return a JSON Patch (RFC 6902) list of operations instead. Changed list items are
+                           patched by index when the list length is unchanged.
+        :param dates_to_str: Boolean, convert all date or datetime values to string.
+        """
+        if json_patch:
+            return list(self._iter_patch_ops('', dates_to_str))
+        changes = self._get_changes()
+        patch = self.__dict_cls__()
+        for k, v in self.__data_dict__.items():
+            if not self._is_changed(changes, k, v):
+                continue
+            if isinstance(v, JSONObject) and k not in changes.changed:
+                patch[k] = v.to_patch(dates_to_str=dates_to_str)
+            else:
+                patch[k] = self._export_value(v, dates_to_str)
+        return patch
+
+    def _iter_patch_ops(self, path: str, dates_to_str: bool) -> typing.Iterator[dict]:
+        """
+        Yield JSON Patch (RFC 6902) operations for the changes since the object was marked clean.
+        :param path: JSON pointer of this object
+        :param dates_to_str: See 'self.to_patch()'.
+        """
+        changes = self._get_changes()
+        for k, v in self.__data_dict__.items():
+            if not self._is_changed(changes, k, v):
+                continue
+            pointer = f'{path}/{escape_pointer(k)}'
+            original = changes.values.get(k)
+            if k in changes.changed:
+                op = 'replace' if k in changes.keys else 'add'
+                yield {'op': op, 'path': pointer, 'value': self._export_value(v, dates_to_str)}
+            elif isinstance(v, JSONObject):
+                yield from v._iter_patch_ops(pointer, dates_to_str)
+            elif isinstance(v, list) and original is not None and len(v) == len(original):
+                for x, (i, orig) in enumerate(zip(v, original)):
+                    item_pointer = f'{pointer}/{x}'
+                    if i is not orig and i != orig:
+                        yield {'op': 'replace', 'path': item_pointer, 'value': self._export_value(i, dates_to_str)}
+                    elif isinstance(i, JSONObject) and i.__changes__ is not None:
+                        yield from i._iter_patch_ops(item_pointer, dates_to_str)
+            else:
+                yield {'op': 'replace', 'path': pointer, 'value': self._export_value(v, dates_to_str)}
 
     @staticmethod
     def _json_serial(obj):
@@ -241,12 +843,78 @@ class JSONObject:
             return obj.isoformat()
         return obj.__repr__()
 
+    def _json_data(self) -> dict:
+        """ Return the stored data to encode as JSON """
+        data = instance_data(self) if self.__single_storage__ else self.__data_dict__
+        lazy = self.__lazy__
+        if lazy:
+            # Serialize lazily loaded values directly from the raw value when possible.
+            data = dict(data)
+            for k, (raw, t, cast_types, _) in list(lazy.items()):
+                if t is None:
+                    continue  # Values that have not been cast are exported unchanged.
+                try:
+                    data[k] = raw_to_json(t, raw, cast_types, JSONObject)
+                except RawExportError:
+                    data[k] = self._load_lazy(k)
+        return data
+
     def to_json(self, indent: int = None):
         """
         Export stored data as a json string.
         :param indent: Positive integer value for formatting JSON string indenting.
         """
-        return json.dumps(self.__data_dict__, default=self._json_serial, indent=indent)
+        if self.__cache_exports__:
+            value = self._get_export(('json', indent))
+            if value is None:
+                value = self.__json_backend__.dumps(self._json_data(), default=self._json_serial, indent=indent)
+                self._set_export(('json', indent), value)
+            return value
+        return self.__json_backend__.dumps(self._json_data(), default=self._json_serial, indent=indent)
+
+    def iterencode(self, indent: int = None) -> typing.Iterator[str]:
+        """
+        Export stored data as a json string, yielded in chunks. The chunks joined are the same as 'to_json()'.
+        :param indent: Positive integer value for formatting JSON string indenting.
+        """
+        if type(self).to_json is not JSONObject.to_json:
+            # Respect model classes exporting their own JSON string.
+            return iter((self.to_json(indent=indent),))
+        return self.__json_backend__.iterencode(self._json_data(), default=self._json_serial, indent=indent)
+
+    def write_json(self, fp: typing.Union[str, os.PathLike, typing.IO], indent: int = None,
+                   buffer_size: int = writers.BUFFER_SIZE):
+        """
+        Export stored data as a json string to a file. The JSON string is encoded in chunks and written
+        whenever 'buffer_size' characters are collected, instead of building the whole string in memory.
+        :param fp: File path, binary file object or text file object. Binary files are written UTF-8 encoded.
+        :param indent: Positive integer value for formatting JSON string indenting.
+        :param buffer_size: Number of characters collected before writing them to the file.
+        """
+        with writers.open_target(fp) as f:
+            writer = writers.BufferedWriter(f, buffer_size)
+            writer.write_all(self.iterencode(indent))
+            writer.flush()
+
+    def to_bytes(self, codec: str = 'struct') -> bytes:
+        """
+        Export stored data in a compact binary format, see 'from_bytes()'. Values are encoded with their
+        Python type, IE: datetime, date, time, Decimal, Enum and nested objects, lazily loaded values are
+        loaded first.
+        :param codec: 'struct' to use only the standard library, or 'msgpack' which requires msgpack.
+        :return: Encoded data, starting with a format version header.
+        """
+        return binary.dumps(self, codec, JSONObject)
+
+    @classmethod
+    def from_bytes(cls, data: typing.Union[bytes, bytearray, memoryview]):
+        """
+        Create an object of this class from data exported with 'to_bytes()'. Values are decoded to the type
+        they were encoded with and are never cast. Nested objects are created with the annotated model class
+        of the property, Enum values are converted to members of the annotated Enum class.
+        :param data: Encoded data
+        """
+        return binary.loads(cls, data, JSONObject)
 
     def to_dict(self, recursive: bool = True, dates_to_str: bool = False):
         """
@@ -254,9 +922,35 @@ class JSONObject:
         :param recursive: Boolean, recursively convert nested JSONObjects to a dict
         :param dates_to_str: Boolean, convert all date or datetime values to string.
         """
+        if self.__cache_exports__:
+            key = ('dict', recursive, dates_to_str)
+            data = self._get_export(key)
+            if data is None:
+                data = self._to_dict(recursive, dates_to_str)
+                self._set_export(key, data)
+            # The cached dict is shared, callers may change the returned dict.
+            return copy_export(data)
+        return self._to_dict(recursive, dates_to_str)
+
+    def _to_dict(self, recursive: bool, dates_to_str: bool) -> dict:
+        """ Export stored data as a python dictionary object, see 'to_dict()' """
         data = self.__dict_cls__()
+        lazy = self.__lazy__
 
-        for k, v in self.__data_dict__.items():
+        for k, v in (instance_data(self) if self.__single_storage__ else self.__data_dict__).items():
+            if lazy and k in lazy:
+                # Export lazily loaded values directly from the raw value when possible.
+                raw, t, cast_types, _ = lazy[k]
+                if t is None:
+                    v = raw  # Values that have not been cast are exported unchanged.
+                elif recursive is True:
+                    try:
+                        data[k] = raw_to_dict(t, raw, cast_types, dates_to_str, JSONObject)
+                        continue
+                    except RawExportError:
+                        v = self._load_lazy(k)
+                else:
+                    v = self._load_lazy(k)
             if isinstance(v, JSONObject) and recursive is True:
                 data[k] = v.to_dict(recursive=recursive, dates_to_str=dates_to_str)
             elif isinstance(v, (datetime.datetime, datetime.date)) and dates_to_str is True:
@@ -274,10 +968,77 @@ class JSONObject:
 
         return data
 
+    def __getstate__(self) -> tuple:
+        """
+        Return the state pickled and copied with the object, the object data and the hidden properties,
+        instead of the object '__dict__' holding a second copy of the data. Cached exports, and the nested
+        keys only used while constructing the object, are not included.
+        :return: (data, hidden properties) tuple, hidden properties are None if there are none.
+        """
+        compact_storage = self.__compact__
+        if compact_storage is not None:
+            hidden = {k: v for k, v in (('__lazy__', compact_storage.get_lazy(self)), ('__changes__', self.__changes__))
+                      if v is not None}
+            return compact_storage.data(self), hidden or None
+        if self.__single_storage__:
+            return self.__dict__, None
+        hidden = {k: v for k, v in self.__dict__.items() if '__' in k and k not in _UNPICKLED_PROPS}
+        return self.__data_dict__, hidden or None
+
+    def __setstate__(self, state: tuple):
+        """
+        Restore the state returned by '__getstate__()'. Values are stored as they are, without casting them
+        or converting nested values to objects again.
+        :param state: (data, hidden properties) tuple
+        """
+        # Objects pickled before '__getstate__()' was added hold the object '__dict__', or the slots of
+        # compact objects, as state.
+        if isinstance(state, dict):
+            self.__dict__.update(state)
+            return
+        data, hidden = state
+        if hidden:
+            # Copied objects must not share the lazily loaded values or the change tracker.
+            hidden = dict(hidden)
+            if hidden.get('__lazy__'):
+                hidden['__lazy__'] = dict(hidden['__lazy__'])
+            if hidden.get('__changes__') is not None:
+                hidden['__changes__'] = hidden['__changes__'].copy()
+        if data is None:
+            for k, v in hidden.items():
+                object.__setattr__(self, k, v)
+            return
+        lazy = hidden.get('__lazy__') if hidden else None
+        compact_storage = self.__compact__
+        if compact_storage is not None:
+            compact_storage.store(self, data, lazy)
+            if hidden and '__changes__' in hidden:
+                object.__setattr__(self, '__changes__', hidden['__changes__'])
+            return
+        self_dict = self.__dict__
+        if self.__single_storage__:
+            self_dict.update(data)
+            return
+        # Copied objects must not share the data dict.
+        dd = data.copy()
+        self_dict.update(dd)
+        self_dict['__data_dict__'] = dd
+        if hidden:
+            self_dict.update(hidden)
+        if lazy:
+            for k in lazy:
+                self_dict.pop(k, None)
+            schema = self._get_schema()
+            if not schema.lazy_ready:
+                install_lazy_attributes(type(self), schema.annotations, JSONObject)
+                schema.lazy_ready = True
+
     def __repr__(self):
         return self.to_json()
 
     def __len__(self):
+        if self.__single_storage__:
+            return len(instance_data(self))
         return len(self.__data_dict__.keys())
 
     def __add__(self, other):
@@ -314,3 +1075,59 @@ class JSONObject:
         if data:
             for k, v in data.items():
                 yield k, v
+
+
+def set_json_backend(backend: typing.Union[str, JSONBackend] = 'auto'):
+    """
+    Set the JSON encoder and decoder used by all model classes, except classes setting their own backend
+    with the 'json_backend' class argument.
+
+        set_json_backend('orjson')
+
+    :param backend: Backend name, one of 'json', 'orjson', 'ujson', 'simdjson' or 'auto' for the fastest
+                    backend installed, or a JSONBackend object.
+    """
+    JSONObject.__json_backend__ = get_backend(backend)
+    # Generated constructors hold the decoder of the backend they were created with.
+    JSONObject.invalidate_schema()
+
+
+def compact(cls: type) -> type:
+    """
+    Class decorator, return a compact version of the model class. Annotated properties are stored in
+    '__slots__' and other properties in an overflow dict that is only created when needed. Compact
+    objects do not store data in the object '__dict__' inherited from the model class, which stays empty,
+    or create '__data_dict__' or '__nested_keys__'. Exported data lists the annotated properties first,
+    in annotation order, followed by any other properties. Subclasses of a compact class can not add
+    annotated properties.
+
+        @compact
+        class TimestampModel(JSONObject):
+            id: int = None
+            timestamp: datetime = None
+
+    :param cls: JSONObject model class
+    :return: Compact model class
+    """
+    if not isinstance(cls, type) or not issubclass(cls, JSONObject):
+        raise TypeError(f"TypeError: '{cls}' is not a JSONObject class")
+    if cls.__single_storage__:
+        raise TypeError(f"TypeError: '{cls.__name__}' uses single storage and can not be compact")
+
+    names = tuple(k for k in collect_annotations(cls) if k.isidentifier() and '__' not in k)
+    storage = SlotStorage(names)
+    ns = {
+        '__slots__': names + ('__extra__', '__lazy__', '__export_cache__', '__changes__'),
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+        '__doc__': cls.__doc__,
+        '__compact__': storage,
+        '__compact_base__': cls,
+        '__data_dict__': property(storage.data),
+        '__setattr__': compact_setattr,
+        '__getattr__': compact_getattr,
+    }
+    compact_cls = type(cls)(cls.__name__, (cls,), ns)
+    storage.bind(compact_cls)
+    return compact_cls
+
@@ -0,0 +1,177 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Support for lazily loaded nested values, see the JSONObject 'lazy' argument.
+#
+import datetime
+import types
+import typing
+
+from json import JSONDecodeError
+
+# JSONObject methods that must not be overridden for a raw value to be exported without loading it.
+_EXPORT_METHODS = ('__init__', '_clean_key', '_clean_value', 'to_dict', 'to_json', '__repr__', '_json_serial')
+
+
+class RawExportError(Exception):
+    """ Raised when a raw nested value can not be exported without loading it first """
+
+
+class LazyAttribute:
+    """
+    Non-data descriptor replacing the class attribute default value of an annotated property. Class
+    attribute default values would otherwise hide lazily loaded values from 'JSONObject.__getattr__()'.
+    """
+    __slots__ = ('name', 'default')
+
+    def __init__(self, name: str, default):
+        self.name = name
+        self.default = default
+
+    def __get__(self, obj, owner=None):
+        if obj is not None:
+            lazy = obj.__lazy__
+            if lazy and self.name in lazy:
+                return obj._load_lazy(self.name)
+        return self.default
+
+
+def install_lazy_attributes(model: type, names: typing.Iterable[str], base_cls: type):
+    """
+    Replace class attribute default values of annotated properties with LazyAttribute descriptors.
+    :param model: Model class
+    :param names: Annotated property names
+    :param base_cls: The JSONObject class
+    """
+    for k in names:
+        for owner in model.__mro__:
+            if k not in owner.__dict__:
+                continue
+            v = owner.__dict__[k]
+            # Leave descriptors, like properties or slots, alone.
+            if issubclass(owner, base_cls) and not hasattr(type(v), '__get__'):
+                type.__setattr__(owner, k, LazyAttribute(k, v))
+            break
+
+
+def is_shadowed(model: type, key: str, annotations: dict, base_cls: type) -> bool:
+    """
+    Return True if a class attribute, IE: a method or an unannotated class attribute, would be found instead of
+    a lazily loaded value of the key. The values of these keys must be loaded when the object is created.
+    :param model: Model class
+    :param key: Property name
+    :param annotations: Annotations of the model class.
+    :param base_cls: The JSONObject class
+    """
+    for owner in model.__mro__:
+        if key not in owner.__dict__:
+            continue
+        v = owner.__dict__[key]
+        # Empty slots raise AttributeError and compact classes look up the lazily loaded value.
+        if isinstance(v, (LazyAttribute, types.MemberDescriptorType)):
+            return False
+        # Class attribute defaults of annotated properties are replaced, see install_lazy_attributes().
+        return not (key in annotations and issubclass(owner, base_cls) and not hasattr(type(v), '__get__'))
+    return False
+
+
+def _check_exportable(t, cast_types: bool, base_cls: type):
+    """
+    Raise RawExportError if loading a raw dict value with class 't' could produce different exported data.
+    :param t: Class the raw value would be loaded with.
+    :param cast_types: The object 'cast_types' argument.
+    :param base_cls: The JSONObject class
+    """
+    if not isinstance(t, type) or not issubclass(t, base_cls) or t.__compact__ is not None:
+        raise RawExportError(t)
+    schema = t._get_schema()
+    exportable = schema.raw_export.get(cast_types)
+    if exportable is None:
+        exportable = not schema.defaults and not (cast_types is True and schema.fields) and \
+                     all(getattr(t, name) is getattr(base_cls, name) for name in _EXPORT_METHODS)
+        schema.raw_export[cast_types] = exportable
+    if not exportable:
+        raise RawExportError(t)
+
+
+def _parse_list_item(i, loads: typing.Callable) -> typing.Optional[dict]:
+    """ Return the dict for list items that would be loaded as objects, see JSONObject._convert_list() """
+    if isinstance(i, dict):
+        return i
+    if isinstance(i, str):
+        try:
+            i = loads(i)
+        except JSONDecodeError:
+            return None
+        if i and isinstance(i, dict):
+            return i
+    return None
+
+
+def _model_backend(t, base_cls: type):
+    """ Return the JSON backend used by JSONObject._convert_list() for the class """
+    return t.__json_backend__ if isinstance(t, type) and issubclass(t, base_cls) else base_cls.__json_backend__
+
+
+def raw_to_dict(t, v, cast_types: bool, dates_to_str: bool, base_cls: type):
+    """
+    Export a raw nested dict or list value without loading it, the result is the same as loading the value
+    and calling 'to_dict()'. Raises RawExportError if that is not possible.
+    :param t: Class the raw value would be loaded with.
+    :param v: Raw dict or list value
+    :param cast_types: The object 'cast_types' argument.
+    :param dates_to_str: Boolean, convert all date or datetime values to string.
+    :param base_cls: The JSONObject class
+    """
+    if isinstance(v, dict):
+        _check_exportable(t, cast_types, base_cls)
+        fields = t._get_schema().fields
+        data = t.__dict_cls__()
+        for k, i in v.items():
+            k = base_cls._clean_key(k)
+            i = base_cls._clean_value(i)
+            if isinstance(i, (dict, list)):
+                i = raw_to_dict(fields[k].nested_cls if k in fields else base_cls, i, cast_types, dates_to_str,
+                                base_cls)
+            elif isinstance(i, (datetime.datetime, datetime.date)) and dates_to_str is True:
+                i = base_cls._json_serial(i)
+            data[k] = i
+        return data
+
+    nl = list()
+    loads = _model_backend(t, base_cls).loads
+    for i in v:
+        item = _parse_list_item(i, loads)
+        nl.append(i if item is None else raw_to_dict(t, item, cast_types, dates_to_str, base_cls))
+    return nl
+
+
+def raw_to_json(t, v, cast_types: bool, base_cls: type):
+    """
+    Return the value 'to_json()' would serialize for a raw nested dict or list value, without loading it.
+    Raises RawExportError if that is not possible.
+    :param t: Class the raw value would be loaded with.
+    :param v: Raw dict or list value
+    :param cast_types: The object 'cast_types' argument.
+    :param base_cls: The JSONObject class
+    """
+    if isinstance(v, dict):
+        _check_exportable(t, cast_types, base_cls)
+        fields = t._get_schema().fields
+        data = t.__dict_cls__()
+        for k, i in v.items():
+            k = base_cls._clean_key(k)
+            i = base_cls._clean_value(i)
+            if isinstance(i, (dict, list)):
+                i = raw_to_json(fields[k].nested_cls if k in fields else base_cls, i, cast_types, base_cls)
+            data[k] = i
+        # Nested objects are serialized as their JSON string, see JSONObject._json_serial().
+        return t.__json_backend__.dumps(data, default=base_cls._json_serial)
+
+    nl = list()
+    loads = _model_backend(t, base_cls).loads
+    for i in v:
+        item = _parse_list_item(i, loads)
+        nl.append(i if item is None else raw_to_json(t, item, cast_types, base_cls))
+    return nl
@@ -0,0 +1,112 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Loading records in worker processes, see JSONObject.iter_records_parallel().
+#
+import collections
+import concurrent.futures
+import io
+import os
+import typing
+
+from . import readers
+
+# Number of records loaded by each worker task.
+CHUNK_SIZE = 1000
+# Number of NDJSON file bytes loaded by each worker task, ranges are extended to the end of a line.
+RANGE_SIZE = 4 * 1024 * 1024
+
+
+def ndjson_ranges(path: typing.Union[str, os.PathLike], range_size: int = RANGE_SIZE) \
+        -> typing.Iterator[typing.Tuple[int, int]]:
+    """
+    Yield (start, end) byte offsets splitting a NDJSON file into ranges of whole lines.
+    :param path: File path
+    :param range_size: Minimum number of bytes in each range, the last range may be smaller.
+    """
+    if range_size < 1:
+        raise ValueError(f"ValueError: invalid range size '{range_size}'")
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        start = 0
+        while start < size:
+            f.seek(start + range_size - 1)
+            # Read up to the end of the line the range would end in.
+            f.readline()
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+
+def load_records(cls: type, records: list, cast_types: typing.Union[bool, str], ordered: bool, lazy: bool,
+                 skip_invalid: bool, reduce: typing.Optional[typing.Callable]):
+    """
+    Worker task creating an object for each record, see JSONObject.from_records().
+    :return: List of objects, or the result of calling 'reduce' with the list.
+    """
+    load = cls._get_loader(cast_types, ordered, lazy)
+    objs = list(cls._iter_records(records, load, list() if skip_invalid else None))
+    return reduce(objs) if reduce is not None else objs
+
+
+def load_ndjson_range(cls: type, path: typing.Union[str, os.PathLike], start: int, end: int,
+                      cast_types: typing.Union[bool, str], ordered: bool, lazy: bool, skip_invalid: bool,
+                      reduce: typing.Optional[typing.Callable]):
+    """
+    Worker task creating an object for each line of a byte range of a NDJSON file, see ndjson_ranges().
+    :return: List of objects, or the result of calling 'reduce' with the list.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    objs = list(readers.iter_ndjson(io.BytesIO(data), cls._get_loader(cast_types, ordered, lazy), skip_invalid,
+                                    loads=cls.__json_backend__.loads))
+    return reduce(objs) if reduce is not None else objs
+
+
+def run_tasks(fn: typing.Callable, tasks: typing.Iterable[tuple], workers: typing.Optional[int] = None,
+              executor: typing.Optional[concurrent.futures.Executor] = None, preserve_order: bool = True,
+              flatten: bool = True) -> typing.Iterator:
+    """
+    Run the tasks in worker processes and yield the results. Only a few tasks per worker are submitted
+    ahead of the results being consumed, so tasks may be created from a generator of any length.
+    :param fn: Worker function, must be a module level function.
+    :param tasks: Iterable of argument tuples for the worker function.
+    :param workers: Number of worker processes, by default the number of CPUs.
+    :param executor: Use this executor instead of creating a process pool, which is left running.
+    :param preserve_order: Yield results in task order, otherwise in the order tasks complete.
+    :param flatten: Yield the items of each result list instead of the results.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"ValueError: invalid number of workers '{workers}'")
+    own_executor = executor is None
+    if own_executor:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    pending = collections.deque()
+
+    def done():
+        """ Return the results of the next finished tasks """
+        if preserve_order:
+            return [pending.popleft().result()]
+        finished, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in finished:
+            pending.remove(future)
+        return [future.result() for future in finished]
+
+    try:
+        for args in tasks:
+            pending.append(executor.submit(fn, *args))
+            if len(pending) >= max_pending:
+                for result in done():
+                    yield from result if flatten else (result,)
+        while pending:
+            for result in done():
+                yield from result if flatten else (result,)
+    finally:
+        # Tasks not started yet are dropped when the consumer stops early or a task fails.
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
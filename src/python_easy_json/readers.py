@@ -0,0 +1,365 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Streaming readers creating model objects from files, see JSONObject.iter_ndjson().
+#
+import codecs
+import contextlib
+import json
+import mmap
+import os
+import re
+import typing
+
+from json import JSONDecodeError
+
+# Size of the read buffer used when opening files by path.
+BUFFER_SIZE = 1024 * 1024
+# Number of characters read at a time by the JSON array reader.
+CHUNK_SIZE = 64 * 1024
+
+_REGEX_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters changing the nesting depth of JSON values, or starting a string.
+_REGEX_STRUCTURE = re.compile(r'["\[\]{}]')
+# Characters which may follow a JSON value.
+_VALUE_ENDS = frozenset(' \t\n\r,]}:')
+# Number or literal, IE: 'true', ending at the next character which may follow a value.
+_REGEX_SCALAR = re.compile(r'[^ \t\n\r,\]}:]*')
+
+
+def _string_end(buf: str, pos: int) -> int:
+    """
+    Return the position following the closing quote of a JSON string, or -1 if the string does not end in
+    the buffer.
+    :param buf: Buffer
+    :param pos: Position following the opening quote
+    """
+    while True:
+        end = buf.find('"', pos)
+        if end == -1:
+            return -1
+        # Quotes following an odd number of backslashes are escaped.
+        x = end
+        while x > pos and buf[x - 1] == '\\':
+            x -= 1
+        if (end - x) % 2 == 0:
+            return end + 1
+        pos = end + 1
+
+
+@contextlib.contextmanager
+def open_source(source: typing.Union[str, os.PathLike, typing.IO], memory_map: bool = False):
+    """
+    Open the source file in binary mode if it is a path, file objects are used as is and left open.
+    :param source: File path or file object
+    :param memory_map: Memory map the file instead of reading it through a buffer. The file is read
+                       directly from the operating system page cache, which processes reading the same
+                       file share, instead of being copied into the memory of each process.
+    """
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, 'rb', buffering=0 if memory_map else BUFFER_SIZE) as f:
+            # Empty files can not be mapped.
+            if memory_map and os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, 'madvise'):
+                        # Records are read once from start to end.
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    yield mm
+            else:
+                yield f
+    else:
+        yield source
+
+
+def batched(objs: typing.Iterator, batch_size: int) -> typing.Iterator[list]:
+    """
+    Yield lists of up to 'batch_size' objects.
+    :param objs: Iterator of objects
+    :param batch_size: Maximum number of objects in each list
+    """
+    if batch_size < 1:
+        raise ValueError(f"ValueError: invalid batch size '{batch_size}'")
+    batch = list()
+    for obj in objs:
+        batch.append(obj)
+        if len(batch) == batch_size:
+            yield batch
+            batch = list()
+    if batch:
+        yield batch
+
+
+def iter_ndjson(source: typing.Union[str, os.PathLike, typing.IO, mmap.mmap], load: typing.Callable,
+                skip_invalid: bool = False, errors: typing.Optional[list] = None,
+                memory_map: bool = False, loads: typing.Callable = json.loads) -> typing.Iterator:
+    """
+    Yield an object for each line of a NDJSON (JSON Lines) file, blank lines are ignored. Only one line is
+    held in memory at a time.
+    :param source: File path, binary file object, text file object or memory map.
+    :param load: Function creating an object from a dict, see JSONObject._get_loader().
+    :param skip_invalid: Skip lines which fail to load instead of raising.
+    :param errors: If a list is given, lines which fail to load are skipped and a
+                   (line number, line, exception) tuple is appended to the list.
+    :param memory_map: Memory map the file if the source is a path, see open_source().
+    :param loads: Function decoding a JSON document, see backends.JSONBackend.loads().
+    """
+    with open_source(source, memory_map) as f:
+        # Iterating a memory map returns single bytes instead of lines.
+        lines = iter(f.readline, b'') if isinstance(f, mmap.mmap) else f
+        for x, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                data = loads(line)
+                if not isinstance(data, dict):
+                    raise TypeError(f"TypeError: expected a JSON object on line {x}, not '{type(data).__name__}'")
+                obj = load(data)
+            except Exception as e:
+                if errors is not None:
+                    errors.append((x, line, e))
+                elif not skip_invalid:
+                    raise
+                continue
+            yield obj
+
+
+class JSONArrayReader:
+    """
+    Read the elements of a JSON array from a file one at a time. Only the current element, and a small read
+    buffer, are held in memory.
+    """
+    def __init__(self, f: typing.Union[typing.IO, mmap.mmap], chunk_size: int = CHUNK_SIZE):
+        """
+        :param f: Binary file object, text file object or memory map. Binary data must be UTF-8 encoded.
+        :param chunk_size: Number of characters to read at a time.
+        """
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')() if isinstance(f.read(0), bytes) else None
+        self.raw_decode = json.JSONDecoder().raw_decode
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        # Start of the value being scanned, data from here on is kept when reading, see '_decode()'.
+        self.mark = None
+
+    def _read(self, size: int):
+        """
+        Discard data before the current position, or before the mark if set, and append the next chunk of the
+        file to the buffer.
+        """
+        if self.eof:
+            return
+        data = self.f.read(size)
+        self.eof = not data
+        if self.decoder is not None:
+            # Multibyte characters may be split between chunks, the decoder keeps the partial bytes.
+            data = self.decoder.decode(data, final=self.eof)
+        start = self.pos if self.mark is None else self.mark
+        self.buf = self.buf[start:] + data
+        self.pos -= start
+        if self.mark is not None:
+            self.mark = 0
+
+    def _peek(self) -> str:
+        """ Skip whitespace and return the next character, or an empty string at the end of the file """
+        while True:
+            self.pos = _REGEX_WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+            self._read(self.chunk_size)
+
+    def _expect(self, chars: str) -> str:
+        """ Consume the next character, which must be one of the given characters """
+        c = self._peek()
+        if not c or c not in chars:
+            raise ValueError(f"ValueError: expected one of '{chars}' but found '{c}' in JSON document")
+        self.pos += 1
+        return c
+
+    def _decode(self):
+        """
+        Decode the next JSON value. Values which are incomplete in the buffer, or malformed, are found with
+        the structure scanner first and only the value is decoded. Malformed values raise JSONDecodeError,
+        holding the text of the value, after moving past them.
+        """
+        self._peek()
+        try:
+            v, end = self.raw_decode(self.buf, self.pos)
+            # A number at the end of the buffer may continue in the next chunk. Values followed by other
+            # characters, IE: '1.2' of '1.2.3', are malformed.
+            if self.eof if end == len(self.buf) else self.buf[end] in _VALUE_ENDS:
+                self.pos = end
+                return v
+        except JSONDecodeError:
+            pass
+        self.mark = self.pos
+        try:
+            self._skip()
+            text = self.buf[self.mark:self.pos]
+        finally:
+            self.mark = None
+        v, end = self.raw_decode(text)
+        if end < len(text):
+            raise JSONDecodeError('Extra data', text, end)
+        return v
+
+    def _skip(self):
+        """ Skip the next JSON value without decoding it """
+        # Grow the read size while a value is kept, so large values are not copied again for every chunk.
+        size = self.chunk_size
+        c = self._peek()
+        if not c:
+            raise ValueError('ValueError: unexpected end of JSON document')
+        if c not in ('[', '{'):
+            while True:
+                if c == '"':
+                    end = _string_end(self.buf, self.pos + 1)
+                    if end == -1:
+                        end = None
+                else:
+                    end = _REGEX_SCALAR.match(self.buf, self.pos).end()
+                    # A number or literal at the end of the buffer may continue in the next chunk.
+                    if end == len(self.buf) and not self.eof:
+                        end = None
+                if end is not None:
+                    break
+                if self.eof:
+                    raise ValueError('ValueError: unexpected end of JSON document')
+                self._read(size)
+                if self.mark is not None:
+                    size *= 2
+            # Characters which can not start a value are skipped one at a time.
+            self.pos = max(end, self.pos + 1)
+            return
+        # Closing brackets of the open arrays and objects of the value.
+        closers = list()
+        while True:
+            m = _REGEX_STRUCTURE.search(self.buf, self.pos)
+            if m is None:
+                if self.eof:
+                    raise ValueError('ValueError: unexpected end of JSON document')
+                self.pos = len(self.buf)
+                self._read(size)
+                if self.mark is not None:
+                    size *= 2
+                continue
+            c = m.group()
+            if c == '"':
+                end = _string_end(self.buf, m.end())
+                if end == -1:
+                    if self.eof:
+                        raise ValueError('ValueError: unexpected end of JSON document')
+                    # Read more of the string, starting again from the opening quote.
+                    self.pos = m.start()
+                    self._read(size)
+                    if self.mark is not None:
+                        size *= 2
+                    continue
+                self.pos = end
+            elif c in '[{':
+                self.pos = m.end()
+                closers.append(']' if c == '[' else '}')
+            else:
+                if c not in closers:
+                    # The value is malformed and ends here, the bracket closes an enclosing array or object.
+                    self.pos = m.start()
+                    return
+                self.pos = m.end()
+                # Malformed values may leave arrays or objects open, these are closed along with the bracket.
+                while closers.pop() != c:
+                    pass
+                if not closers:
+                    return
+
+    def find(self, pointer: str):
+        """
+        Move to the value found at the JSON pointer, without decoding any other values.
+        :param pointer: JSON pointer (RFC 6901), IE: '/data/items'. An empty string is the whole document.
+        """
+        if pointer and not pointer.startswith('/'):
+            raise ValueError(f"ValueError: invalid JSON pointer '{pointer}'")
+        tokens = [t.replace('~1', '/').replace('~0', '~') for t in pointer.split('/')[1:]] if pointer else []
+        for token in tokens:
+            c = self._expect('{[')
+            if c == '{':
+                while self._peek() != '}':
+                    key = self._decode()
+                    self._expect(':')
+                    if key == token:
+                        break
+                    self._skip()
+                    if self._expect(',}') == '}':
+                        self.pos -= 1
+                else:
+                    raise ValueError(f"ValueError: JSON pointer '{pointer}' not found")
+            else:
+                if not token.isdigit():
+                    raise ValueError(f"ValueError: JSON pointer '{pointer}' not found")
+                for _ in range(int(token)):
+                    if self._peek() == ']':
+                        raise ValueError(f"ValueError: JSON pointer '{pointer}' not found")
+                    self._skip()
+                    self._expect(',')
+                if self._peek() == ']':
+                    raise ValueError(f"ValueError: JSON pointer '{pointer}' not found")
+
+    def elements(self) -> typing.Iterator[tuple]:
+        """
+        Yield a (value, exception) tuple for each element of the JSON array at the current position, the
+        exception is None if the element was decoded. Malformed elements are yielded as (element text,
+        JSONDecodeError) tuples and reading continues with the next element.
+        """
+        self._expect('[')
+        if self._peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            try:
+                yield self._decode(), None
+            except JSONDecodeError as e:
+                yield e.doc, e
+            if self._expect(',]') == ']':
+                return
+
+    def __iter__(self):
+        """ Yield the elements of the JSON array at the current position, malformed elements raise """
+        for v, e in self.elements():
+            if e is not None:
+                raise e
+            yield v
+
+
+def iter_json_array(source: typing.Union[str, os.PathLike, typing.IO, mmap.mmap], load: typing.Callable,
+                    pointer: str = '', skip_invalid: bool = False, errors: typing.Optional[list] = None,
+                    memory_map: bool = False) -> typing.Iterator:
+    """
+    Yield an object for each element of a JSON array in a file, decoding one element at a time.
+    :param source: File path, binary file object, text file object or memory map.
+    :param load: Function creating an object from a dict, see JSONObject._get_loader().
+    :param pointer: JSON pointer (RFC 6901) of the array, IE: '/data/items'. By default the whole
+                    document must be an array.
+    :param skip_invalid: Skip elements which fail to load, or fail to decode, instead of raising.
+    :param errors: If a list is given, elements which fail to load are skipped and a
+                   (index, element, exception) tuple is appended to the list. The element of malformed
+                   elements is the element text.
+    :param memory_map: Memory map the file if the source is a path, see open_source().
+    """
+    with open_source(source, memory_map) as f:
+        reader = JSONArrayReader(f)
+        reader.find(pointer)
+        for x, (data, decode_error) in enumerate(reader.elements()):
+            try:
+                if decode_error is not None:
+                    raise decode_error
+                if not isinstance(data, dict):
+                    raise TypeError(f"TypeError: expected a JSON object at index {x}, not '{type(data).__name__}'")
+                obj = load(data)
+            except Exception as e:
+                if errors is not None:
+                    errors.append((x, data, e))
+                elif not skip_invalid:
+                    raise
+                continue
+            yield obj
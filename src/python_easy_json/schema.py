@@ -0,0 +1,362 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import datetime
+import decimal
+import enum
+import functools
+import operator
+import sys
+import types
+import typing
+
+from .dates import DEFAULT_PARSER, DateParser
+
+# 3.14 introduced lazy annotation loading, we must use the 'annotationlib' to inspect annotations.
+if not (sys.version_info.major == 3 and sys.version_info.minor < 14):
+    from annotationlib import get_annotations, Format as annot_format
+
+_enum_t = type(enum.Enum)
+# Immutable annotation types, cast results of these types may be shared between objects.
+_IMMUTABLE_TYPES = (str, int, float, bool, complex, bytes, decimal.Decimal, datetime.date, datetime.datetime,
+                    datetime.time)
+
+# Incremented every time a JSONObject subclass is created. Schemas holding unresolved forward references
+# will try to resolve them again once a new model class has been defined.
+_generation = 0
+
+
+def bump_generation():
+    """ Signal that a new model class has been defined """
+    global _generation
+    _generation += 1
+
+
+def collect_annotations(cls_: type) -> dict:
+    """
+    Recursively collect annotation dictionary values from class and base classes.
+    :param cls_: Child object to inspect
+    :return: dict
+    """
+    annots = dict()
+    if hasattr(cls_, '__bases__') and cls_.__bases__:
+        for base in cls_.__bases__:
+            if base.__name__ == 'object':
+                continue
+            annots.update(collect_annotations(base))
+    # 3.14 introduced breaking changes to annotation inspection due to lazy annotation loading.
+    if sys.version_info.major == 3 and sys.version_info.minor < 14:
+        if hasattr(cls_, '__annotations__'):
+            annots.update(cls_.__annotations__)
+    else:
+        try:
+            annots.update(get_annotations(cls_, format=annot_format.VALUE))
+        except NameError:
+            # Annotations reference a name that does not exist yet, return forward references instead.
+            annots.update(get_annotations(cls_, format=annot_format.FORWARDREF))
+    return annots
+
+
+def _has_forward_ref(annot) -> bool:
+    """ Return True if the annotation, or any of its arguments, is a string or forward reference """
+    if isinstance(annot, (str, typing.ForwardRef)):
+        return True
+    args = getattr(annot, '__args__', None)
+    if isinstance(args, (list, tuple)):
+        return any(_has_forward_ref(a) for a in args)
+    return False
+
+
+def _resolve_forward_ref(cls_: type, key: str, annot):
+    """
+    Try to evaluate a forward referenced annotation using the namespace of the class that defined it.
+    :param cls_: Model class
+    :param key: Annotated property name
+    :param annot: Annotation value
+    :return: Resolved annotation or None if it can not be resolved yet.
+    """
+    for owner in cls_.__mro__:
+        if key in owner.__dict__.get('__annotations__', {}) or owner is cls_:
+            module = sys.modules.get(owner.__module__)
+            globalns = dict(vars(module)) if module else dict()
+            holder = types.SimpleNamespace(__annotations__={key: annot})
+            try:
+                return typing.get_type_hints(holder, globalns=globalns, localns=dict(vars(owner)))[key]
+            except (NameError, AttributeError, TypeError):
+                pass
+    return None
+
+
+class EnumTable:
+    """ Member lookup tables of an Enum class, replacing the exception driven lookups in cast_value() """
+    __slots__ = ('values', 'names')
+
+    def __init__(self, t: type):
+        """
+        :param t: Enum class
+        """
+        # Member values which can not be hashed are left to the normal Enum lookup.
+        self.values = {m.value: m for m in t if getattr(type(m.value), '__hash__', None) is not None}
+        self.names = dict(t.__members__)
+
+    def get(self, v):
+        """
+        Return the member for the value, looked up the same way as cast_value() does, or None if not found.
+        :param v: Value to look up
+        """
+        try:
+            m = self.values.get(v)
+            if m is None and not isinstance(v, str):
+                m = self.values.get(str(v))
+        except TypeError:
+            return None
+        if m is None:
+            # Hyphens in an enum property is not allowed, convert to underscore.
+            m = self.names.get(v.replace('-', '_') if isinstance(v, str) else str(v))
+        return m
+
+
+def is_simple_type(t) -> bool:
+    """ Return True if the value may be cast by just calling the type, see cast_value() """
+    return isinstance(t, type) and t not in (datetime.date, datetime.datetime) and not isinstance(t, _enum_t)
+
+
+def cast_value(annot_types: typing.Sequence, v, date_parser: DateParser = DEFAULT_PARSER,
+               enum_tables: typing.Optional[dict] = None, dispatch: typing.Optional[dict] = None):
+    """
+    Try to cast the value to one of the annotation types.
+    :param annot_types: List of annotation classes, see JSONObject._get_annot_cls().
+    :param v: Value to cast
+    :param date_parser: Parser for date and datetime values.
+    :param enum_tables: EnumTable objects keyed by Enum class.
+    :param dispatch: Union dispatch table, see compile_union_dispatch().
+    """
+    if dispatch:
+        annot_types = dispatch.get(type(v), annot_types)
+    # Check to see if the value is already in the correct type.
+    if type(v) in annot_types:
+        return v
+
+    for t in annot_types:
+        if t == datetime.date and not isinstance(v, datetime.date):
+            v = date_parser.parse_date(v)
+        elif t == datetime.datetime and not isinstance(v, datetime.datetime):
+            v = date_parser.parse_datetime(v)
+        elif isinstance(t, _enum_t):
+            if enum_tables:
+                m = enum_tables[t].get(v)
+                if m is not None:
+                    v = m
+                    break
+            # Try setting the Enum class by value
+            try:
+                v = t(v)
+                break
+            except ValueError:
+                # try converting type to string and set Enum class by value.
+                try:
+                    v = t(str(v))
+                    break
+                except ValueError:
+                    # Try setting the Enum value by Key instead of value
+                    # Hyphens in an enum property is not allowed, convert to underscore.
+                    if isinstance(v, str) and '-' in v:
+                        v = v.replace('-', '_')
+                    v = t[str(v)]
+                    break
+        else:
+            try:
+                v = t(v)
+                break
+            except (TypeError, ValueError):
+                pass
+
+    return v
+
+
+# Input types of union dispatch tables, None values are never cast.
+_DISPATCH_INPUT_TYPES = (str, int, float, bool, bytes, dict, list)
+# Input types which always raise TypeError when passed to the annotation type, see cast_value().
+_ALWAYS_FAILS = {
+    int: (dict, list),
+    float: (dict, list),
+    complex: (bytes, dict, list),
+    bytes: (str, float),
+}
+# Input types which the annotation type always accepts.
+_NEVER_FAILS = {
+    str: _DISPATCH_INPUT_TYPES,
+    bool: _DISPATCH_INPUT_TYPES,
+    int: (bool,),
+    float: (int, bool),
+}
+
+
+def compile_union_dispatch(annot_types: typing.Sequence) -> dict:
+    """
+    Return the dispatch table of a Union annotation, mapping the runtime type of a value to the annotation
+    types which may accept it. Annotation types which always fail for the runtime type, and any types after
+    one which never fails, are removed ahead of time. Date and datetime types replace the value with the
+    parsed value and the types after them are tried with it, these are never removed. The result is the
+    same as trying every annotation type.
+    :param annot_types: List of annotation classes, see JSONObject._get_annot_cls().
+    """
+    table = dict()
+    for in_t in _DISPATCH_INPUT_TYPES:
+        if in_t in annot_types:
+            # Value is already in the correct type.
+            table[in_t] = (in_t,)
+            continue
+        candidates = list()
+        for x, t in enumerate(annot_types):
+            if t == datetime.date or t == datetime.datetime:
+                # The runtime type of the value changes, see cast_value().
+                candidates.extend(annot_types[x:])
+                break
+            if in_t in _ALWAYS_FAILS.get(t, ()):
+                continue
+            candidates.append(t)
+            if in_t in _NEVER_FAILS.get(t, ()):
+                break
+        table[in_t] = tuple(candidates)
+    return table
+
+
+class FieldSchema:
+    """ Compiled type information for a single annotated model property """
+    __slots__ = ('name', 'annotation', 'types', 'nested_cls', 'enum_tables', 'dispatch', 'cast', 'immutable')
+
+    def __init__(self, model: type, annots: dict, name: str):
+        """
+        :param model: JSONObject model class
+        :param annots: Resolved annotations for the model class.
+        :param name: Property name
+        """
+        self.name = name
+        self.annotation = annots[name]
+        try:
+            # Member types used when casting values, Union types may have more than one.
+            self.types = tuple(model._get_annot_cls(annots, name))
+            # Class used to convert nested dict values or lists of dict values.
+            self.nested_cls = model._get_annot_cls(annots, name, ignore_builtins=True)[0]
+        except AttributeError:
+            # Annotations which are not classes, IE: 'None', are treated as if the property is not annotated.
+            self.types = tuple()
+            self.nested_cls = model._get_annot_cls(dict(), name)[0]
+        # Member lookup tables of Enum types.
+        self.enum_tables = {t: EnumTable(t) for t in self.types if isinstance(t, _enum_t)}
+        # Annotation types to try for each runtime value type of Union annotations.
+        self.dispatch = compile_union_dispatch(self.types) if len(self.types) > 1 else None
+        self.cast = functools.partial(cast_value, self.types, date_parser=model.__date_parser__,
+                                      enum_tables=self.enum_tables, dispatch=self.dispatch)
+        # Cast results are immutable, equal values may be cast once and shared.
+        self.immutable = all(t in _IMMUTABLE_TYPES or isinstance(t, _enum_t) for t in self.types)
+
+    def cast_column(self, values: typing.Sequence) -> list:
+        """
+        Cast every value of a column, the same as calling 'self.cast()' for each value. None, dict and list
+        values are not cast. Simple types are called over the whole column, equal values of other immutable
+        types are cast once per column.
+        :param values: Column values
+        """
+        nested = (dict, list)
+        if len(self.types) == 1 and is_simple_type(self.types[0]):
+            t = self.types[0]
+            try:
+                return [v if v is None or v.__class__ is t or isinstance(v, nested) else t(v) for v in values]
+            except (TypeError, ValueError):
+                pass  # Values which can not be cast are left unchanged, cast each value on its own.
+        cast = self.cast
+        if not self.immutable:
+            return [v if v is None or isinstance(v, nested) else cast(v) for v in values]
+        cast_values = dict()
+        result = list()
+        for v in values:
+            if v is None or isinstance(v, nested):
+                result.append(v)
+                continue
+            # Equal values of different types, IE: 1 and True, may be cast differently.
+            key = (v.__class__, v)
+            try:
+                result.append(cast_values[key])
+            except KeyError:
+                result.append(cast_values.setdefault(key, cast(v)))
+            except TypeError:
+                result.append(cast(v))  # Value is not hashable.
+        return result
+
+
+class ModelSchema:
+    """
+    Annotation information for a JSONObject model class, compiled once per class and
+    cached on the class. See JSONObject._get_schema().
+    """
+    __slots__ = ('model', 'annotations', 'fields', 'defaults', 'unresolved', 'generation', 'init', 'lazy_ready',
+                 'raw_export', 'view_cls', 'owner', 'class_getter', 'class_attrs', 'missing')
+
+    def __init__(self, model: type):
+        """
+        :param model: JSONObject model class
+        """
+        self.model = model
+        self.generation = _generation
+        # Generated constructor, see codegen.make_init(). False if the model class does not support it.
+        self.init = None
+        # True once LazyAttribute descriptors have been installed, see lazy.install_lazy_attributes().
+        self.lazy_ready = False
+        # Cached results of lazy._check_exportable() keyed by the 'cast_types' argument.
+        self.raw_export = dict()
+        # Row view class of the model class, see views.make_view_class().
+        self.view_cls = None
+        # Annotated property names whose forward references could not be resolved yet.
+        self.unresolved = set()
+
+        annots = collect_annotations(model)
+        for k, annot in annots.items():
+            if _has_forward_ref(annot):
+                resolved = _resolve_forward_ref(model, k, annot)
+                if resolved is None:
+                    self.unresolved.add(k)
+                else:
+                    annots[k] = resolved
+        self.annotations = annots
+
+        # Unresolved annotations are treated as if the property is not type annotated.
+        resolved_annots = {k: v for k, v in annots.items() if k not in self.unresolved}
+        self.fields = {k: FieldSchema(model, resolved_annots, k) for k in resolved_annots}
+
+        # Default values for properties missing from the data, only values that are not None are used.
+        # Compact and row view model classes use the defaults of the class they were created from.
+        owner = self.owner = model.__dict__.get('__compact_base__') or model.__dict__.get('__view_base__', model)
+        # Class attributes the schema was compiled from, replaced class attributes are detected by 'self.stale'.
+        # Class attribute defaults replaced by lazy attribute descriptors return the same default value.
+        names = [k for k in annots if hasattr(owner, k)]
+        self.class_getter = operator.attrgetter('__annotations__', '__date_parser__', *names)
+        self.class_attrs = self.class_getter(owner)
+        # Annotated properties without a class attribute default value.
+        self.missing = tuple(k for k in annots if k not in names)
+        self.defaults = list()
+        for k in annots:
+            if k in owner.__dict__:
+                v = getattr(owner, k)
+                if v is not None:
+                    self.defaults.append((k, v))
+
+    @property
+    def stale(self) -> bool:
+        """
+        Return True if the schema must be compiled again, IE: class attribute defaults, annotations or the
+        date parser of the model class were replaced, or unresolved forward references may be resolvable now.
+        """
+        if self.unresolved and self.generation != _generation:
+            return True
+        owner = self.owner
+        try:
+            # Equal class attribute values compile the same schema.
+            if self.class_getter(owner) != self.class_attrs:
+                return True
+        except Exception:
+            # A class attribute default value was deleted, or replaced with a value that can not be compared.
+            return True
+        return bool(self.missing) and any(hasattr(owner, k) for k in self.missing)
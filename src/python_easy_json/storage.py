@@ -0,0 +1,157 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Alternate object data storage, used as the '__data_dict__' descriptor of model classes.
+#
+import typing
+
+
+class InstanceDictStorage:
+    """
+    Data descriptor used as '__data_dict__' by single storage model classes. The object '__dict__' becomes
+    the only copy of the data, instead of storing every value in both '__data_dict__' and '__dict__'.
+    """
+    def __get__(self, obj, owner=None):
+        return None if obj is None else obj.__dict__
+
+    def __set__(self, obj, value):
+        raise AttributeError("'__data_dict__' can not be set on single storage objects")
+
+
+def instance_data(obj) -> dict:
+    """
+    Return the data of a single storage object, the object '__dict__' without hidden attributes, IE: keys
+    containing '__' such as name-mangled private attributes. The '__dict__' is returned when there are none.
+    :param obj: Single storage model object
+    """
+    data = obj.__dict__
+    for k in data:
+        if '__' in k:
+            return {k: v for k, v in data.items() if '__' not in k}
+    return data
+
+
+class SlotStorage:
+    """
+    Data storage of compact model classes. Annotated properties are stored in '__slots__' and any other
+    properties are stored in an overflow dict, which is only created when needed.
+    """
+    def __init__(self, names: typing.Sequence[str]):
+        """
+        :param names: Slot names for the declared properties.
+        """
+        self.names = frozenset(names)
+        # Slot member descriptors, set once the compact class has been created.
+        self.members = tuple()
+        self.extra = None
+        self.lazy = None
+
+    def bind(self, cls: type):
+        """
+        Look up the slot member descriptors of the compact class.
+        :param cls: Compact model class
+        """
+        self.members = tuple((k, cls.__dict__[k]) for k in cls.__slots__ if k in self.names)
+        self.extra = cls.__dict__['__extra__']
+        self.lazy = cls.__dict__['__lazy__']
+
+    def get_extra(self, obj) -> typing.Optional[dict]:
+        """ Return the overflow dict of the object, if there is one """
+        try:
+            return self.extra.__get__(obj)
+        except AttributeError:
+            return None
+
+    def data(self, obj) -> dict:
+        """ Return the object data as a new dict, used as the '__data_dict__' property of compact classes """
+        data = dict()
+        lazy = self.get_lazy(obj)
+        for k, member in self.members:
+            try:
+                data[k] = member.__get__(obj)
+            except AttributeError:
+                # Property value has not been set or has not been loaded yet.
+                if lazy and k in lazy:
+                    data[k] = lazy[k][0]
+        extra = self.get_extra(obj)
+        if extra:
+            data.update(extra)
+        return data
+
+    def get_lazy(self, obj) -> typing.Optional[dict]:
+        """ Return the lazily loaded values of the object, if there are any """
+        try:
+            return self.lazy.__get__(obj)
+        except AttributeError:
+            return None
+
+    def store(self, obj, data: dict, lazy: dict = None):
+        """
+        Store the data in the object slots and overflow dict.
+        :param obj: Compact model object
+        :param data: Property values
+        :param lazy: Lazily loaded values, the slots of these properties are left empty until loaded.
+        """
+        extra = None
+        for k, v in data.items():
+            if k in self.names:
+                if not lazy or k not in lazy:
+                    object.__setattr__(obj, k, v)
+            else:
+                if extra is None:
+                    extra = dict()
+                extra[k] = v
+        self.extra.__set__(obj, extra)
+        if lazy:
+            self.lazy.__set__(obj, lazy)
+
+    def set(self, obj, key: str, value):
+        """
+        Store a single property value.
+        :param obj: Compact model object
+        :param key: Property name
+        :param value: Property value
+        """
+        # Slots and hidden properties, IE: keys containing '__', are stored as normal attributes.
+        if key in self.names or '__' in key:
+            object.__setattr__(obj, key, value)
+            return
+        extra = self.get_extra(obj)
+        if extra is None:
+            extra = dict()
+            self.extra.__set__(obj, extra)
+        extra[key] = value
+
+
+def compact_setattr(self, key, value):
+    """ '__setattr__()' for compact model classes """
+    storage = self.__compact__
+    storage.set(self, key, value)
+    # A new value replaces any lazily loaded value.
+    lazy = storage.get_lazy(self)
+    if lazy and key in lazy:
+        del lazy[key]
+    if '__' in key:
+        return
+    if self.__changes__ is not None:
+        self.__changes__.changed.add(key)
+    if self.__export_cache__ is not None:
+        self.__export_cache__.invalidate()
+
+
+def compact_getattr(self, key):
+    """ '__getattr__()' for compact model classes, called when normal attribute lookup fails """
+    storage = self.__compact__
+    if key in ('__extra__', '__lazy__', '__export_cache__', '__changes__'):
+        return None
+    lazy = storage.get_lazy(self)
+    if lazy and key in lazy:
+        return self._load_lazy(key)
+    extra = storage.get_extra(self)
+    if extra and key in extra:
+        return extra[key]
+    # Fall back to the class attribute default value for declared properties that have not been set.
+    if key in storage.names:
+        return getattr(type(self).__compact_base__, key)
+    raise AttributeError(f"'{type(self).__name__}' object has no attribute '{key}'")
@@ -0,0 +1,170 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Row view objects over shared columns, see JSONObject.from_columns().
+#
+import typing
+
+_NESTED_TYPES = (dict, list)
+
+
+class ColumnTable:
+    """ Columns shared by the row view objects created from them """
+    __slots__ = ('columns', 'size', 'nested_cls', 'defaults', 'cast_types', 'ordered')
+
+    def __init__(self, columns: dict, nested_cls: dict, defaults: list, cast_types: bool, ordered: bool):
+        """
+        :param columns: Lists of values keyed by property name, already cast when casting types.
+        :param nested_cls: Classes to convert nested dict values, or lists of dict values, to, for each column.
+        :param defaults: Default values of annotated properties without a column.
+        :param cast_types: Cast nested objects when converting them.
+        :param ordered: Use OrderedDict() for nested objects.
+        """
+        self.columns = columns
+        self.size = len(next(iter(columns.values()))) if columns else 0
+        self.nested_cls = nested_cls
+        self.defaults = defaults
+        self.cast_types = cast_types
+        self.ordered = ordered
+
+    def get(self, obj, key: str):
+        """
+        Return the value of the row view object, raise KeyError if there is no column for the key.
+        :param obj: Row view object
+        :param key: Property name
+        """
+        v = self.columns[key][obj.__row__]
+        if isinstance(v, _NESTED_TYPES):
+            # Nested objects are converted once and kept by the row, like values written to the row.
+            v = obj._convert_nested(self.nested_cls[key], key, v, self.cast_types, self.ordered)
+            _get_extra(obj)[key] = v
+        return v
+
+
+def _get_extra(obj) -> dict:
+    """ Return the dict of values written to the row view object, creating it when needed """
+    extra = obj.__extra__
+    if extra is None:
+        extra = dict()
+        object.__setattr__(obj, '__extra__', extra)
+    return extra
+
+
+class ColumnAttribute:
+    """
+    Data descriptor of an annotated property of row view classes. Values are read from the shared column,
+    values written are kept by the row object and never change the shared columns.
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            # Class attribute default value of the model class.
+            return getattr(owner.__view_base__, self.name)
+        extra = obj.__extra__
+        if extra is not None and self.name in extra:
+            return extra[self.name]
+        try:
+            return obj.__table__.get(obj, self.name)
+        except KeyError:
+            return getattr(obj.__view_base__, self.name)
+
+    def __set__(self, obj, value):
+        _get_extra(obj)[self.name] = value
+
+
+def view_data(self) -> dict:
+    """ Return the object data as a new dict, used as the '__data_dict__' property of row view classes """
+    table = self.__table__
+    row = self.__row__
+    extra = self.__extra__
+    data = dict()
+    for k, col in table.columns.items():
+        if extra is not None and k in extra:
+            data[k] = extra[k]
+        else:
+            v = col[row]
+            data[k] = table.get(self, k) if isinstance(v, _NESTED_TYPES) else v
+    for k, v in table.defaults:
+        data[k] = extra[k] if extra is not None and k in extra else v
+    if extra:
+        for k, v in extra.items():
+            if k not in data:
+                data[k] = v
+    return data
+
+
+def view_setattr(self, key, value):
+    """ '__setattr__()' for row view classes """
+    if '__' in key:
+        object.__setattr__(self, key, value)
+        return
+    _get_extra(self)[key] = value
+    if self.__changes__ is not None:
+        self.__changes__.changed.add(key)
+    if self.__export_cache__ is not None:
+        self.__export_cache__.invalidate()
+
+
+def view_getattr(self, key):
+    """ '__getattr__()' for row view classes, called when normal attribute lookup fails """
+    extra = self.__extra__
+    if extra is not None and key in extra:
+        return extra[key]
+    try:
+        return self.__table__.get(self, key)
+    except KeyError:
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{key}'") from None
+
+
+def view_reduce(self):
+    """ Row views are pickled and copied as objects of the model class holding the row data """
+    return self.__view_base__, (self.to_dict(recursive=False),)
+
+
+def make_view_class(model: type) -> type:
+    """
+    Return a row view class of the model class. Row view objects are model objects reading their data from
+    columns shared by all rows, instead of holding a copy of the data.
+    :param model: JSONObject model class
+    """
+    schema = model._get_schema()
+    ns = {
+        '__slots__': ('__table__', '__row__', '__extra__'),
+        '__module__': model.__module__,
+        '__qualname__': model.__qualname__,
+        '__doc__': model.__doc__,
+        '__view_base__': model,
+        '__data_dict__': property(view_data),
+        '__setattr__': view_setattr,
+        '__getattr__': view_getattr,
+        '__reduce__': view_reduce,
+    }
+    for k in schema.annotations:
+        if k.isidentifier() and '__' not in k:
+            ns[k] = ColumnAttribute(k)
+    return type(model)(model.__name__, (model,), ns)
+
+
+def make_views(view_cls: type, table: ColumnTable) -> typing.List:
+    """
+    Create a row view object for each row of the table.
+    :param view_cls: Row view class, see make_view_class().
+    :param table: Shared columns
+    """
+    new = object.__new__
+    set_table = view_cls.__dict__['__table__'].__set__
+    set_row = view_cls.__dict__['__row__'].__set__
+    set_extra = view_cls.__dict__['__extra__'].__set__
+    objs = list()
+    for x in range(table.size):
+        obj = new(view_cls)
+        set_table(obj, table)
+        set_row(obj, x)
+        set_extra(obj, None)
+        objs.append(obj)
+    return objs
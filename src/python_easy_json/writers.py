@@ -0,0 +1,106 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Streaming writers exporting model objects to files, see JSONObject.write_json() and write_objects().
+#
+import contextlib
+import io
+import os
+import typing
+
+# Number of characters collected before writing them to the file.
+BUFFER_SIZE = 64 * 1024
+
+
+@contextlib.contextmanager
+def open_target(target: typing.Union[str, os.PathLike, typing.IO]):
+    """
+    Open the target file in binary mode if it is a path, file objects are used as is and left open.
+    :param target: File path or file object
+    """
+    if isinstance(target, (str, bytes, os.PathLike)):
+        with open(target, 'wb') as f:
+            yield f
+    else:
+        yield target
+
+
+class BufferedWriter:
+    """
+    Collect encoded chunks and write them to the file once 'buffer_size' characters are collected. Only the
+    buffer is held in memory, not the whole JSON document.
+    """
+    def __init__(self, f: typing.IO, buffer_size: int = BUFFER_SIZE):
+        """
+        :param f: Binary or text file object, binary files are written UTF-8 encoded.
+        :param buffer_size: Number of characters collected before writing them to the file.
+        """
+        if buffer_size < 1:
+            raise ValueError(f"ValueError: invalid buffer size '{buffer_size}'")
+        self.f = f
+        self.buffer_size = buffer_size
+        self.binary = isinstance(f, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(f, 'mode', '')
+        self.chunks = list()
+        self.size = 0
+
+    def write(self, chunk: str):
+        """ Add the chunk to the buffer, write the buffer to the file when full """
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def write_all(self, chunks: typing.Iterable[str]):
+        """ Add each chunk to the buffer """
+        for chunk in chunks:
+            self.write(chunk)
+
+    def flush(self):
+        """ Write the buffer to the file """
+        if not self.chunks:
+            return
+        data = ''.join(self.chunks)
+        self.f.write(data.encode('utf-8') if self.binary else data)
+        self.chunks = list()
+        self.size = 0
+
+
+def write_objects(objs: typing.Iterable, target: typing.Union[str, os.PathLike, typing.IO], ndjson: bool = False,
+                  indent: int = None, buffer_size: int = BUFFER_SIZE) -> int:
+    """
+    Write model objects to a file as a JSON array, or one object per line as NDJSON (JSON Lines). Objects
+    are encoded one at a time while iterating, so memory use does not grow with the number of objects.
+    The JSON array is the same as encoding a list of the objects data at once. Each object is encoded
+    whole with 'to_json()', which is about twice as fast as the incremental encoder used by
+    JSONObject.write_json(), use that for single very large objects.
+    :param objs: Iterable of JSONObject objects, may be a generator.
+    :param target: File path, binary file object or text file object.
+    :param ndjson: Write one object per line instead of a JSON array.
+    :param indent: Positive integer value for formatting JSON string indenting, not used for NDJSON.
+    :param buffer_size: Number of characters collected before writing them to the file.
+    :return: Number of objects written
+    """
+    count = 0
+    with open_target(target) as f:
+        writer = BufferedWriter(f, buffer_size)
+        if ndjson:
+            for obj in objs:
+                writer.write(obj.to_json())
+                writer.write('\n')
+                count += 1
+        else:
+            pad = None if indent is None else ' ' * indent
+            writer.write('[')
+            for obj in objs:
+                if pad is None:
+                    writer.write(', ' if count else '')
+                    writer.write(obj.to_json())
+                else:
+                    # Indent each line of the object, JSON strings never contain a raw line break.
+                    writer.write((',\n' if count else '\n') + pad)
+                    writer.write(obj.to_json(indent=indent).replace('\n', '\n' + pad))
+                count += 1
+            writer.write('\n]' if count and pad is not None else ']')
+        writer.flush()
+    return count
@@ -2,14 +2,53 @@
 # This file is subject to the terms and conditions defined in the
 # file 'LICENSE', which is part of this source code package.
 #
+import importlib
+import inspect
 import os
 import glob
+import unittest
 
 from unittest import TestCase
 
 from python_easy_json import JSONObject
 
 
+def json_formatting(test):
+    """
+    Decorator marking a test comparing exported JSON strings to the formatting, or incremental encoding, of
+    the 'json' module. Other JSON backends format JSON strings differently, see 'tests/test_backends.py'.
+    """
+    test.__json_formatting__ = True
+    return test
+
+
+def load_test_variants(namespace: dict, prefix: str, mixin: type, exclude: tuple = (),
+                       skip_json_formatting: bool = False):
+    """
+    Create a version of each unittest case class in the tests directory, with the mixin class as first base
+    class, in the namespace of the calling test module. The calling test module is left out.
+    :param namespace: 'globals()' of the calling test module.
+    :param prefix: Name prefix of the created classes, IE: 'Codegen'.
+    :param mixin: Class changing the setup of the test cases.
+    :param exclude: File names of other test modules left out.
+    :param skip_json_formatting: Skip tests marked with 'json_formatting()'.
+    """
+    tests_dir = os.path.dirname(__file__)
+    for file in sorted(os.listdir(tests_dir)):
+        if not file.startswith('test_') or not file.endswith('.py') or file in exclude or \
+                file == os.path.basename(namespace['__file__']):
+            continue
+        module = importlib.import_module(f'tests.{file[:-3]}')
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if not issubclass(cls, unittest.TestCase) or cls.__module__ != module.__name__:
+                continue
+            ns = {'__module__': namespace['__name__']}
+            if skip_json_formatting:
+                ns.update({t: unittest.skip('JSON formatting differs')(f) for t, f in inspect.getmembers(cls)
+                           if t.startswith('test') and getattr(f, '__json_formatting__', False)})
+            namespace[f'{prefix}{name}'] = type(f'{prefix}{name}', (mixin, cls), ns)
+
+
 class BaseTestCase(TestCase):
     """ Base class for all unittests """
     # A dictionary of test JSON data from the 'tests/test_data' directory.  The file name, minus extension,
@@ -4,22 +4,70 @@
 #
 
 # Performance testing the JSONObject
+#
+# Profile the JSONObject:    python -m tests.performance_tests
+# Run a single benchmark:    python -m tests.performance_tests <benchmark name> [arguments]
+import asyncio
+import copyreg
 import cProfile
+import io
+import json
+import pickle
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from datetime import datetime
+from typing import List
+
+from src.python_easy_json import JSONObject, compact, DateParser, DATEUTIL_PARSER, DEFAULT_PARSER, ISO_PARSER, \
+    available_backends, set_json_backend, to_columns, write_objects
+
+
+DATA = {
+    'id': '50',
+    'created':'2023-03-02 19:23:00',
+    'modified': '2023-03-02 19:23:00',
+    'fall_color': 'Red',
+    'lat': '123.123',
+    'long': '456.456',
+    'super_sized': "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat. Duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur. Excepteur sint occaecat cupidatat non proident, sunt in culpa qui officia deserunt mollit anim id est laborum."
+}
+
+
+class PerformanceModel(JSONObject):
+    """ Model representing the DATA dict """
+    id: int = None
+    created: datetime = None
+    modified: datetime = None
+    fall_color: str = None
+    lat: float = None
+    long: float = None
+    super_sized: str = None
+
+
+class SinglePerformanceModel(PerformanceModel, single_storage=True):
+    """ Model representing the DATA dict, storing data only in the object '__dict__' """
 
-from src.python_easy_json import JSONObject
+
+@compact
+class CompactPerformanceModel(PerformanceModel):
+    """ Model representing the DATA dict, storing data in '__slots__' """
+
+
+class NestedPerformanceModel(JSONObject):
+    """ Model holding a list of DATA dicts """
+    id: int = None
+    items: List[PerformanceModel] = None
 
 
 def run(iterations):
 
-    data = {
-        'id': '50',
-        'created':'2023-03-02 19:23:00',
-        'modified': '2023-03-02 19:23:00',
-        'fall_color': 'Red',
-        'lat': '123.123',
-        'long': '456.456',
-        'super_sized': "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat. Duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur. Excepteur sint occaecat cupidatat non proident, sunt in culpa qui officia deserunt mollit anim id est laborum."
-    }
+    data = DATA
 
     while iterations:
 
@@ -28,5 +76,434 @@ def run(iterations):
         iterations -= 1
 
 
+def _report(name: str, seconds: float, iterations: int, baseline: float = None):
+    """ Print a benchmark result line """
+    line = f'{name:<56} {seconds:8.3f}s  {iterations / seconds:12,.0f}/s'
+    if baseline:
+        line += f'  {baseline / seconds:6.2f}x'
+    print(line)
+
+
+def bench_codegen(iterations=100000):
+    """ Compare the generic constructor to the generated constructor on a flat model """
+    data = {k: v for k, v in DATA.items() if k not in ('created', 'modified')}
+    for cast_types in (False, True):
+        baseline = None
+        for codegen in (False, True):
+            PerformanceModel.__codegen__ = codegen
+            seconds = timeit.timeit(lambda: PerformanceModel(data, cast_types=cast_types), number=iterations)
+            _report(f'codegen={codegen}, cast_types={cast_types}', seconds, iterations, baseline)
+            baseline = baseline or seconds
+    PerformanceModel.__codegen__ = False
+
+
+def bench_columns(count=100000):
+    """ Compare exporting objects as columns with exporting each object with 'to_dict()' and transposing """
+    def transpose(objs):
+        dicts = [o.to_dict() for o in objs]
+        keys = list(dict.fromkeys(k for d in dicts for k in d))
+        return {k: [d.get(k) for d in dicts] for k in keys}
+
+    for name, model in (('dual storage', PerformanceModel), ('compact', CompactPerformanceModel)):
+        objs = model.from_records([DATA] * count, cast_types=True)
+        baseline = timeit.timeit(lambda: transpose(objs), number=1)
+        _report(f'{name}, to_dict() + transpose', baseline, count)
+        seconds = timeit.timeit(lambda: to_columns(objs), number=1)
+        _report(f'{name}, to_columns()', seconds, count, baseline)
+        try:
+            seconds = timeit.timeit(lambda: to_columns(objs, numpy=True), number=1)
+            _report(f'{name}, to_columns(numpy=True)', seconds, count, baseline)
+        except ImportError:
+            pass
+
+
+def bench_from_columns(count=100000):
+    """ Compare creating objects from columns with zipping the columns into dicts and calling the constructor """
+    columns = {k: [v] * count for k, v in DATA.items() if not isinstance(v, (dict, list))}
+    keys = tuple(columns)
+    for cast_types in (False, True):
+        baseline = timeit.timeit(
+            lambda: [PerformanceModel(dict(zip(keys, row)), cast_types=cast_types) for row in zip(*columns.values())],
+            number=1)
+        _report(f'cast_types={cast_types}, zip + constructor', baseline, count)
+        seconds = timeit.timeit(lambda: PerformanceModel.from_columns(columns, cast_types=cast_types), number=1)
+        _report(f'cast_types={cast_types}, from_columns()', seconds, count, baseline)
+        seconds = timeit.timeit(lambda: PerformanceModel.from_columns(columns, cast_types=cast_types, views=True),
+                                number=1)
+        _report(f'cast_types={cast_types}, from_columns(views=True)', seconds, count, baseline)
+
+
+def _dict_pickle(objs) -> bytes:
+    """ Pickle the objects with their '__dict__' as state, like objects without '__getstate__()' """
+    f = io.BytesIO()
+    pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+    reduce = lambda obj: (copyreg.__newobj__, (type(obj),), obj.__dict__)
+    pickler.dispatch_table = {cls: reduce for cls in (PerformanceModel, NestedPerformanceModel)}
+    pickler.dump(objs)
+    return f.getvalue()
+
+
+def bench_pickle(count=10000):
+    """ Compare the size and speed of pickling objects with only their data and with their '__dict__' """
+    models = (
+        ('flat', PerformanceModel, DATA),
+        ('nested', NestedPerformanceModel, {'id': '1', 'items': [DATA] * 10}),
+    )
+    for name, model, data in models:
+        objs = model.from_records([data] * count, cast_types=True)
+        modes = (
+            ('__dict__', _dict_pickle),
+            ('__getstate__()', lambda o: pickle.dumps(o, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+        dump_baseline = load_baseline = None
+        for mode, dumps in modes:
+            dump_seconds = timeit.timeit(lambda: dumps(objs), number=1)
+            pickled = dumps(objs)
+            load_seconds = timeit.timeit(lambda: pickle.loads(pickled), number=1)
+            print(f'{name}, {mode}: {len(pickled) / count:,.0f} bytes per object')
+            _report(f'{name}, {mode}, dumps', dump_seconds, count, dump_baseline)
+            _report(f'{name}, {mode}, loads', load_seconds, count, load_baseline)
+            dump_baseline = dump_baseline or dump_seconds
+            load_baseline = load_baseline or load_seconds
+
+
+def bench_dates(iterations=20000):
+    """ Compare date parsing strategies when casting the DATA dict """
+    baseline = None
+    parsers = (
+        ('dateutil', DATEUTIL_PARSER),
+        ('dateutil, cached', DateParser(iso=False, formats=(), cache_size=1024)),
+        ('default', DEFAULT_PARSER),
+        ('default, cached', DateParser(cache_size=1024)),
+        ('iso only', ISO_PARSER),
+    )
+    for name, parser in parsers:
+        PerformanceModel.__date_parser__ = parser
+        PerformanceModel.invalidate_schema()
+        seconds = timeit.timeit(lambda: PerformanceModel(DATA, cast_types=True), number=iterations)
+        _report(f'date_parser={name}', seconds, iterations, baseline)
+        baseline = baseline or seconds
+    PerformanceModel.__date_parser__ = DEFAULT_PARSER
+    PerformanceModel.invalidate_schema()
+
+
+async def _max_stall(read, interval: float = 0.001) -> tuple:
+    """ Return the seconds of running the coroutine and the longest the event loop was blocked """
+    ticks = [time.perf_counter()]
+    stalls = [0.0]
+
+    async def tick():
+        while True:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            stalls[0] = max(stalls[0], now - ticks[0] - interval)
+            ticks[0] = now
+
+    ticker = asyncio.get_running_loop().create_task(tick())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await read()
+    seconds = time.perf_counter() - start
+    ticker.cancel()
+    return seconds, max(stalls[0], time.perf_counter() - ticks[0] - interval)
+
+
+def bench_aio(count=100000):
+    """
+    Compare loading each line of a NDJSON stream in the event loop with aiter_ndjson(), which loads batches of
+    lines in the default executor, reporting the longest time the event loop could not run other tasks.
+    """
+    data = (json.dumps(DATA) + '\n').encode('utf-8') * count
+
+    def stream() -> asyncio.StreamReader:
+        reader = asyncio.StreamReader(limit=len(data) + 1)
+        reader.feed_data(data)
+        reader.feed_eof()
+        return reader
+
+    async def inline():
+        reader = stream()
+        async for line in reader:
+            PerformanceModel(line, cast_types=True)
+
+    async def batched(batch_size):
+        async for _ in PerformanceModel.aiter_ndjson(stream(), cast_types=True, batch_size=batch_size):
+            pass
+
+    baseline, stall = asyncio.run(_max_stall(inline))
+    _report('StreamReader lines, JSONObject()', baseline, count)
+    print(f'    longest event loop stall: {stall * 1000:.1f} ms')
+    for batch_size in (10, 100, 1000):
+        seconds, stall = asyncio.run(_max_stall(lambda: batched(batch_size)))
+        _report(f'aiter_ndjson(batch_size={batch_size})', seconds, count, baseline)
+        print(f'    longest event loop stall: {stall * 1000:.1f} ms')
+
+
+def bench_backends(iterations=100000):
+    """ Compare the JSON backends installed, loading and exporting JSON strings """
+    text = json.dumps(DATA)
+    for name in available_backends():
+        set_json_backend(name)
+        seconds = timeit.timeit(lambda: JSONObject(text).to_json(), number=iterations)
+        _report(f'json_backend={name}', seconds, iterations)
+    set_json_backend('json')
+
+
+def bench_binary(iterations=20000):
+    """ Compare caching objects as JSON strings, cast again when loaded, with the binary format """
+    models = (
+        ('flat', PerformanceModel, DATA),
+        ('nested', NestedPerformanceModel, {'id': '1', 'items': [DATA] * 10}),
+    )
+    for name, model, data in models:
+        obj = model(data, cast_types=True)
+        json_str = obj.to_json()
+        modes = [('JSON, cast_types=True', obj.to_json, lambda: model(json_str, cast_types=True), len(json_str))]
+        for codec in ('struct', 'msgpack'):
+            try:
+                b = obj.to_bytes(codec)
+            except ImportError:
+                continue
+            modes.append((f'to_bytes({codec!r})', lambda c=codec: obj.to_bytes(c), lambda b=b: model.from_bytes(b),
+                          len(b)))
+        n = iterations // 10 if name == 'nested' else iterations
+        dump_baseline = load_baseline = None
+        for mode, dump, load, size in modes:
+            dump_seconds = timeit.timeit(dump, number=n)
+            load_seconds = timeit.timeit(load, number=n)
+            print(f'{name}, {mode}: {size:,} bytes')
+            _report(f'{name}, {mode}, export', dump_seconds, n, dump_baseline)
+            _report(f'{name}, {mode}, load', load_seconds, n, load_baseline)
+            dump_baseline = dump_baseline or dump_seconds
+            load_baseline = load_baseline or load_seconds
+
+
+def bench_bytes(size_mb=8, iterations=10):
+    """
+    Compare loading a JSON document of several MB from bytes with decoding it to a string first. Nested
+    values are loaded lazily, so the time is spent decoding the document instead of creating objects.
+    """
+    payload = json.dumps({'rows': [DATA] * (size_mb * 1024 * 1024 // len(json.dumps(DATA)))}).encode('utf-8')
+    print(f'{len(payload) / 1024 ** 2:.1f} MB document')
+    for name in available_backends():
+        set_json_backend(name)
+        baseline = timeit.timeit(lambda: JSONObject(payload.decode('utf-8'), lazy=True), number=iterations)
+        _report(f'json_backend={name}, decode()', baseline, iterations)
+        seconds = timeit.timeit(lambda: JSONObject(payload, lazy=True), number=iterations)
+        _report(f'json_backend={name}, bytes', seconds, iterations, baseline)
+        seconds = timeit.timeit(lambda: JSONObject(memoryview(payload), lazy=True), number=iterations)
+        _report(f'json_backend={name}, memoryview', seconds, iterations, baseline)
+    set_json_backend('json')
+
+
+def bench_cache(iterations=20000):
+    """ Compare repeated exports of an unchanged nested object with and without cached exports """
+    class CachedPerformanceModel(PerformanceModel, cache_exports=True):
+        pass
+
+    data = dict(DATA, children=[DATA] * 10)
+    for export in ('to_json', 'to_dict'):
+        baseline = None
+        for name, model in (('uncached', PerformanceModel), ('cache_exports=True', CachedPerformanceModel)):
+            obj = model(data, cast_types=True)
+            seconds = timeit.timeit(getattr(obj, export), number=iterations)
+            _report(f'{export}(), {name}', seconds, iterations, baseline)
+            baseline = baseline or seconds
+        # Changing a nested object discards the cached exports, each export is done again.
+        seconds = timeit.timeit(lambda: (setattr(obj.children[0], 'id', '1'), getattr(obj, export)()),
+                                number=iterations)
+        _report(f'{export}(), cache_exports=True, nested change', seconds, iterations, baseline)
+
+
+def bench_lazy_cast(iterations=20000):
+    """ Compare casting values when loaded to casting values when first accessed, on a wide model """
+    data = {f'{k}_{x}': v for x in range(5) for k, v in DATA.items()}
+    model = type('WidePerformanceModel', (JSONObject,),
+                 {'__annotations__': {k: PerformanceModel.__annotations__[k.rsplit('_', 1)[0]] for k in data}})
+    baseline = timeit.timeit(lambda: model(data, cast_types=True), number=iterations)
+    _report('cast_types=True', baseline, iterations)
+    seconds = timeit.timeit(lambda: model(data, cast_types='lazy'), number=iterations)
+    _report("cast_types='lazy'", seconds, iterations, baseline)
+    seconds = timeit.timeit(lambda: model(data, cast_types='lazy').id_0, number=iterations)
+    _report("cast_types='lazy', one property read", seconds, iterations, baseline)
+
+
+def bench_records(*sizes):
+    """ Compare creating objects with a list comprehension to 'from_records()', for each number of rows """
+    for count in sizes or (1000, 100000, 1000000):
+        rows = [DATA] * count
+        for cast_types in (False, True):
+            seconds = timeit.timeit(lambda: [PerformanceModel(r, cast_types=cast_types) for r in rows], number=1)
+            _report(f'list comprehension, {count:,} rows, cast_types={cast_types}', seconds, count)
+            baseline = seconds
+            seconds = timeit.timeit(lambda: PerformanceModel.from_records(rows, cast_types=cast_types), number=1)
+            _report(f'from_records(), {count:,} rows, cast_types={cast_types}', seconds, count, baseline)
+
+
+def _instance_size(model: type, count: int, **kwargs) -> float:
+    """ Return the average number of bytes allocated for each object of the model class """
+    # Each object gets its own copy of the values, like objects loaded from JSON strings would.
+    rows = [{k: (v + str(x) if isinstance(v, str) else v) for k, v in DATA.items()} for x in range(count)]
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objs = [model(r, **kwargs) for r in rows]
+    size = (tracemalloc.get_traced_memory()[0] - start) / count
+    tracemalloc.stop()
+    del objs
+    return size
+
+
+def bench_memory(count=10000):
+    """ Compare the memory footprint of objects for each data storage mode """
+    baseline = None
+    models = (
+        ('dual storage', PerformanceModel),
+        ('single storage', SinglePerformanceModel),
+        ('compact', CompactPerformanceModel),
+    )
+    for name, model in models:
+        size = _instance_size(model, count)
+        line = f'{name:<40} {size:8.0f} bytes/object'
+        if baseline:
+            line += f'  {size / baseline * 100:6.1f}%'
+        print(line)
+        baseline = baseline or size
+
+
+def _memory_status() -> dict:
+    """ Return the peak, file backed and anonymous resident memory of this process in MB, Linux only """
+    status = dict()
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('VmHWM', 'RssAnon', 'RssFile'):
+                status[key] = int(value.split()[0]) / 1024
+    return status
+
+
+def _ingest(path: str, mode: str):
+    """ Load every record of the NDJSON file, run in a separate process by bench_mmap() """
+    start = time.perf_counter()
+    count = 0
+    if mode == 'read()':
+        with open(path) as f:
+            for line in f.read().splitlines():
+                PerformanceModel(json.loads(line))
+                count += 1
+    else:
+        for _ in PerformanceModel.iter_ndjson(path, memory_map=mode == 'memory map'):
+            count += 1
+    seconds = time.perf_counter() - start
+    status = _memory_status()
+    print(f'{mode:<20} {seconds:8.1f}s {count / seconds:10,.0f}/s  peak RSS {status["VmHWM"]:8.0f} MB  '
+          f'anonymous {status["RssAnon"]:8.0f} MB  file backed {status["RssFile"]:8.0f} MB')
+
+
+def bench_mmap(size_mb=4096):
+    """
+    Compare the memory use of reading a large NDJSON file with read(), buffered reads and a memory map.
+    Each mode runs in a new process. Memory mapped pages are counted as file backed resident memory, these
+    pages belong to the operating system page cache, are shared by every process mapping the file and may be
+    dropped by the kernel under memory pressure. Anonymous memory is private to each process.
+    """
+    line = (json.dumps(DATA) + '\n').encode('utf-8')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'records.ndjson')
+        with open(path, 'wb') as f:
+            block = line * (1024 * 1024 // len(line))
+            for _ in range(size_mb):
+                f.write(block)
+        print(f'{os.path.getsize(path) / 1024 ** 2:,.0f} MB NDJSON file')
+        # Reading a file of several GB into a single string needs several times the file size in memory.
+        modes = ('read()', 'buffered', 'memory map') if size_mb <= 1024 else ('buffered', 'memory map')
+        for mode in modes:
+            subprocess.run([sys.executable, '-c', f'from tests.performance_tests import _ingest; '
+                                                  f'_ingest({path!r}, {mode!r})'], check=True)
+
+
+def _count(objs: list) -> int:
+    """ Reduce function of bench_parallel(), returning only the number of objects from the workers """
+    return len(objs)
+
+
+def bench_parallel(count=200000, max_workers=None):
+    """
+    Compare loading a NDJSON file in this process with loading byte ranges of the file in 1 to N worker
+    processes, returning the objects or only a reduced result from the workers.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    workers = sorted({min(2 ** x, max_workers) for x in range(max_workers.bit_length() + 1)})
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'records.ndjson')
+        with open(path, 'w') as f:
+            f.write((json.dumps(DATA) + '\n') * count)
+        baseline = timeit.timeit(lambda: list(PerformanceModel.iter_ndjson(path, cast_types=True)), number=1)
+        _report('iter_ndjson()', baseline, count)
+        for n in workers:
+            seconds = timeit.timeit(
+                lambda: list(PerformanceModel.iter_ndjson_parallel(path, cast_types=True, workers=n)), number=1)
+            _report(f'iter_ndjson_parallel(), {n} workers', seconds, count, baseline)
+            seconds = timeit.timeit(
+                lambda: sum(PerformanceModel.iter_ndjson_parallel(path, cast_types=True, workers=n, reduce=_count)),
+                number=1)
+            _report(f'iter_ndjson_parallel(reduce=...), {n} workers', seconds, count, baseline)
+
+
+def _write_peak(write) -> tuple:
+    """ Return the seconds and peak traced memory in MB of writing to the null device """
+    with open(os.devnull, 'w') as f:
+        tracemalloc.start()
+        start = time.perf_counter()
+        write(f)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def bench_write(count=100000):
+    """
+    Compare the peak memory of writing objects as a JSON array and as NDJSON by joining 'to_json()' strings
+    with the streaming writer. Objects are created while writing in both cases.
+    """
+    def objs():
+        return (PerformanceModel(DATA) for _ in range(count))
+
+    def joined(f):
+        f.write('[' + ', '.join(o.to_json() for o in objs()) + ']')
+
+    modes = (
+        ('JSON array, to_json() joined', joined),
+        ('JSON array, write_objects()', lambda f: write_objects(objs(), f)),
+        ('NDJSON, write_objects()', lambda f: write_objects(objs(), f, ndjson=True)),
+    )
+    for name, write in modes:
+        seconds, peak = _write_peak(write)
+        print(f'{name:<40} {seconds:8.2f}s  peak {peak:8.1f} MB')
+
+
+BENCHMARKS = {
+    'aio': bench_aio,
+    'backends': bench_backends,
+    'binary': bench_binary,
+    'bytes': bench_bytes,
+    'cache': bench_cache,
+    'codegen': bench_codegen,
+    'columns': bench_columns,
+    'dates': bench_dates,
+    'from_columns': bench_from_columns,
+    'lazy_cast': bench_lazy_cast,
+    'memory': bench_memory,
+    'mmap': bench_mmap,
+    'parallel': bench_parallel,
+    'pickle': bench_pickle,
+    'records': bench_records,
+    'write': bench_write,
+}
+
+
 if __name__ == "__main__":
-    cProfile.run('run(100000)')
+    if len(sys.argv) > 1:
+        BENCHMARKS[sys.argv[1]](*[int(arg) for arg in sys.argv[2:]])
+    else:
+        cProfile.run('run(100000)')
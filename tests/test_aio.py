@@ -0,0 +1,212 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import asyncio
+import concurrent.futures
+import json
+import os
+
+from python_easy_json import awrite_ndjson
+from python_easy_json.aio import iter_batches
+from tests.base_test import BaseTestCase
+from tests.test_cache import CachedModel
+
+
+async def open_pipe():
+    """ Return a (StreamReader, StreamWriter) tuple for the ends of an operating system pipe """
+    loop = asyncio.get_running_loop()
+    read_fd, write_fd = os.pipe()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(read_fd, 'rb'))
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, os.fdopen(write_fd, 'wb'))
+    return reader, asyncio.StreamWriter(transport, protocol, None, loop)
+
+
+async def feed_pipe(data: bytes, chunk_size: int = 100):
+    """ Return a StreamReader of a pipe written to in chunks by a task, the pipe is closed at the end """
+    reader, writer = await open_pipe()
+
+    async def write():
+        for x in range(0, len(data), chunk_size):
+            writer.write(data[x:x + chunk_size])
+            await writer.drain()
+        writer.close()
+
+    asyncio.get_running_loop().create_task(write())
+    return reader
+
+
+async def collect(objs) -> list:
+    """ Return the items of an async iterable as a list """
+    return [obj async for obj in objs]
+
+
+class TestAsyncReader(BaseTestCase):
+    """ Test async iteration of NDJSON streams """
+
+    records = [{'id': str(x), 'type': 'Regular', 'batters': {'batter': [{'id': str(1000 + x)}]}} for x in range(50)]
+
+    def ndjson(self) -> bytes:
+        lines = [json.dumps(r) for r in self.records]
+        lines.insert(10, '')
+        return '\n'.join(lines).encode('utf-8')
+
+    def test_aiter_ndjson(self):
+        """ Test objects are the same as objects read from a file """
+        data = self.ndjson()
+        expected = [o.to_dict() for o in CachedModel.iter_ndjson(data.splitlines(), cast_types=True)]
+
+        async def run(**kwargs):
+            reader = await feed_pipe(data)
+            return await collect(CachedModel.aiter_ndjson(reader, cast_types=True, **kwargs))
+
+        objs = asyncio.run(run())
+        self.assertIsInstance(objs[0], CachedModel)
+        self.assertEqual([o.to_dict() for o in objs], expected)
+        objs = asyncio.run(run(batch_size=3, max_pending=1))
+        self.assertEqual([o.to_dict() for o in objs], expected)
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+            objs = asyncio.run(run(batch_size=20, executor=executor))
+        self.assertEqual([o.to_dict() for o in objs], expected)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run(batch_size=0))
+        with self.assertRaises(ValueError):
+            asyncio.run(run(max_pending=0))
+
+    def test_batches(self):
+        """ Test lines split across reads and lines longer than the stream buffer limit """
+        long_line = b'x' * 200000
+        data = b'a\nbb\n\n' + long_line + b'\nccc'
+
+        async def run(batch_size):
+            reader = await feed_pipe(data, chunk_size=7)
+            return await collect(iter_batches(reader, batch_size, read_size=5))
+
+        batches = asyncio.run(run(2))
+        self.assertTrue(all(len(b) <= 2 for b in batches))
+        self.assertEqual([line for b in batches for line in b], [b'a', b'bb', b'', long_line, b'ccc'])
+
+        async def fed():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'a\n')
+            reader.feed_eof()
+            return await collect(iter_batches(reader))
+
+        self.assertEqual(asyncio.run(fed()), [[b'a']])
+
+    def test_invalid(self):
+        """ Test invalid lines raise, or are skipped and reported with their line number """
+        data = b'\n'.join([b'{"id": 1}', b'', b'{"id": ', b'[1]', b'{"id": 5}'])
+
+        async def run(**kwargs):
+            reader = await feed_pipe(data, chunk_size=4)
+            return await collect(CachedModel.aiter_ndjson(reader, batch_size=2, **kwargs))
+
+        with self.assertRaises(Exception):
+            asyncio.run(run())
+        objs = asyncio.run(run(skip_invalid=True))
+        self.assertEqual([o.id for o in objs], [1, 5])
+        errors = list()
+        objs = asyncio.run(run(errors=errors))
+        self.assertEqual(len(objs), 2)
+        self.assertEqual([(x, line) for x, line, _ in errors], [(3, b'{"id": '), (4, b'[1]')])
+
+    def test_objects_before_invalid_line(self):
+        """ Test objects of the lines before an invalid line are yielded before the error is raised """
+        data = b'\n'.join([b'{"id": 1}', b'{"id": 2}', b'{"id": ', b'{"id": 4}'])
+
+        async def run():
+            objs = list()
+            reader = await feed_pipe(data)
+            try:
+                async for obj in CachedModel.aiter_ndjson(reader):
+                    objs.append(obj.id)
+            except Exception as e:
+                return objs, e
+            return objs, None
+
+        objs, exc = asyncio.run(run())
+        self.assertEqual(objs, [1, 2])
+        self.assertIsNotNone(exc)
+        expected = list()
+        with self.assertRaises(type(exc)):
+            for obj in CachedModel.iter_ndjson(data.splitlines()):
+                expected.append(obj.id)
+        self.assertEqual(objs, expected)
+
+    def test_backpressure(self):
+        """ Test reading stops while the queue of batches is full, and when the consumer stops early """
+        class CountingReader:
+            """ Stream of 1000 single line reads """
+            reads = 0
+
+            async def read(self, n):
+                if self.reads == 1000:
+                    return b''
+                self.reads += 1
+                return b'{"id": 1}\n'
+
+        async def run():
+            reader = CountingReader()
+            objs = CachedModel.aiter_ndjson(reader, max_pending=2)
+            await objs.__anext__()
+            await asyncio.sleep(0.05)
+            reads = reader.reads
+            await objs.aclose()
+            await asyncio.sleep(0.05)
+            return reads, reader.reads
+
+        reads, final_reads = asyncio.run(run())
+        # The consumed batch, the queued batches and a batch waiting for the queue.
+        self.assertLessEqual(reads, 4)
+        self.assertEqual(final_reads, reads)
+
+
+class TestAsyncWriter(BaseTestCase):
+    """ Test writing objects to streams as NDJSON """
+
+    def test_awrite_ndjson(self):
+        """ Test a round trip through a pipe """
+        objs = list(CachedModel.from_records([{'id': x, 'created': '2024-01-02'} for x in range(250)]))
+        expected = ''.join(o.to_json() + '\n' for o in objs).encode('utf-8')
+
+        async def run(source, **kwargs):
+            reader, writer = await open_pipe()
+
+            async def write():
+                try:
+                    return await awrite_ndjson(source, writer, **kwargs)
+                finally:
+                    writer.close()
+
+            task = asyncio.get_running_loop().create_task(write())
+            data = await reader.read()
+            return await task, data
+
+        self.assertEqual(asyncio.run(run(objs)), (250, expected))
+        self.assertEqual(asyncio.run(run(iter(objs), batch_size=7)), (250, expected))
+        self.assertEqual(asyncio.run(run([])), (0, b''))
+
+        async def agen():
+            for obj in objs:
+                yield obj
+
+        self.assertEqual(asyncio.run(run(agen(), batch_size=1)), (250, expected))
+
+        async def round_trip():
+            reader, writer = await open_pipe()
+            source = await feed_pipe(expected, chunk_size=1000)
+            task = asyncio.get_running_loop().create_task(
+                awrite_ndjson(CachedModel.aiter_ndjson(source, batch_size=9), writer, batch_size=11))
+            task.add_done_callback(lambda _: writer.close())
+            return await collect(CachedModel.aiter_ndjson(reader)), await task
+
+        copies, count = asyncio.run(round_trip())
+        self.assertEqual(count, 250)
+        self.assertEqual([o.to_dict() for o in copies], [o.to_dict() for o in objs])
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run(objs, batch_size=0))
@@ -0,0 +1,123 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Run the unittests again using each JSON backend installed, see 'set_json_backend()'.
+#
+import json
+import enum
+import math
+import uuid
+from datetime import datetime
+
+from python_easy_json import JSONObject, JSONBackend, available_backends, set_json_backend
+from python_easy_json.backends import get_backend
+from tests.base_test import BaseTestCase, load_test_variants
+
+
+class BackendEnum(enum.Enum):
+    A = 'a'
+
+
+class BackendIntEnum(enum.IntEnum):
+    X = 1
+
+
+class BackendFloat(float):
+    pass
+
+
+class BackendModel(JSONObject, json_backend='json'):
+    id: int = None
+    created: datetime = None
+
+
+def _make_backend_mixin(name: str) -> type:
+    """ Return a mixin setting the JSON backend for all model classes while running the test case """
+
+    class BackendMixin:
+
+        @classmethod
+        def setUpClass(cls):
+            cls._json_backend = JSONObject.__json_backend__
+            set_json_backend(name)
+            super().setUpClass()
+
+        @classmethod
+        def tearDownClass(cls):
+            set_json_backend(cls._json_backend)
+            super().tearDownClass()
+
+    return BackendMixin
+
+
+# Other backends format JSON strings differently, see 'base_test.json_formatting()'.
+for _backend in available_backends():
+    if _backend != 'json':
+        load_test_variants(globals(), _backend.capitalize(), _make_backend_mixin(_backend), ('test_codegen.py',),
+                           skip_json_formatting=True)
+
+
+class TestJSONBackends(BaseTestCase):
+    """ Test the JSON backends encode and decode the same data """
+
+    data = {'id': 1, 'name': 'café / "x"', 'created': datetime(2023, 3, 2, 19, 23), 'values': [1.5, None, True],
+            'big': 2 ** 70, 'nested': {'a': []}}
+
+    def test_backends(self):
+        """ Test every installed backend returns the same values as the 'json' module """
+        default = JSONObject._json_serial
+        expected = json.loads(json.dumps(self.data, default=default))
+        for name in available_backends():
+            backend = get_backend(name)
+            self.assertIsInstance(backend, JSONBackend)
+            self.assertEqual(backend.name, name)
+
+            for indent in (None, 2, 4):
+                text = backend.dumps(self.data, default=default, indent=indent)
+                self.assertIsInstance(text, str)
+                self.assertEqual(json.loads(text), expected, name)
+                self.assertEqual(backend.loads(text), expected, name)
+                self.assertEqual(backend.loads(text.encode('utf-8')), expected, name)
+
+            self.assertEqual(backend.dumps({'a': 1}, indent=2), json.dumps({'a': 1}, indent=2))
+            self.assertTrue(math.isnan(backend.loads('NaN')))
+            with self.assertRaises(json.JSONDecodeError):
+                backend.loads('{"id": ')
+
+    def test_special_values(self):
+        """ Test every backend encodes NaN, Infinity, Enum members and UUID objects like the 'json' module """
+        default = JSONObject._json_serial
+        data = {'c': BackendEnum.A, 'i': BackendIntEnum.X, 'n': math.nan, 'inf': math.inf,
+                'nested': {'values': [-math.inf, 1.5]}, 'u': uuid.UUID(int=1), 'f': BackendFloat(2.5)}
+        expected = repr(json.loads(json.dumps(data, default=default)))
+        self.assertIn("<BackendEnum.A: 'a'>", expected)
+        self.assertIn("UUID('00000000-0000-0000-0000-000000000001')", expected)
+        for name in available_backends():
+            backend = get_backend(name)
+            for value in (data, {'c': BackendEnum.A}, {'n': math.nan}, [math.inf], [uuid.UUID(int=1)],
+                          {'f': BackendFloat(2.5)}):
+                text = backend.dumps(value, default=default)
+                self.assertEqual(repr(json.loads(text)), repr(json.loads(json.dumps(value, default=default))), name)
+            self.assertEqual(repr(json.loads(backend.dumps(data, default=default, indent=2))), expected, name)
+
+    def test_get_backend(self):
+        """ Test looking up backends by name """
+        self.assertEqual(get_backend('auto').name, available_backends()[0])
+        self.assertIs(get_backend('json'), get_backend('json'))
+        self.assertEqual(available_backends()[-1], 'json')
+        with self.assertRaises(ValueError):
+            get_backend('yaml')
+
+    def test_model_backend(self):
+        """ Test model classes using their own backend """
+        backend = JSONObject.__json_backend__
+        try:
+            set_json_backend('auto')
+            obj = BackendModel('{"id": "1", "created": "2023-03-02 19:23:00"}', cast_types=True)
+
+            self.assertEqual(BackendModel.__json_backend__.name, 'json')
+            self.assertEqual(obj.to_json(), '{"id": 1, "created": "2023-03-02T19:23:00"}')
+            self.assertEqual(json.loads(JSONObject(obj.to_dict()).to_json()), json.loads(obj.to_json()))
+        finally:
+            set_json_backend(backend)
@@ -0,0 +1,184 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import importlib.util
+import unittest
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import List
+from zoneinfo import ZoneInfo
+
+from python_easy_json import JSONObject, compact
+from python_easy_json.binary import MAGIC, VERSION
+from tests.base_test import BaseTestCase
+from tests.test_cache import BatterModel, SingleToppingModel, ToppingModel
+from tests.test_changes import TrackedModel
+from tests.test_json_with_enum import TestEnum, TestIntEnum, TestStrEnum
+
+
+class BinaryModel(JSONObject):
+    id: int = None
+    created: datetime = None
+    day: date = None
+    price: Decimal = None
+    status: TestEnum = None
+    level: TestIntEnum = None
+    code: TestStrEnum = None
+    batters: BatterModel = None
+    topping: List[ToppingModel] = None
+
+
+class CountingModel(BinaryModel):
+    """ Model counting constructor calls """
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingModel.calls += 1
+        super().__init__(*args, **kwargs)
+
+
+HAS_MSGPACK = importlib.util.find_spec('msgpack') is not None
+
+
+class TestBinary(BaseTestCase):
+    """ Test exporting and loading objects with the binary format """
+
+    data = {
+        'id': '10',
+        'created': '2023-03-02 19:23:00.123456',
+        'day': '2023-03-02',
+        'price': '1.25',
+        'status': 2,
+        'level': 1,
+        'code': '20',
+        'batters': {'batter': [{'id': '1001', 'type': 'Regular'}]},
+        'topping': [{'id': '5001', 'type': 'None'}, {'id': '5002', 'type': 'Glazed'}],
+        'extra': {'name': 'x' * 300, 'values': [1, -200, 2 ** 40, 2.5, None, True, False, 'é']},
+    }
+
+    def codecs(self) -> list:
+        return ['struct', 'msgpack'] if HAS_MSGPACK else ['struct']
+
+    def round_trip(self, obj, codec: str):
+        """ Return the loaded object, after checking it holds the same data """
+        data = obj.to_bytes(codec)
+        self.assertEqual(data[:4], MAGIC)
+        other = type(obj).from_bytes(data)
+        self.assertIs(type(other), type(obj))
+        self.assertEqual(other.to_dict(), obj.to_dict())
+        self.assertEqual(other.to_json(), obj.to_json())
+        return other
+
+    def test_types(self):
+        """ Test values are loaded with the type they were exported with """
+        for codec in self.codecs():
+            obj = BinaryModel(self.data, cast_types=True)
+            obj.when = time(1, 2, 3, 4, tzinfo=timezone(timedelta(hours=-5)))
+            obj.zoned = datetime(2024, 11, 3, 1, 30, fold=1, tzinfo=ZoneInfo('America/New_York'))
+            obj.offset = datetime(2024, 1, 2, tzinfo=timezone.utc)
+            obj.blob = b'\x00\x01'
+            obj.plain = {'a': [date(2024, 1, 2)], 1: None}
+            other = self.round_trip(obj, codec)
+
+            self.assertEqual(other.created, datetime(2023, 3, 2, 19, 23, 0, 123456))
+            self.assertEqual(other.day, date(2023, 3, 2))
+            self.assertEqual(other.price, Decimal('1.25'))
+            self.assertIs(other.status, TestEnum.SecondValue)
+            self.assertIs(other.level, TestIntEnum.FirstValue)
+            self.assertIs(other.code, TestStrEnum.SecondStrValue)
+            self.assertIsInstance(other.batters, BatterModel)
+            self.assertIsInstance(other.topping[1], ToppingModel)
+            self.assertEqual(other.topping[1].id, 5002)
+            self.assertIsInstance(other.extra, JSONObject)
+            self.assertEqual(other.extra.values, [1, -200, 2 ** 40, 2.5, None, True, False, 'é'])
+            self.assertEqual(other.when, obj.when)
+            self.assertEqual(other.zoned.tzinfo, ZoneInfo('America/New_York'))
+            self.assertEqual((other.zoned.fold, other.zoned.utcoffset()), (1, timedelta(hours=-5)))
+            self.assertEqual(other.offset, obj.offset)
+            self.assertEqual(other.blob, b'\x00\x01')
+            self.assertEqual(other.plain, {'a': [date(2024, 1, 2)], 1: None})
+
+            # Enum values of properties without an Enum annotation are loaded as the value.
+            obj = JSONObject({}).update(status=TestEnum.FirstValue)
+            self.assertEqual(JSONObject.from_bytes(obj.to_bytes(codec)).status, 1)
+
+    def test_no_casting(self):
+        """ Test loading does not call the constructor or cast values """
+        obj = CountingModel(self.data, cast_types=True)
+        CountingModel.calls = 0
+        CountingModel.from_bytes(obj.to_bytes())
+        self.assertEqual(CountingModel.calls, 0)
+
+    def test_storage(self):
+        """ Test compact, single storage, lazily loaded and change tracking objects """
+        for codec in self.codecs():
+            self.round_trip(compact(BinaryModel)(self.data, cast_types=True), codec)
+            self.round_trip(SingleToppingModel({'id': 5001, 'type': 'None'}), codec)
+
+            obj = BinaryModel(self.data, cast_types='lazy', lazy=True)
+            other = BinaryModel.from_bytes(obj.to_bytes(codec))
+            self.assertEqual(other.topping[0].id, 5001)
+            self.assertEqual(other.to_dict(), BinaryModel(self.data, cast_types=True).to_dict())
+
+            obj = TrackedModel({'id': '1', 'topping': [{'id': '5001'}]}, cast_types=True)
+            obj.id = 2
+            other = self.round_trip(obj, codec)
+            self.assertEqual(other.changed_fields(), [])
+
+    def test_invalid(self):
+        """ Test invalid data raises ValueError """
+        data = BinaryModel(self.data, cast_types=True).to_bytes()
+        invalid = (
+            b'',
+            b'JSON' + data[4:],
+            MAGIC + bytes([VERSION + 1]) + data[5:],
+            data[:5] + b'\x09' + data[6:],
+            data[:-1],
+            data + b'\x00',
+            data[:6] + b'\x00',
+        )
+        for d in invalid:
+            with self.assertRaises(ValueError):
+                BinaryModel.from_bytes(d)
+        with self.assertRaises(ValueError):
+            BinaryModel({'id': 1}).to_bytes('pickle')
+        with self.assertRaises(TypeError):
+            JSONObject({'id': 1}).update(value=object()).to_bytes()
+        self.assertEqual(BinaryModel.from_bytes(memoryview(bytearray(data))).to_dict(),
+                         BinaryModel.from_bytes(data).to_dict())
+
+    def test_corrupt(self):
+        """ Test truncated or corrupted data of every value type raises ValueError """
+        obj = BinaryModel(self.data, cast_types=True)
+        obj.when = time(1, 2, 3, 4, tzinfo=timezone(timedelta(hours=-5)))
+        obj.zoned = datetime(2024, 11, 3, 1, 30, tzinfo=ZoneInfo('Europe/Paris'))
+        obj.blob = b'\x00\x01'
+        obj.plain = {'a': [date(2024, 1, 2)]}
+        for codec in self.codecs():
+            if codec == 'struct':
+                obj.big = 2 ** 70
+            data = obj.to_bytes(codec)
+            for n in range(len(data)):
+                with self.assertRaises(ValueError, msg=f'{codec} truncated to {n} bytes') as cm:
+                    BinaryModel.from_bytes(data[:n])
+                self.assertTrue(str(cm.exception).startswith('ValueError: '), str(cm.exception))
+            for x in range(6, len(data)):
+                # Zero and large lengths, unknown tags and changed values.
+                for b in {0x00, 0xff, data[x] ^ 0x01, data[x] ^ 0x80}:
+                    try:
+                        BinaryModel.from_bytes(data[:x] + bytes([b]) + data[x + 1:])
+                    except ValueError as e:
+                        self.assertTrue(str(e).startswith('ValueError: '), str(e))
+            obj.big = None
+
+    @unittest.skipUnless(HAS_MSGPACK, 'msgpack is not installed')
+    def test_msgpack(self):
+        """ Test the msgpack codec """
+        obj = JSONObject({'big': 2 ** 70})
+        self.assertEqual(JSONObject.from_bytes(obj.to_bytes()).big, 2 ** 70)
+        with self.assertRaises(ValueError):
+            obj.to_bytes('msgpack')
+        data = BinaryModel(self.data, cast_types=True).to_bytes('msgpack')
+        with self.assertRaises(ValueError):
+            BinaryModel.from_bytes(data[:-3])
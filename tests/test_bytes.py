@@ -2,6 +2,8 @@
 # This file is subject to the terms and conditions defined in the
 # file 'LICENSE', which is part of this source code package.
 #
+import json
+
 from tests.base_test import BaseTestCase
 from python_easy_json import JSONObject
 
@@ -21,3 +23,22 @@ class TestBytesData(BaseTestCase):
 
         self.assertTrue(hasattr(obj, 'cupcake'))
         self.assertEqual(obj.cupcake, 'bakers dozen')
+
+    def test_bytes_documents(self):
+        """ Test JSON documents as bytes, bytearray and memoryview objects """
+        text = '{"cupcake": "bakers dozen", "size-name": "café", "batter": [{"id": "1001"}]}'
+        expected = JSONObject(text).to_dict()
+        documents = (
+            text.encode('utf-8'),
+            bytearray(text.encode('utf-8')),
+            memoryview(text.encode('utf-8')),
+            memoryview(text.encode('utf-16')),
+        )
+        for doc in documents:
+            obj = JSONObject(doc)
+            self.assertEqual(obj.to_dict(), expected)
+            self.assertEqual(obj.size_name, 'café')
+            self.assertIsInstance(obj.batter[0], JSONObject)
+
+        with self.assertRaises(json.JSONDecodeError):
+            JSONObject(memoryview(b'{"cupcake": '))
@@ -0,0 +1,188 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import copy
+import pickle
+from datetime import datetime
+from typing import List
+
+from python_easy_json import JSONObject, compact
+from tests.base_test import BaseTestCase
+from tests.test_compact import CompactToppingModel
+
+
+class ToppingModel(JSONObject):
+    id: int = None
+    type: str = None
+
+
+class BatterModel(JSONObject):
+    batter: List[ToppingModel] = None
+
+
+class CachedModel(JSONObject, cache_exports=True):
+    id: int = None
+    created: datetime = None
+    batters: BatterModel = None
+    topping: List[ToppingModel] = None
+
+
+@compact
+class CompactCachedModel(JSONObject, cache_exports=True):
+    id: int = None
+    topping: List[CompactToppingModel] = None
+
+
+class SingleToppingModel(JSONObject, single_storage=True):
+    id: int = None
+
+
+class TestExportCache(BaseTestCase):
+    """ Test caching exported JSON strings and dicts """
+
+    data = {
+        'id': '10',
+        'created': '2023-03-02 19:23:00',
+        'batters': {'batter': [{'id': '1001', 'type': 'Regular'}]},
+        'topping': [{'id': '5001', 'type': 'None'}, {'id': '5002', 'type': 'Glazed'}],
+    }
+
+    def assertExports(self, obj: JSONObject):
+        """ Assert the cached exports are the same as exports of an uncached copy """
+        uncached = JSONObject(obj.to_dict(recursive=False))
+        self.assertEqual(obj.to_json(), uncached.to_json())
+        self.assertEqual(obj.to_dict(), uncached.to_dict())
+
+    def test_cached_exports(self):
+        """ Test repeated exports of unchanged objects return the cached value """
+        obj = CachedModel(self.data, cast_types=True)
+
+        self.assertIs(obj.to_json(), obj.to_json())
+        self.assertIs(repr(obj), obj.to_json())
+        self.assertIsNot(obj.to_json(indent=2), obj.to_json())
+        # Cached dicts are copied, callers may change the returned dict.
+        self.assertEqual(obj.to_dict(), obj.to_dict())
+        self.assertIs(obj._get_export(('dict', True, False)), obj._get_export(('dict', True, False)))
+        self.assertIsNot(obj.to_dict(dates_to_str=True), obj.to_dict())
+        self.assertEqual(dict(obj), obj.to_dict(dates_to_str=True))
+        # Classes not opting in never cache.
+        self.assertIsNot(obj.topping[0].to_dict(), obj.topping[0].to_dict())
+
+    def test_invalidate(self):
+        """ Test changing the object discards the cached exports """
+        obj = CachedModel(self.data, cast_types=True)
+        json_str = obj.to_json()
+
+        obj.id = 11
+        self.assertNotEqual(obj.to_json(), json_str)
+        self.assertEqual(obj.to_dict()['id'], 11)
+
+        obj.update({'name': 'cake'})
+        self.assertEqual(obj.to_dict()['name'], 'cake')
+
+        obj = obj + JSONObject({'color': 'red'})
+        self.assertEqual(obj.to_dict()['color'], 'red')
+        self.assertExports(obj)
+
+    def test_invalidate_nested(self):
+        """ Test changing nested objects, and objects in lists, discards the cached exports of parents """
+        obj = CachedModel(self.data, cast_types=True)
+        obj.to_json()
+        obj.to_dict()
+
+        obj.batters.batter[0].type = 'Chocolate'
+        self.assertEqual(obj.to_dict()['batters']['batter'][0]['type'], 'Chocolate')
+        self.assertIn('Chocolate', obj.to_json())
+
+        obj.topping[1].update(type='Sugar')
+        self.assertEqual(obj.to_dict()['topping'][1]['type'], 'Sugar')
+        self.assertExports(obj)
+
+        # Objects added later are tracked once the parent caches again.
+        obj.batters = BatterModel({'batter': [{'id': '1002', 'type': 'Blueberry'}]}, cast_types=True)
+        self.assertIn('Blueberry', obj.to_json())
+        obj.batters.batter[0].type = 'Devil'
+        self.assertIn('Devil', obj.to_json())
+
+        # Changing list values in place is not detected.
+        self.assertEqual(len(obj.to_dict()['topping']), 2)
+        obj.topping.append(ToppingModel({'id': 5003}))
+        self.assertEqual(len(obj.to_dict()['topping']), 2)
+        obj.invalidate_exports()
+        self.assertEqual(len(obj.to_dict()['topping']), 3)
+
+    def test_changed_export(self):
+        """ Test changing exported dicts, including nested dicts and lists, does not change the cache """
+        child = CachedModel({'id': 1})
+        obj = CachedModel({'id': 2, 'batters': {'batter': [{'id': 1001}]}})
+        obj.child = child
+        expected = obj.to_dict()
+
+        data = obj.to_dict()
+        data['child']['id'] = 999
+        data['batters']['batter'][0]['id'] = 999
+        data['batters']['batter'].append({'id': 1002})
+        data['id'] = 999
+        self.assertEqual(child.to_dict(), {'id': 1})
+        self.assertEqual(obj.to_dict(), expected)
+
+        data = child.to_dict()
+        data['id'] = 999
+        self.assertEqual(child.to_dict(), {'id': 1})
+        self.assertEqual(obj.to_dict()['child'], {'id': 1})
+
+    def test_shared_nested(self):
+        """ Test a nested object shared by several parents notifies every parent """
+        topping = ToppingModel({'id': 5001})
+        objs = [CachedModel({'id': x, 'topping': [topping]}) for x in range(3)]
+        for obj in objs:
+            obj.to_json()
+
+        topping.type = 'Maple'
+        for obj in objs:
+            self.assertIn('Maple', obj.to_json())
+
+    def test_compact(self):
+        """ Test compact objects cache exports """
+        obj = CompactCachedModel({'id': '10', 'topping': [{'id': '5001', 'type': 'None'}]}, cast_types=True)
+
+        self.assertIs(obj.to_json(), obj.to_json())
+        obj.topping[0].type = 'Maple'
+        self.assertEqual(obj.to_dict()['topping'][0]['type'], 'Maple')
+        obj.id = 11
+        self.assertEqual(obj.to_dict()['id'], 11)
+
+    def test_lazy(self):
+        """ Test loading lazy values does not return stale exports """
+        obj = CachedModel(self.data, cast_types='lazy', lazy=True)
+        before = obj.to_dict()
+        self.assertEqual(before['id'], '10')
+        self.assertEqual(obj.id, 10)
+        self.assertEqual(obj.to_dict()['id'], 10)
+
+        obj.to_json()
+        obj.topping[0].type = 'Maple'
+        self.assertIn('Maple', obj.to_json())
+
+    def test_single_storage(self):
+        """ Test single storage objects can not be tracked """
+        with self.assertRaises(TypeError):
+            type('SingleCachedModel', (JSONObject,), {}, single_storage=True, cache_exports=True)
+
+        obj = CachedModel({'id': 1, 'topping': [SingleToppingModel({'id': 5001})]})
+        self.assertIsNot(obj.to_dict(), obj.to_dict())
+        obj.topping[0].id = 5002
+        self.assertEqual(obj.to_dict()['topping'][0]['id'], 5002)
+
+    def test_copy(self):
+        """ Test copied and unpickled objects do not share the cache """
+        obj = CachedModel(self.data, cast_types=True)
+        obj.to_json()
+
+        # Shallow copies share nested objects, but not the cache.
+        self.assertIsNot(copy.copy(obj).to_json(), obj.to_json())
+        for other in (copy.deepcopy(obj), pickle.loads(pickle.dumps(obj))):
+            other.id = 99
+            self.assertEqual(other.to_dict()['id'], 99)
+            self.assertEqual(obj.to_dict()['id'], 10)
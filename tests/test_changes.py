@@ -0,0 +1,136 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import json
+from datetime import datetime
+from typing import List
+
+from python_easy_json import JSONObject, compact
+from tests.base_test import BaseTestCase
+from tests.test_cache import BatterModel, ToppingModel
+
+
+class TrackedModel(JSONObject, track_changes=True):
+    id: int = None
+    created: datetime = None
+    batters: BatterModel = None
+    topping: List[ToppingModel] = None
+
+
+@compact
+class CompactTrackedModel(JSONObject, track_changes=True):
+    id: int = None
+    topping: List[ToppingModel] = None
+
+
+class TestChangeTracking(BaseTestCase):
+    """ Test tracking changed properties and exporting patches """
+
+    data = {
+        'id': '10',
+        'created': '2023-03-02 19:23:00',
+        'batters': {'batter': [{'id': '1001', 'type': 'Regular'}]},
+        'topping': [{'id': '5001', 'type': 'None'}, {'id': '5002', 'type': 'Glazed'}],
+        'tags': ['a', 'b'],
+    }
+
+    def test_changed_fields(self):
+        """ Test properties set after construction are reported """
+        obj = TrackedModel(self.data, cast_types=True)
+        self.assertEqual(obj.changed_fields(), [])
+        self.assertEqual(obj.to_patch(), {})
+
+        obj.id = 11
+        obj.update({'name': 'cake'})
+        self.assertEqual(obj.changed_fields(), ['id', 'name'])
+
+        obj.mark_clean()
+        self.assertEqual(obj.changed_fields(), [])
+
+        # Objects of other classes track changes once marked clean.
+        other = JSONObject({'id': 1})
+        with self.assertRaises(ValueError):
+            other.changed_fields()
+        other.mark_clean()
+        other.id = 2
+        self.assertEqual(other.to_patch(), {'id': 2})
+
+    def test_nested_changes(self):
+        """ Test changes to nested objects and lists are reported """
+        obj = TrackedModel(self.data, cast_types=True)
+
+        obj.batters.batter[0].type = 'Chocolate'
+        self.assertEqual(obj.changed_fields(), ['batters'])
+        self.assertEqual(obj.batters.changed_fields(), ['batter'])
+
+        obj.topping[1].type = 'Sugar'
+        obj.tags.append('c')
+        self.assertEqual(obj.changed_fields(), ['batters', 'topping', 'tags'])
+
+    def test_merge_patch(self):
+        """ Test exporting a JSON Merge Patch (RFC 7386) """
+        obj = TrackedModel(self.data, cast_types=True)
+        obj.created = datetime(2024, 1, 2, 3, 4, 5)
+        obj.batters.batter[0].type = 'Chocolate'
+        obj.topping[1].type = 'Sugar'
+        obj.color = 'red'
+
+        self.assertEqual(obj.to_patch(dates_to_str=True), {
+            'created': '2024-01-02T03:04:05',
+            'batters': {'batter': [{'id': 1001, 'type': 'Chocolate'}]},
+            'topping': [{'id': 5001, 'type': 'None'}, {'id': 5002, 'type': 'Sugar'}],
+            'color': 'red',
+        })
+        # Nested objects replaced as a whole are exported whole.
+        obj.batters = BatterModel({'batter': []})
+        self.assertEqual(obj.to_patch()['batters'], {'batter': []})
+
+    def test_json_patch(self):
+        """ Test exporting a JSON Patch (RFC 6902) """
+        obj = TrackedModel(self.data, cast_types=True)
+        obj.id = 11
+        obj.batters.batter[0].type = 'Chocolate'
+        obj.topping[1] = ToppingModel({'id': 5003})
+        obj.topping[0].type = 'Maple'
+        obj.tags.append('c')
+        obj.update({'a/b': 1})
+
+        self.assertEqual(obj.to_patch(json_patch=True), [
+            {'op': 'replace', 'path': '/id', 'value': 11},
+            {'op': 'replace', 'path': '/batters/batter/0/type', 'value': 'Chocolate'},
+            {'op': 'replace', 'path': '/topping/0/type', 'value': 'Maple'},
+            {'op': 'replace', 'path': '/topping/1', 'value': {'id': 5003}},
+            {'op': 'replace', 'path': '/tags', 'value': ['a', 'b', 'c']},
+            {'op': 'add', 'path': '/a~1b', 'value': 1},
+        ])
+        json.dumps(obj.to_patch(json_patch=True, dates_to_str=True))
+
+    def test_lazy(self):
+        """ Test loading lazy values is not a change """
+        obj = TrackedModel(self.data, cast_types='lazy', lazy=True)
+        self.assertEqual(obj.id, 10)
+        self.assertEqual(obj.topping[0].id, 5001)
+        self.assertEqual(obj.changed_fields(), [])
+
+        obj.topping[0].type = 'Maple'
+        self.assertEqual(obj.to_patch(json_patch=True),
+                         [{'op': 'replace', 'path': '/topping/0/type', 'value': 'Maple'}])
+
+    def test_compact(self):
+        """ Test compact objects track changes """
+        obj = CompactTrackedModel({'id': '10', 'topping': [{'id': '5001'}]}, cast_types=True)
+        self.assertEqual(obj.changed_fields(), [])
+
+        obj.id = 11
+        obj.topping[0].type = 'Maple'
+        self.assertEqual(obj.to_patch(), {'id': 11, 'topping': [{'id': 5001, 'type': 'Maple'}]})
+
+    def test_from_records(self):
+        """ Test objects created from records track changes """
+        objs = TrackedModel.from_records([{'id': 1}, {'id': 2}])
+        objs[1].id = 3
+
+        self.assertEqual([o.to_patch() for o in objs], [{}, {'id': 3}])
+        with self.assertRaises(TypeError):
+            type('SingleTrackedModel', (JSONObject,), {}, single_storage=True, track_changes=True)
@@ -0,0 +1,108 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+# Run the unittests again using generated model constructors, see 'JSONObject.__codegen__'.
+#
+import json
+
+from python_easy_json import JSONObject
+from tests.base_test import BaseTestCase, json_formatting, load_test_variants
+from tests.test_nested_object_models import OakTreeModel, ForestUploadModel
+from tests.test_object_model import CakeModel, PythonTypingUnionModel, SimpleModel
+
+
+class CodegenModel(JSONObject, codegen=True):
+    id: int = None
+    name: str = 'codegen'
+
+
+class SetAttrModel(CodegenModel):
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+
+
+class CodegenMixin:
+    """ Enable generated constructors for all model classes while running the test case """
+
+    @classmethod
+    def setUpClass(cls):
+        cls._codegen = JSONObject.__codegen__
+        JSONObject.__codegen__ = True
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        JSONObject.__codegen__ = cls._codegen
+        super().tearDownClass()
+
+
+load_test_variants(globals(), 'Codegen', CodegenMixin)
+
+
+class TestCodegenInit(BaseTestCase):
+    """ Test generated constructors produce objects identical to the generic constructor """
+
+    def assertSameObject(self, a, b):
+        self.assertIs(type(a), type(b))
+        if isinstance(a, JSONObject):
+            self.assertEqual(list(a.__dict__.keys()), list(b.__dict__.keys()))
+            for k in a.__dict__:
+                self.assertSameObject(a.__dict__[k], b.__dict__[k])
+        elif isinstance(a, dict):
+            self.assertEqual(list(a.keys()), list(b.keys()))
+            for k in a:
+                self.assertSameObject(a[k], b[k])
+        elif isinstance(a, list):
+            self.assertEqual(len(a), len(b))
+            for x, y in zip(a, b):
+                self.assertSameObject(x, y)
+        else:
+            self.assertEqual(a, b)
+
+    def build(self, model, *args, **kwargs):
+        """ Return an object built with the generic constructor and with the generated constructor """
+        codegen = JSONObject.__codegen__
+        try:
+            JSONObject.__codegen__ = False
+            generic = model(*args, **kwargs)
+            JSONObject.__codegen__ = True
+            generated = model(*args, **kwargs)
+        finally:
+            JSONObject.__codegen__ = codegen
+        return generic, generated
+
+    def test_identical_objects(self):
+        """ Compare objects built by both constructors """
+        tree = {'id': '50', 'created': '2023-03-02 19:23:00', 'fall_color': 'Red', 'lat': '123.123',
+                'extra-key': b'bytes', 'extra_nested': {'a': [1, '{"b": 2}', 'null']}}
+        cases = [
+            (SimpleModel, self.json_data.simple),
+            (CakeModel, self.json_data.nested_data_1),
+            (OakTreeModel, tree),
+            (PythonTypingUnionModel, {'data': {'id': 1, 'type': 'bunt'}, 'settings': {'temp': 250.0}}),
+            (PythonTypingUnionModel, {'data': '20'}),
+            (JSONObject, self.json_data.nested_lists),
+            (JSONObject, None),
+        ]
+        for model, data in cases:
+            for cast_types in (False, True):
+                self.assertSameObject(*self.build(model, data, cast_types=cast_types))
+
+    @json_formatting
+    def test_generated_init_used(self):
+        """ Test the generated constructor is only used when enabled and supported """
+        obj = CodegenModel('{"id": "12"}', cast_types=True)
+        self.assertEqual(obj.id, 12)
+        self.assertEqual(obj.to_json(), json.dumps({'id': 12, 'name': 'codegen'}))
+
+        self.assertIsNotNone(CodegenModel._get_init())
+        # Classes overriding '__setattr__' use the generic constructor.
+        self.assertIsNone(SetAttrModel._get_init())
+        self.assertEqual(SetAttrModel({'id': '1'}, cast_types=True).id, 1)
+
+    def test_overridden_init_uses_generic_path(self):
+        """ Objects with data set before the base constructor runs fall back to the generic constructor """
+        generic, generated = self.build(ForestUploadModel, {'body': 'abc'})
+        self.assertSameObject(generic, generated)
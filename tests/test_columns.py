@@ -0,0 +1,179 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import array
+import importlib.util
+import pickle
+import sqlite3
+import unittest
+from datetime import datetime
+from typing import List
+
+from python_easy_json import JSONObject, compact, to_columns
+from tests.base_test import BaseTestCase
+from tests.test_cache import ToppingModel
+
+
+class ColumnModel(JSONObject):
+    id: int = None
+    ppu: float = None
+    active: bool = None
+    created: datetime = None
+    topping: List[ToppingModel] = None
+
+
+class DefaultColumnModel(JSONObject):
+    id: int = None
+    name: str = 'default'
+
+
+class TestColumns(BaseTestCase):
+    """ Test exporting objects as columns """
+
+    records = [
+        {'id': '1', 'ppu': '0.55', 'active': True, 'created': '2023-03-02 19:23:00',
+         'topping': [{'id': '5001', 'type': 'None'}]},
+        {'id': '2', 'ppu': '0.65', 'active': False, 'name': 'second'},
+        {'id': '3', 'ppu': '0.75', 'color': 'red'},
+    ]
+
+    def transpose(self, objs: list) -> dict:
+        """ Export the objects with to_dict() and transpose the dicts """
+        dicts = [o.to_dict() for o in objs]
+        keys = list(dict.fromkeys(k for d in dicts for k in d))
+        return {k: [d.get(k) for d in dicts] for k in keys}
+
+    def test_to_columns(self):
+        """ Test the columns are the same as transposed dicts """
+        for model in (ColumnModel, compact(ColumnModel)):
+            objs = model.from_records(self.records, cast_types=True)
+            columns = to_columns(iter(objs))
+
+            self.assertEqual({k: list(v) for k, v in columns.items()}, self.transpose(objs))
+            self.assertEqual(list(columns), ['id', 'ppu', 'active', 'created', 'topping', 'name', 'color'])
+            self.assertEqual(columns['id'], array.array('q', [1, 2, 3]))
+            self.assertEqual(columns['ppu'], array.array('d', [0.55, 0.65, 0.75]))
+            # Columns with missing values, or values of other types, are lists.
+            self.assertEqual(columns['active'], [True, False, None])
+            self.assertEqual(columns['topping'], [[{'id': 5001, 'type': 'None'}], None, None])
+
+        objs = ColumnModel.from_records(self.records)
+        self.assertEqual(to_columns(objs)['id'], ['1', '2', '3'])
+        self.assertEqual(to_columns(objs, fields=['name', 'missing']),
+                         {'name': [None, 'second', None], 'missing': [None, None, None]})
+        self.assertEqual(to_columns([]), {})
+
+    def test_lazy(self):
+        """ Test lazily loaded objects are exported like to_dict() """
+        objs = ColumnModel.from_records(self.records, cast_types='lazy', lazy=True)
+        self.assertEqual(to_columns(objs), self.transpose(objs))
+
+    @unittest.skipUnless(importlib.util.find_spec('numpy'), 'NumPy is not installed')
+    def test_numpy(self):
+        """ Test NumPy masked array columns """
+        import numpy
+
+        columns = to_columns(ColumnModel.from_records(self.records, cast_types=True), numpy=True)
+
+        self.assertEqual(columns['id'].dtype, numpy.int64)
+        self.assertEqual(columns['id'].tolist(), [1, 2, 3])
+        self.assertEqual(columns['ppu'].dtype, numpy.float64)
+        self.assertEqual(columns['active'].dtype, numpy.bool_)
+        self.assertEqual(columns['active'].mask.tolist(), [False, False, True])
+        self.assertEqual(columns['active'].tolist(), [True, False, None])
+        self.assertEqual(columns['name'].dtype, object)
+        self.assertEqual(columns['name'].tolist(), [None, 'second', None])
+        self.assertEqual(columns['topping'][0], [{'id': 5001, 'type': 'None'}])
+
+
+class TestFromColumns(BaseTestCase):
+    """ Test creating objects from columns """
+
+    columns = {
+        'id': ['1', '2', '3'],
+        'ppu': ['0.55', '0.65', None],
+        'created': ['2023-03-02 19:23:00', None, None],
+        'topping': [[{'id': '5001', 'type': 'None'}], None, []],
+        'name': [b'first', 'second', None],
+    }
+
+    def records(self) -> list:
+        """ Transpose the columns to records """
+        return [dict(zip(self.columns, row)) for row in zip(*self.columns.values())]
+
+    def test_from_columns(self):
+        """ Test objects are the same as objects created from records """
+        for cast_types in (False, True, 'lazy'):
+            for model in (ColumnModel, compact(ColumnModel)):
+                objs = model.from_columns(self.columns, cast_types=cast_types)
+                # Columns are cast when the objects are created, also when casting lazily.
+                expected = model.from_records(self.records(), cast_types=bool(cast_types))
+                self.assertEqual([o.to_dict() for o in objs], [o.to_dict() for o in expected])
+                self.assertEqual([o.to_json() for o in objs], [o.to_json() for o in expected])
+
+        objs = ColumnModel.from_columns(self.columns, cast_types=True, lazy=True)
+        self.assertEqual(objs[0].topping[0].id, 5001)
+        self.assertEqual(objs[0].created, datetime(2023, 3, 2, 19, 23))
+        self.assertEqual(objs[0].name, 'first')
+
+        # Columns exported with to_columns() are loaded back.
+        objs = ColumnModel.from_columns(self.columns, cast_types=True)
+        self.assertEqual([o.to_dict() for o in ColumnModel.from_columns(to_columns(objs))],
+                         [o.to_dict() for o in objs])
+        self.assertEqual(ColumnModel.from_columns({'id': []}), [])
+        with self.assertRaises(ValueError):
+            ColumnModel.from_columns({'id': [1, 2], 'ppu': [0.5]})
+
+    def test_views(self):
+        """ Test row view objects read from the shared columns """
+        objs = ColumnModel.from_columns(self.columns, cast_types=True, views=True)
+        expected = ColumnModel.from_records(self.records(), cast_types=True)
+
+        self.assertIsInstance(objs[0], ColumnModel)
+        self.assertEqual([o.to_dict() for o in objs], [o.to_dict() for o in expected])
+        self.assertEqual([o.to_json() for o in objs], [o.to_json() for o in expected])
+        self.assertEqual(objs[0].topping[0].id, 5001)
+        self.assertIsNone(objs[1].active)
+        self.assertEqual(objs[2].topping, [])
+        self.assertIs(objs[0].__table__, objs[1].__table__)
+        with self.assertRaises(AttributeError):
+            _ = objs[0].missing
+
+        # Values set on a row view do not change the columns.
+        objs[0].id = 10
+        objs[0].color = 'red'
+        self.assertEqual((objs[0].id, objs[0].color, objs[1].id), (10, 'red', 2))
+        self.assertEqual(objs[0].to_dict()['color'], 'red')
+        self.assertEqual(objs[0].__table__.columns['id'], [1, 2, 3])
+        self.assertEqual(pickle.loads(pickle.dumps(objs[0])).to_dict(), objs[0].to_dict())
+
+        with self.assertRaises(TypeError):
+            compact(ColumnModel).from_columns(self.columns, views=True)
+
+    def test_view_defaults(self):
+        """ Test values set on a row view for defaulted properties missing from the columns are exported """
+        obj = DefaultColumnModel.from_columns({'id': [1, 2]}, views=True)[0]
+        self.assertEqual(obj.to_dict(), {'id': 1, 'name': 'default'})
+        obj.name = 'changed'
+        expected = DefaultColumnModel({'id': 1})
+        expected.name = 'changed'
+
+        self.assertEqual(obj.name, 'changed')
+        self.assertEqual(obj.to_dict(), expected.to_dict())
+        self.assertEqual(obj.to_json(), expected.to_json())
+        self.assertEqual(list(obj.to_dict()), list(expected.to_dict()))
+
+    def test_from_cursor(self):
+        """ Test objects are created from a DB-API result set """
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE item (id TEXT, ppu REAL, name TEXT)')
+        conn.executemany('INSERT INTO item VALUES (?, ?, ?)', [('1', 0.55, 'first'), ('2', None, None)])
+
+        objs = ColumnModel.from_cursor(conn.execute('SELECT * FROM item'), cast_types=True)
+        self.assertEqual([o.to_dict() for o in objs],
+                         [{'id': 1, 'ppu': 0.55, 'name': 'first'}, {'id': 2, 'ppu': None, 'name': None}])
+        objs = ColumnModel.from_cursor(conn.execute('SELECT id FROM item'), views=True)
+        self.assertEqual([o.id for o in objs], ['1', '2'])
+        self.assertEqual(ColumnModel.from_cursor(conn.execute('SELECT * FROM item WHERE 0')), [])
+        conn.close()
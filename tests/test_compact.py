@@ -0,0 +1,139 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import json
+import pickle
+from datetime import datetime
+from typing import List
+
+from python_easy_json import JSONObject, compact
+from tests.base_test import BaseTestCase
+
+
+@compact
+class CompactToppingModel(JSONObject):
+    id: int = None
+    type: str = None
+
+
+@compact
+class CompactModel(JSONObject):
+    id: int = None
+    created: datetime = None
+    name: str = 'compact'
+    topping: List[CompactToppingModel] = None
+
+
+class DualModel(JSONObject):
+    id: int = None
+    created: datetime = None
+    name: str = 'compact'
+    topping: List[CompactToppingModel] = None
+
+
+class TestCompactModel(BaseTestCase):
+    """ Test model classes storing data in '__slots__' """
+
+    data = {'id': '10', 'created': '2023-03-02 19:23:00', 'topping': [{'id': '5001', 'type': 'None'}]}
+
+    def test_compact_model(self):
+        """ Test annotated properties are stored in slots """
+        obj = CompactModel(self.data, cast_types=True)
+
+        self.assertIsInstance(obj, CompactModel)
+        self.assertEqual(CompactModel.__name__, 'CompactModel')
+        self.assertIn('id', CompactModel.__slots__)
+
+        self.assertEqual(obj.id, 10)
+        self.assertIsInstance(obj.created, datetime)
+        self.assertEqual(obj.name, 'compact')
+        self.assertIsInstance(obj.topping[0], CompactToppingModel)
+        self.assertEqual(obj.topping[0].id, 5001)
+        # No overflow dict is created when all properties are declared.
+        self.assertIsNone(obj.__extra__)
+
+    def test_missing_values(self):
+        """ Test properties missing from the data return the class default value """
+        obj = CompactModel({'id': 1})
+
+        self.assertIsNone(obj.created)
+        self.assertEqual(obj.to_dict(), {'id': 1, 'name': 'compact'})
+        with self.assertRaises(AttributeError):
+            self.assertIsNone(obj.not_a_property)
+
+    def test_extra_properties(self):
+        """ Test undeclared properties are stored in the overflow dict """
+        obj = CompactModel({'id': 1, 'color': 'red', 'size-name': 'large'})
+
+        self.assertEqual(obj.color, 'red')
+        self.assertEqual(obj.size_name, 'large')
+        self.assertEqual(obj.__extra__, {'color': 'red', 'size_name': 'large'})
+
+        obj.shape = 'round'
+        self.assertEqual(obj.shape, 'round')
+        self.assertEqual(list(obj.to_dict().keys()), ['id', 'name', 'color', 'size_name', 'shape'])
+
+    def test_export_matches_default_model(self):
+        """ Test exported data is the same as a default model """
+        obj = CompactModel(self.data, cast_types=True)
+        dual = DualModel(self.data, cast_types=True)
+
+        self.assertEqual(obj.to_dict(), dual.to_dict())
+        self.assertEqual(json.loads(obj.to_json()), json.loads(dual.to_json()))
+        self.assertEqual(dict(obj), dict(dual))
+        self.assertEqual(len(obj), len(dual))
+
+    def test_update(self):
+        """ Test updating properties of a compact object """
+        obj = CompactModel(self.data)
+        obj.update({'id': 20, 'color': 'red'})
+        obj = obj + JSONObject({'name': 'updated'})
+
+        self.assertEqual(obj.id, 20)
+        self.assertEqual(obj.name, 'updated')
+        self.assertEqual(obj.to_dict()['color'], 'red')
+        self.assertEqual(len(obj), 5)
+
+    def test_pickle(self):
+        """ Test compact objects may be pickled """
+        obj = CompactModel(self.data, cast_types=True)
+        obj.color = 'red'
+        copy = pickle.loads(pickle.dumps(obj))
+
+        self.assertIsInstance(copy, CompactModel)
+        self.assertEqual(copy.to_dict(), obj.to_dict())
+
+    def test_invalid_class(self):
+        """ Test only JSONObject classes may be compact """
+        with self.assertRaises(TypeError):
+            compact(dict)
+
+    def test_subclass(self):
+        """ Test subclasses of compact classes can not add properties, but compact subclasses of the model can """
+        with self.assertRaises(TypeError):
+            class AddedModel(CompactModel):
+                size: int = 3
+
+        class MethodModel(CompactModel):
+            def label(self):
+                return f'{self.name} {self.id}'
+
+        obj = MethodModel({'id': '1', 'color': 'red'}, cast_types=True)
+        self.assertEqual(obj.label(), 'compact 1')
+        self.assertEqual(obj.name, 'compact')
+        self.assertEqual(obj.to_dict(), {'id': 1, 'color': 'red'})
+
+        @compact
+        class SizeModel(DualModel):
+            size: int = 3
+
+        obj = SizeModel({'id': '1', 'size': '2'}, cast_types=True)
+        self.assertEqual(obj.size, 2)
+        self.assertEqual(SizeModel({'id': 1}).size, 3)
+
+    def test_instance_dict(self):
+        """ Test data is not stored in the object '__dict__' """
+        obj = CompactModel(self.data, cast_types=True)
+        obj.color = 'red'
+        self.assertEqual(obj.__dict__, {})
@@ -4,13 +4,14 @@
 #
 import json
 
-from tests.base_test import BaseTestCase
+from tests.base_test import BaseTestCase, json_formatting
 from python_easy_json import JSONObject
 
 
 class TestDataExport(BaseTestCase):
     """ Test loading data into a JSONObject and exporting back out """
 
+    @json_formatting
     def test_simple_json_text_export(self):
         """ Test converting a simple JSON string to a JSONObject"""
         data = """{"key_2": 123, "key_1": "value_1"}"""
@@ -0,0 +1,103 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+
+from python_easy_json import JSONObject, DateParser, DATEUTIL_PARSER, DEFAULT_PARSER, ISO_PARSER
+from tests.base_test import BaseTestCase
+
+
+class DateModel(JSONObject):
+    created: datetime = None
+    birthday: date = None
+
+
+class ISODateModel(DateModel, date_parser=ISO_PARSER):
+    pass
+
+
+class EpochDateModel(DateModel, date_parser=DateParser(epoch='milliseconds')):
+    pass
+
+
+class TestDateParser(BaseTestCase):
+    """ Test parsing date and datetime values when casting """
+
+    values = (
+        '2023-03-02 19:23:00',
+        '2023-03-02T19:23:00.123456',
+        '2023-03-02T19:23:00+05:00',
+        '2023-03-02',
+        '2023/03/02 19:23:00',
+        '03/02/2023',
+        'March 2, 2023 7:23 PM',
+    )
+
+    def test_same_as_dateutil(self):
+        """ Test the default parser returns the same values as the dateutil parser """
+        for v in self.values:
+            self.assertEqual(DEFAULT_PARSER.parse_datetime(v), DATEUTIL_PARSER.parse_datetime(v), v)
+            self.assertEqual(DEFAULT_PARSER.parse_date(v), DATEUTIL_PARSER.parse_date(v), v)
+
+    def test_iso_only(self):
+        """ Test the ISO parser does not fall back to the dateutil parser """
+        self.assertEqual(ISO_PARSER.parse_datetime('2023-03-02 19:23:00'), datetime(2023, 3, 2, 19, 23))
+        with self.assertRaises(ValueError):
+            ISO_PARSER.parse_datetime('March 2, 2023 7:23 PM')
+
+    def test_epoch(self):
+        """ Test parsing Unix timestamps """
+        parser = DateParser(epoch='seconds')
+        expected = datetime(2023, 3, 2, 19, 23, tzinfo=timezone.utc)
+
+        self.assertEqual(parser.parse_datetime(1677784980), expected)
+        self.assertEqual(parser.parse_date(1677784980.5), date(2023, 3, 2))
+        self.assertEqual(DateParser(epoch='milliseconds').parse_datetime(1677784980000), expected)
+        with self.assertRaises(ValueError):
+            DateParser(epoch='minutes')
+
+    def test_model_date_parser(self):
+        """ Test model classes cast values using their date parser """
+        data = {'created': 1677784980000, 'birthday': '2000-01-31'}
+        obj = EpochDateModel(data, cast_types=True)
+
+        self.assertEqual(obj.created, datetime(2023, 3, 2, 19, 23, tzinfo=timezone.utc))
+        self.assertEqual(obj.birthday, date(2000, 1, 31))
+
+        obj = DateModel({'created': '03/02/2023 19:23:00'}, cast_types=True)
+        self.assertEqual(obj.created, datetime(2023, 3, 2, 19, 23))
+        with self.assertRaises(ValueError):
+            ISODateModel({'created': 'March 2, 2023'}, cast_types=True)
+
+    def test_parse_cache(self):
+        """ Test repeated values are parsed once when the parse cache is enabled """
+        parser = DateParser(cache_size=2)
+        self.assertEqual(DEFAULT_PARSER.cache_info(), (0, 0, 0, 0))
+
+        first = parser.parse_datetime('2023-03-02 19:23:00')
+        self.assertIs(parser.parse_datetime('2023-03-02 19:23:00'), first)
+        parser.parse_date('2023-03-02')
+        self.assertEqual(parser.cache_info(), (1, 2, 4, 2))
+
+        # The least recently used values are removed once the cache is full.
+        parser.parse_datetime('2023-03-03 19:23:00')
+        parser.parse_datetime('2023-03-04 19:23:00')
+        self.assertIsNot(parser.parse_datetime('2023-03-02 19:23:00'), first)
+        self.assertEqual(parser.cache_info().currsize, 3)
+
+        parser.cache_clear()
+        self.assertEqual(parser.cache_info(), (0, 0, 4, 0))
+
+    def test_parse_cache_threads(self):
+        """ Test the parse cache may be shared between threads """
+        parser = DateParser(cache_size=10)
+        values = [f'2023-03-{d:02d} 19:23:00' for d in range(1, 29)] * 20
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(parser.parse_datetime, values))
+
+        self.assertEqual(results, [DEFAULT_PARSER.parse_datetime(v) for v in values])
+        info = parser.cache_info()
+        self.assertEqual(info.hits + info.misses, len(values))
+        self.assertLessEqual(info.currsize, 10)
@@ -0,0 +1,71 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import json
+import types
+
+from python_easy_json import JSONObject
+from tests.base_test import BaseTestCase
+from tests.test_compact import CompactModel, DualModel
+from tests.test_lazy import SingleModel
+
+
+class InitModel(DualModel):
+    def __init__(self, data=None, cast_types=False, ordered=False):
+        super().__init__(data, cast_types=cast_types, ordered=ordered)
+        self.loaded = True
+
+
+class TestFromRecords(BaseTestCase):
+    """ Test creating objects from a list of records """
+
+    records = [
+        {'id': '10', 'created': '2023-03-02 19:23:00', 'topping': [{'id': '5001', 'type': 'None'}]},
+        '{"id": "11", "name": "second"}',
+        {'id': '12', 'color': 'red'},
+    ]
+
+    def test_from_records(self):
+        """ Test objects are the same as objects created one at a time """
+        for model in (JSONObject, DualModel, SingleModel, CompactModel, InitModel):
+            for cast_types in (False, True, 'lazy'):
+                objs = model.from_records(self.records, cast_types=cast_types)
+                expected = [model(r, cast_types=cast_types) for r in self.records]
+
+                self.assertIsInstance(objs, list)
+                self.assertEqual([type(o) for o in objs], [model] * 3)
+                self.assertEqual([o.to_dict() for o in objs], [o.to_dict() for o in expected])
+                self.assertEqual([dict(o) for o in objs], [dict(o) for o in expected])
+
+        self.assertTrue(InitModel.from_records(self.records)[0].loaded)
+
+    def test_lazy_records(self):
+        """ Test objects loading nested values when first accessed """
+        objs = DualModel.from_records(self.records, lazy=True)
+
+        self.assertIn('topping', objs[0].__lazy__)
+        self.assertEqual(objs[0].topping[0].id, '5001')
+
+    def test_generator(self):
+        """ Test returning a generator of objects """
+        objs = DualModel.from_records(iter(self.records), cast_types=True, generator=True)
+
+        self.assertIsInstance(objs, types.GeneratorType)
+        self.assertEqual(next(objs).id, 10)
+        self.assertEqual([o.id for o in objs], [11, 12])
+
+    def test_errors(self):
+        """ Test collecting records which fail to load """
+        records = [self.records[0], '{"id": ', {'id': 'abc', 'created': 'not a date'}, self.records[2]]
+        with self.assertRaises(json.JSONDecodeError):
+            DualModel.from_records(records, cast_types=True)
+
+        errors = list()
+        objs = DualModel.from_records(records, cast_types=True, errors=errors)
+
+        self.assertEqual([o.id for o in objs], [10, 12])
+        self.assertEqual([e[0] for e in errors], [1, 2])
+        self.assertIs(errors[1][1], records[2])
+        self.assertIsInstance(errors[0][2], json.JSONDecodeError)
+        self.assertIsInstance(errors[1][2], ValueError)
@@ -7,6 +7,7 @@ from enum import Enum, IntEnum
 
 from tests.base_test import BaseTestCase
 from python_easy_json import JSONObject
+from python_easy_json.schema import cast_value
 
 
 class TestEnum(Enum):
@@ -102,3 +103,18 @@ class TestJSONWithEnum(BaseTestCase):
         self.assertIsInstance(obj, JSONObject)
 
         self.assertEqual(obj.underscore_enum, TestUnderscoreEnum.data_with_hyphen)
+
+    def test_enum_lookup_tables(self):
+        """ Test Enum lookup tables return the same members as the Enum class lookups """
+        fields = ObjectWithEnum._get_schema().fields
+        self.assertIn(TestEnum, fields['test_enum'].enum_tables)
+
+        values = (1, 2.0, 'FirstValue', 'SecondValue', TestEnum.SecondValue)
+        for v in values:
+            self.assertIs(fields['test_enum'].cast(v), cast_value((TestEnum,), v), v)
+        self.assertIs(fields['underscore_enum'].cast('data-with-hyphen'), TestUnderscoreEnum.data_with_hyphen)
+
+        # Values missing from the tables still raise the Enum class lookup error.
+        for v in ('ThirdValue', '1'):
+            with self.assertRaises(KeyError):
+                fields['test_enum'].cast(v)
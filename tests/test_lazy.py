@@ -0,0 +1,227 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import json
+from datetime import datetime
+
+from python_easy_json import JSONObject, compact
+from tests.base_test import BaseTestCase
+from tests.test_compact import CompactModel, DualModel
+from tests.test_object_model import CakeModel, CakeBatterModel, CakeBatterTypeModel, CakeToppingTypeModel
+
+
+@compact
+class CompactCakeModel(CakeModel):
+    pass
+
+
+class SingleModel(DualModel, single_storage=True):
+    pass
+
+
+class FailingModel(JSONObject):
+    def __init__(self, *args, **kwargs):
+        raise TypeError('failed')
+
+
+class FailingParentModel(JSONObject):
+    child: FailingModel = None
+
+
+class MethodNameModel(JSONObject):
+    update: int
+    id: int = None
+
+
+class ClassAttributeModel(JSONObject):
+    tags = None
+
+    def label(self):
+        return 'label'
+
+
+class TestLazyObjects(BaseTestCase):
+    """ Test lazily loading nested values """
+
+    def test_lazy_nested_values(self):
+        """ Test nested values are converted when first accessed """
+        obj = CakeModel(self.json_data.nested_data_1, lazy=True)
+
+        self.assertEqual(set(obj.__lazy__.keys()), {'batters', 'topping'})
+        self.assertNotIn('batters', obj.__dict__)
+        self.assertIsInstance(obj.__data_dict__['batters'], dict)
+
+        self.assertIsInstance(obj.batters, CakeBatterModel)
+        self.assertIsInstance(obj.batters.batter[0], CakeBatterTypeModel)
+        self.assertNotIn('batters', obj.__lazy__)
+        # The converted value is cached.
+        self.assertIs(obj.batters, obj.__dict__['batters'])
+        self.assertIs(obj.batters, obj.__data_dict__['batters'])
+
+        self.assertIsInstance(obj.topping[0], CakeToppingTypeModel)
+        self.assertFalse(obj.__lazy__)
+
+    def test_lazy_cast_types(self):
+        """ Test nested values are cast when loaded """
+        obj = CakeModel(self.json_data.nested_data_1, cast_types=True, lazy=True)
+
+        self.assertEqual(obj.ppu, 0.55)
+        self.assertEqual(obj.batters.batter[0].id, 1001)
+
+    def test_lazy_unannotated_values(self):
+        """ Test lazily loading nested values of properties that are not annotated """
+        obj = JSONObject(self.json_data.nested_data_1, lazy=True)
+
+        self.assertIn('batters', obj.__lazy__)
+        self.assertEqual(obj.batters.batter[0].id, '1001')
+
+    def test_export_without_loading(self):
+        """ Test exporting objects does not load values that do not need to be cast """
+        data = json.loads(self.json_data.nested_data_1)
+        obj = CakeModel(data, lazy=True)
+        eager = CakeModel(data)
+
+        self.assertEqual(obj.to_dict(), eager.to_dict())
+        self.assertEqual(obj.to_dict(dates_to_str=True), eager.to_dict(dates_to_str=True))
+        self.assertEqual(obj.to_json(), eager.to_json())
+        self.assertEqual(len(obj), len(eager))
+        self.assertEqual(set(obj.__lazy__.keys()), {'batters', 'topping'})
+
+        # Exports needing objects or cast values load the raw values.
+        self.assertIsInstance(obj.to_dict(recursive=False)['batters'], CakeBatterModel)
+        obj = CakeModel(data, cast_types=True, lazy=True)
+        self.assertEqual(obj.to_dict(), CakeModel(data, cast_types=True).to_dict())
+
+    def test_set_lazy_value(self):
+        """ Test setting a property replaces the raw lazily loaded value """
+        obj = CakeModel(self.json_data.nested_data_1, lazy=True)
+        obj.batters = None
+
+        self.assertNotIn('batters', obj.__lazy__)
+        self.assertIsNone(obj.batters)
+        self.assertIsNone(obj.to_dict()['batters'])
+
+    def test_class_default_value(self):
+        """ Test class attribute defaults still work for objects that are not lazy """
+        obj = CakeModel(self.json_data.nested_data_1, lazy=True)
+        self.assertIsInstance(obj.batters, CakeBatterModel)
+
+        self.assertIsNone(CakeModel.batters)
+        self.assertIsNone(CakeModel({'id': 1}).batters)
+
+    def test_failed_lazy_value(self):
+        """ Test a value failing to load stays pending and raises again """
+        obj = FailingParentModel({'child': {'id': 1}}, lazy=True)
+
+        for _ in range(2):
+            with self.assertRaises(TypeError):
+                obj.child
+        self.assertIn('child', obj.__lazy__)
+        with self.assertRaises(TypeError):
+            obj.to_dict(recursive=False)
+
+    def test_method_names(self):
+        """ Test keys shadowing JSONObject methods resolve the same as with eager loading """
+        data = {'update': {'a': 1}, 'to_dict': [{'b': 2}], 'other': {'c': 3}}
+        eager = JSONObject(data)
+        obj = JSONObject(data, lazy=True)
+
+        self.assertEqual(set(obj.__lazy__.keys()), {'other'})
+        self.assertIsInstance(eager.update, JSONObject)
+        self.assertIsInstance(obj.update, JSONObject)
+        self.assertEqual(obj.update.a, 1)
+        self.assertEqual(obj.to_dict[0].b, eager.to_dict[0].b)
+
+        obj = MethodNameModel({'update': '1', 'id': '2'}, cast_types='lazy')
+        self.assertEqual(obj.update, 1)
+        self.assertEqual(obj.id, 2)
+        self.assertEqual(MethodNameModel({'update': '1'}, cast_types=True).update, 1)
+
+    def test_class_attribute_names(self):
+        """ Test keys shadowed by subclass attributes and methods resolve the same as with eager loading """
+        data = {'tags': [{'a': 1}], 'label': {'b': 2}, 'other': {'c': 3}}
+        eager = ClassAttributeModel(data)
+        obj = ClassAttributeModel(data, lazy=True)
+
+        self.assertEqual(set(obj.__lazy__.keys()), {'other'})
+        self.assertEqual(obj.tags[0].a, eager.tags[0].a)
+        self.assertIsInstance(obj.label, JSONObject)
+        self.assertEqual(obj.label.b, eager.label.b)
+        self.assertEqual(obj.to_dict(), eager.to_dict())
+
+    def test_compact_lazy_values(self):
+        """ Test lazily loading nested values of compact objects """
+        obj = CompactCakeModel(self.json_data.nested_data_1, lazy=True)
+
+        self.assertIn('batters', obj.__lazy__)
+        self.assertIsInstance(obj.batters, CakeBatterModel)
+        self.assertNotIn('batters', obj.__lazy__)
+        self.assertEqual(obj.to_dict(), CakeModel(self.json_data.nested_data_1).to_dict())
+
+
+class TestLazyCasting(BaseTestCase):
+    """ Test casting values when first accessed """
+
+    data = {'id': '10', 'created': '2023-03-02 19:23:00', 'name': 'lazy', 'topping': [{'id': '5001'}]}
+
+    def test_lazy_cast_values(self):
+        """ Test values are cast when first accessed """
+        obj = CompactModel(self.data, cast_types='lazy')
+        self.assertEqual(set(obj.__lazy__.keys()), {'id', 'created'})
+
+        self.assertEqual(obj.id, 10)
+        self.assertIsInstance(obj.created, datetime)
+        self.assertNotIn('created', obj.__lazy__)
+        # The cast value is cached.
+        self.assertIs(obj.created, obj.created)
+
+        # Nested objects are also cast when their values are accessed.
+        self.assertEqual(obj.topping[0].id, 5001)
+
+    def test_lazy_cast_default_model(self):
+        """ Test casting values when first accessed with the default data storage """
+        obj = DualModel(self.data, cast_types='lazy')
+
+        self.assertNotIn('created', obj.__dict__)
+        self.assertEqual(obj.__data_dict__['created'], '2023-03-02 19:23:00')
+        self.assertIsInstance(obj.created, datetime)
+        self.assertIs(obj.created, obj.__dict__['created'])
+        self.assertIs(obj.created, obj.__data_dict__['created'])
+        # Values already of the annotation type are not waiting to be cast.
+        self.assertNotIn('name', obj.__lazy__)
+
+    def test_export_raw_values(self):
+        """ Test values that have not been cast are exported unchanged """
+        obj = DualModel(self.data, cast_types='lazy')
+        self.assertEqual(obj.to_dict(), self.data)
+        self.assertEqual(json.loads(obj.to_json())['created'], '2023-03-02 19:23:00')
+
+        self.assertEqual(obj.id, 10)
+        self.assertEqual(obj.to_dict()['id'], 10)
+
+    def test_set_lazy_cast_value(self):
+        """ Test setting a property replaces the value waiting to be cast """
+        obj = DualModel(self.data, cast_types='lazy')
+        obj.id = 'abc'
+
+        self.assertEqual(obj.id, 'abc')
+        self.assertNotIn('id', obj.__lazy__)
+
+    def test_failed_lazy_cast(self):
+        """ Test a value failing to cast stays pending and raises again """
+        obj = DualModel({'id': '1', 'created': 'garbage'}, cast_types='lazy')
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                obj.created
+        self.assertIn('created', obj.__lazy__)
+        self.assertEqual(obj.to_dict()['created'], 'garbage')
+        self.assertEqual(obj.id, 1)
+
+    def test_single_storage_casts_values(self):
+        """ Test single storage objects cast values when loaded """
+        obj = SingleModel(self.data, cast_types='lazy')
+
+        self.assertEqual(obj.__dict__['id'], 10)
+        self.assertIsNone(obj.__lazy__)
@@ -0,0 +1,100 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import concurrent.futures
+import json
+import os
+import tempfile
+
+from python_easy_json import JSONObject
+from python_easy_json.parallel import ndjson_ranges
+from tests.base_test import BaseTestCase
+from tests.test_cache import CachedModel
+
+
+def count_ids(objs: list) -> int:
+    """ Reduce function summing the ids of the objects of a chunk """
+    return sum(o.id for o in objs)
+
+
+class TestParallel(BaseTestCase):
+    """ Test loading records in worker processes """
+
+    records = [{'id': str(x), 'type': 'Regular', 'batters': {'batter': [{'id': str(1000 + x)}]}} for x in range(50)]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.executor = concurrent.futures.ProcessPoolExecutor(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+        super().tearDownClass()
+
+    def write_ndjson(self, lines: list) -> str:
+        """ Write the lines to a temporary NDJSON file and return the path """
+        fd, path = tempfile.mkstemp(suffix='.ndjson')
+        with os.fdopen(fd, 'w') as f:
+            f.write('\n'.join(lines))
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_records(self):
+        """ Test objects are the same as objects created in this process """
+        expected = [o.to_dict() for o in CachedModel.from_records(self.records, cast_types=True)]
+        objs = list(CachedModel.iter_records_parallel(self.records, cast_types=True, chunk_size=7,
+                                                      executor=self.executor))
+        self.assertIsInstance(objs[0], CachedModel)
+        self.assertEqual([o.to_dict() for o in objs], expected)
+
+        # Chunks finishing out of order, and JSON documents.
+        objs = CachedModel.iter_records_parallel((json.dumps(r) for r in self.records), cast_types=True,
+                                                 chunk_size=7, preserve_order=False, executor=self.executor)
+        self.assertEqual(sorted((o.to_dict() for o in objs), key=lambda d: d['id']), expected)
+
+        objs = list(CachedModel.iter_records_parallel(self.records, workers=1, chunk_size=100))
+        self.assertEqual(len(objs), 50)
+        self.assertEqual(list(JSONObject.iter_records_parallel([], executor=self.executor)), [])
+        with self.assertRaises(ValueError):
+            list(CachedModel.iter_records_parallel(self.records, chunk_size=0))
+
+    def test_reduce(self):
+        """ Test reduce function results are returned instead of objects """
+        results = list(CachedModel.iter_records_parallel(self.records, cast_types=True, chunk_size=10,
+                                                         reduce=count_ids, executor=self.executor))
+        self.assertEqual(len(results), 5)
+        self.assertEqual(sum(results), sum(range(50)))
+
+    def test_invalid(self):
+        """ Test invalid records raise in this process, or are skipped """
+        records = self.records[:5] + ['{"id": ', 5]
+        with self.assertRaises(Exception):
+            list(CachedModel.iter_records_parallel(records, executor=self.executor))
+        objs = list(CachedModel.iter_records_parallel(records, skip_invalid=True, executor=self.executor))
+        self.assertEqual(len(objs), 5)
+
+    def test_ndjson(self):
+        """ Test loading byte ranges of a NDJSON file """
+        lines = [json.dumps(r) for r in self.records]
+        lines.insert(10, '')
+        path = self.write_ndjson(lines)
+
+        expected = [o.to_dict() for o in CachedModel.iter_ndjson(path, cast_types=True)]
+        objs = CachedModel.iter_ndjson_parallel(path, cast_types=True, chunk_size=200, executor=self.executor)
+        self.assertEqual([o.to_dict() for o in objs], expected)
+        self.assertEqual(sum(CachedModel.iter_ndjson_parallel(path, cast_types=True, chunk_size=300,
+                                                              reduce=count_ids, executor=self.executor)),
+                         sum(range(50)))
+
+    def test_ranges(self):
+        """ Test byte ranges cover the file and end on line boundaries """
+        path = self.write_ndjson(['a' * 10, 'b' * 3, '', 'c' * 25, 'd'])
+        with open(path, 'rb') as f:
+            data = f.read()
+        for size in (1, 5, 11, 12, 100):
+            ranges = list(ndjson_ranges(path, size))
+            self.assertEqual(b''.join(data[s:e] for s, e in ranges), data)
+            self.assertTrue(all(data[e - 1:e] == b'\n' for _, e in ranges[:-1]))
+        self.assertEqual(list(ndjson_ranges(self.write_ndjson([]))), [])
@@ -0,0 +1,124 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import copy
+import pickle
+
+from python_easy_json import JSONObject
+from tests.base_test import BaseTestCase
+from tests.test_cache import CachedModel, CompactCachedModel, SingleToppingModel
+from tests.test_changes import CompactTrackedModel, TrackedModel
+
+
+class CountingModel(CachedModel):
+    """ Model counting constructor calls """
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingModel.calls += 1
+        super().__init__(*args, **kwargs)
+
+
+class TestPickle(BaseTestCase):
+    """ Test pickling and copying objects """
+
+    data = {
+        'id': '10',
+        'type': 'donut',
+        'batters': {'batter': [{'id': '1001', 'type': 'Regular'}]},
+        'topping': [{'id': '5001', 'type': 'None'}, {'id': '5002', 'type': 'Glazed'}],
+    }
+
+    def round_trip(self, obj):
+        """ Return the unpickled object, after checking it exports the same data """
+        other = pickle.loads(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+        self.assertIs(type(other), type(obj))
+        self.assertEqual(other.to_dict(), obj.to_dict())
+        self.assertEqual(other.to_json(), obj.to_json())
+        return other
+
+    def test_state(self):
+        """ Test only the object data is pickled """
+        obj = CachedModel(self.data, cast_types=True)
+        obj.to_json()
+        data, hidden = obj.__getstate__()
+        self.assertIs(data, obj.__data_dict__)
+        self.assertIsNone(hidden)
+
+        other = self.round_trip(obj)
+        self.assertEqual(other.id, 10)
+        self.assertEqual(other.topping[1].type, 'Glazed')
+        self.assertEqual(set(vars(other)), set(vars(obj)) - {'__nested_keys__'})
+        self.assertIsNot(other.__export_cache__, obj.__export_cache__)
+        self.assertIsNot(other.__data_dict__, obj.__data_dict__)
+
+        # Values are not cast or converted to objects again.
+        CountingModel.calls = 0
+        obj = CountingModel(self.data, cast_types=True)
+        pickle.loads(pickle.dumps(obj))
+        self.assertEqual(CountingModel.calls, 1)
+
+    def test_hidden(self):
+        """ Test hidden properties and lazily loaded values are pickled """
+        obj = TrackedModel(self.data, cast_types=True, lazy=True)
+        obj.id = 11
+        obj.__note__ = 'hidden'
+
+        other = self.round_trip(obj)
+        self.assertEqual(other.__note__, 'hidden')
+        self.assertEqual(other.changed_fields(), ['id'])
+        self.assertEqual(other.topping[0].id, 5001)
+
+        obj = CompactTrackedModel({'id': '10', 'topping': [{'id': '5001'}]}, cast_types=True, lazy=True)
+        obj.id = 11
+        other = self.round_trip(obj)
+        self.assertEqual(other.changed_fields(), ['id'])
+        self.assertEqual(other.topping[0].id, 5001)
+
+    def test_storage(self):
+        """ Test compact and single storage objects """
+        obj = CompactCachedModel(self.data, cast_types=True)
+        obj.color = 'red'
+        self.assertEqual(self.round_trip(obj).color, 'red')
+        self.assertEqual(self.round_trip(SingleToppingModel({'id': 5001, 'type': 'None'})).id, 5001)
+
+    def test_copy(self):
+        """ Test copied objects do not share data """
+        obj = JSONObject(self.data)
+        other = copy.copy(obj)
+        other.id = '11'
+        self.assertEqual(obj.id, '10')
+        self.assertIs(other.batters, obj.batters)
+
+        other = copy.deepcopy(obj)
+        other.batters.batter[0].type = 'Chocolate'
+        self.assertEqual(obj.batters.batter[0].type, 'Regular')
+
+    def test_copy_hidden(self):
+        """ Test copied objects do not share lazily loaded values or tracked changes """
+        for copier in (copy.copy, copy.deepcopy):
+            for model in (TrackedModel, CompactTrackedModel):
+                for kwargs in ({'lazy': True, 'cast_types': True}, {'cast_types': 'lazy'}):
+                    obj = model(self.data, **kwargs)
+                    other = copier(obj)
+                    self.assertEqual(obj.id, 10)
+                    self.assertEqual(obj.topping[0].id, 5001)
+                    self.assertEqual(other.id, 10)
+                    self.assertEqual(other.topping[0].id, 5001)
+
+                    other.id = 11
+                    self.assertEqual(obj.changed_fields(), [])
+                    self.assertEqual(other.changed_fields(), ['id'])
+                    obj.topping = None
+                    self.assertEqual(obj.changed_fields(), ['topping'])
+                    self.assertEqual(other.changed_fields(), ['id'])
+
+    def test_dict_state(self):
+        """ Test objects pickled with their '__dict__', or slots, as state are loaded """
+        for obj in (CachedModel(self.data, cast_types=True), CompactCachedModel(self.data, cast_types=True)):
+            state = (None, {k: getattr(obj, k) for k in type(obj).__slots__ if k != '__export_cache__'}) \
+                if obj.__compact__ else dict(vars(obj), __export_cache__=None)
+            other = object.__new__(type(obj))
+            other.__setstate__(state)
+            self.assertEqual(other.to_dict(), obj.to_dict())
@@ -0,0 +1,175 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import io
+import json
+import os
+import tempfile
+import types
+
+from python_easy_json.readers import JSONArrayReader
+from tests.base_test import BaseTestCase
+from tests.test_compact import DualModel
+
+
+class TestNDJSONReader(BaseTestCase):
+    """ Test reading objects from NDJSON files """
+
+    records = [
+        {'id': '10', 'created': '2023-03-02 19:23:00', 'topping': [{'id': '5001', 'type': 'None'}]},
+        {'id': '11', 'name': 'second'},
+        {'id': '12', 'color': 'red'},
+    ]
+
+    def setUp(self):
+        self.text = '\n'.join(json.dumps(r) for r in self.records) + '\n\n'
+
+    def test_iter_ndjson(self):
+        """ Test reading binary and text file objects """
+        expected = [DualModel(r, cast_types=True).to_dict() for r in self.records]
+        for f in (io.BytesIO(self.text.encode('utf-8')), io.StringIO(self.text)):
+            objs = DualModel.iter_ndjson(f, cast_types=True)
+
+            self.assertIsInstance(objs, types.GeneratorType)
+            self.assertEqual([o.to_dict() for o in objs], expected)
+            # File objects are left open.
+            self.assertFalse(f.closed)
+
+    def test_iter_ndjson_path(self):
+        """ Test reading a file by path """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'records.ndjson')
+            with open(path, 'w') as f:
+                f.write(self.text)
+            objs = list(DualModel.iter_ndjson(path, lazy=True))
+            mapped = list(DualModel.iter_ndjson(path, lazy=True, memory_map=True))
+
+            # Empty files can not be memory mapped.
+            open(path, 'w').close()
+            self.assertEqual(list(DualModel.iter_ndjson(path, memory_map=True)), [])
+
+        self.assertEqual([o.id for o in objs], ['10', '11', '12'])
+        self.assertIn('topping', objs[0].__lazy__)
+        self.assertEqual([o.to_dict() for o in mapped], [o.to_dict() for o in objs])
+
+    def test_batch_size(self):
+        """ Test yielding lists of objects """
+        batches = list(DualModel.iter_ndjson(io.StringIO(self.text), batch_size=2))
+
+        self.assertEqual([len(b) for b in batches], [2, 1])
+        self.assertEqual(batches[1][0].id, '12')
+
+    def test_invalid_lines(self):
+        """ Test skipping and collecting lines which fail to load """
+        text = '{"id": "10"}\n{"id": \n[1, 2]\n{"id": "abc"}\n'
+        with self.assertRaises(json.JSONDecodeError):
+            list(DualModel.iter_ndjson(io.StringIO(text)))
+
+        objs = DualModel.iter_ndjson(io.StringIO(text), cast_types=True, skip_invalid=True)
+        self.assertEqual([o.id for o in objs], [10, 'abc'])
+
+        errors = list()
+        objs = DualModel.iter_ndjson(io.StringIO(text), errors=errors)
+        self.assertEqual([o.id for o in objs], ['10', 'abc'])
+        self.assertEqual([(e[0], e[1]) for e in errors], [(2, '{"id": \n'), (3, '[1, 2]\n')])
+        self.assertIsInstance(errors[1][2], TypeError)
+
+
+class TestJSONArrayReader(BaseTestCase):
+    """ Test reading objects from JSON arrays one element at a time """
+
+    items = [
+        {'id': '10', 'name': 'caf\u00e9 "one" [x]', 'topping': [{'id': '5001', 'type': 'None'}]},
+        {'id': '11', 'value': -12.5e3, 'flags': [True, False, None]},
+        {'id': '12', 'escaped': 'back\\slash \\" {'},
+    ]
+
+    def test_reader_chunks(self):
+        """ Test elements split between read chunks """
+        document = {'meta': {'skip': [1, {'a': '}]'}], 'items': 'no'}, 'data': {'count': 3, 'items': self.items}}
+        for text in (json.dumps(self.items), json.dumps(self.items, indent=2, ensure_ascii=False)):
+            for chunk_size in (1, 2, 3, 7, 64):
+                for f in (io.StringIO(text), io.BytesIO(text.encode('utf-8'))):
+                    self.assertEqual(list(JSONArrayReader(f, chunk_size)), self.items)
+
+                reader = JSONArrayReader(io.StringIO(json.dumps(document, ensure_ascii=False)), chunk_size)
+                reader.find('/data/items')
+                self.assertEqual(list(reader), self.items)
+
+        self.assertEqual(list(JSONArrayReader(io.StringIO(' [ ] '))), [])
+        self.assertEqual(list(JSONArrayReader(io.StringIO('[1, 23456, "7"]'), 2)), [1, 23456, '7'])
+
+    def test_json_pointer(self):
+        """ Test finding arrays using JSON pointers """
+        document = json.dumps({'a/b': [[], [{'c~d': [1, 2]}]], 'x': {}})
+        reader = JSONArrayReader(io.StringIO(document), 3)
+        reader.find('/a~1b/1/0/c~0d')
+        self.assertEqual(list(reader), [1, 2])
+
+        for pointer in ('/x/items', '/a~1b/2', '/a~1b/y', 'a~1b'):
+            reader = JSONArrayReader(io.StringIO(document), 3)
+            with self.assertRaises(ValueError):
+                reader.find(pointer)
+
+    def test_invalid_document(self):
+        """ Test invalid JSON documents raise errors """
+        for text in ('[{"id": 1}, {"id": ]', '[{"id": 1} {"id": 2}]', '[{"id": 1},', '{"id": 1}'):
+            with self.assertRaises(ValueError):
+                list(JSONArrayReader(io.StringIO(text), 4))
+
+    def test_iter_json_array(self):
+        """ Test reading objects from a file """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'export.json')
+            with open(path, 'w') as f:
+                json.dump({'data': {'items': self.items}}, f)
+
+            objs = DualModel.iter_json_array(path, '/data/items', cast_types=True)
+            self.assertIsInstance(objs, types.GeneratorType)
+            self.assertEqual([o.to_dict() for o in objs],
+                             [DualModel(i, cast_types=True).to_dict() for i in self.items])
+
+            batches = list(DualModel.iter_json_array(path, '/data/items', batch_size=2))
+            self.assertEqual([len(b) for b in batches], [2, 1])
+
+            objs = DualModel.iter_json_array(path, '/data/items', memory_map=True)
+            self.assertEqual([o.to_dict() for o in objs], [DualModel(i).to_dict() for i in self.items])
+
+    def test_invalid_elements(self):
+        """ Test skipping and collecting elements which fail to load """
+        text = '[{"id": "10"}, 5, {"id": "abc", "created": "not a date"}]'
+        with self.assertRaises(TypeError):
+            list(DualModel.iter_json_array(io.StringIO(text)))
+
+        objs = DualModel.iter_json_array(io.StringIO(text), cast_types=True, skip_invalid=True)
+        self.assertEqual([o.id for o in objs], [10])
+
+        errors = list()
+        objs = DualModel.iter_json_array(io.StringIO(text), cast_types=True, errors=errors)
+        self.assertEqual([o.id for o in objs], [10])
+        self.assertEqual([(e[0], e[1]) for e in errors], [(1, 5), (2, {'id': 'abc', 'created': 'not a date'})])
+
+    def test_malformed_elements(self):
+        """ Test malformed elements are skipped and collected, without reading the rest of the file """
+        items = ', '.join(json.dumps(i) for i in self.items)
+        text = f'[{{"id": tru}}, {items}, {{"id": "13", "x": [1, }}, "bad\\x", 1.2.3]'
+        for chunk_size in (1, 3, 64):
+            reader = JSONArrayReader(io.StringIO(text), chunk_size)
+            elements = reader.elements()
+            element, e = next(elements)
+            self.assertEqual(element, '{"id": tru}')
+            self.assertIsInstance(e, json.JSONDecodeError)
+            self.assertLess(len(reader.buf), 2 * chunk_size + 20)
+            self.assertEqual([v for v, e in elements if e is None], self.items)
+
+        with self.assertRaises(ValueError):
+            list(DualModel.iter_json_array(io.StringIO(text)))
+        objs = DualModel.iter_json_array(io.StringIO(text), skip_invalid=True)
+        self.assertEqual([o.to_dict() for o in objs], [DualModel(i).to_dict() for i in self.items])
+        errors = list()
+        objs = DualModel.iter_json_array(io.StringIO(text), errors=errors)
+        self.assertEqual(len(list(objs)), 3)
+        self.assertEqual([(x, element) for x, element, _ in errors],
+                         [(0, '{"id": tru}'), (4, '{"id": "13", "x": [1, }'), (5, '"bad\\x"'), (6, '1.2.3')])
+
@@ -0,0 +1,187 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import abc
+import functools
+import itertools
+from datetime import date, datetime
+from enum import Enum
+from typing import List
+
+from python_easy_json import JSONObject
+from python_easy_json.schema import cast_value, compile_union_dispatch
+from tests.base_test import BaseTestCase
+from tests.test_object_model import CakeModel, PythonTypingUnionModel
+
+
+class ParentModel(JSONObject):
+    id: int = None
+    created: datetime = None
+
+
+class ChildModel(ParentModel):
+    name: str = 'child'
+
+
+class ForwardRefModel(JSONObject):
+    # 'LaterModel' does not exist yet when this class is created.
+    later: 'LaterModel' = None
+    later_list: List['LaterModel'] = None
+
+
+class DispatchEnum(Enum):
+    five = '5'
+    abc = 'abc'
+
+
+class NoneAnnotationModel(JSONObject):
+    value: None = None
+    id: int = None
+
+
+class TestModelSchema(BaseTestCase):
+    """ Test the compiled model annotation schema """
+
+    def test_schema_cached_per_class(self):
+        """ Test that the schema is compiled once and is not shared with subclasses """
+        ParentModel({'id': '1'}, cast_types=True)
+        schema = ParentModel._get_schema()
+        ParentModel({'id': '2'}, cast_types=True)
+
+        self.assertIs(schema, ParentModel._get_schema())
+        self.assertIsNot(schema, ChildModel._get_schema())
+
+        self.assertIn('id', schema.fields)
+        self.assertNotIn('name', schema.fields)
+        self.assertIn('name', ChildModel._get_schema().fields)
+        self.assertEqual(ChildModel._get_schema().fields['id'].types, (int,))
+
+    def test_invalidate_schema(self):
+        """ Test that invalidating the schema picks up class changes, including subclasses """
+        ChildModel({'id': '1'})
+        self.assertEqual(ChildModel._get_schema().defaults, [('name', 'child')])
+
+        ChildModel.name = 'changed'
+        ParentModel.invalidate_schema()
+        try:
+            obj = ChildModel({'id': '1'}, cast_types=True)
+            self.assertEqual(obj.name, 'changed')
+            self.assertEqual(obj.id, 1)
+        finally:
+            ChildModel.name = 'child'
+            ParentModel.invalidate_schema()
+
+    def test_changed_default(self):
+        """ Test changing class attribute defaults after objects were constructed discards the schema """
+        self.assertEqual(ChildModel({'id': 1}).name, 'child')
+        self.assertEqual(ChildModel({'id': 1}).to_dict(), {'id': 1, 'name': 'child'})
+        try:
+            ChildModel.name = 'changed'
+            obj = ChildModel({'id': 1})
+            self.assertEqual(obj.name, 'changed')
+            self.assertEqual(obj.to_dict(), {'id': 1, 'name': 'changed'})
+
+            ParentModel({'id': 1}).to_dict()
+            ParentModel.created = datetime(2023, 3, 2)
+            self.assertEqual(ParentModel({'id': 1}).to_dict()['created'], datetime(2023, 3, 2))
+            del ParentModel.created
+            self.assertNotIn('created', ParentModel({'id': 1}).to_dict())
+        finally:
+            ChildModel.name = 'child'
+            ParentModel.created = None
+        self.assertEqual(ChildModel({'id': 1}).to_dict(), {'id': 1, 'name': 'child'})
+
+    def test_unchanged_defaults(self):
+        """ Test the schema is not compiled again while the class attributes are unchanged """
+        CakeModel({'id': '1'})
+        schema = CakeModel._get_schema()
+        CakeModel({'id': '1', 'batters': {'batter': []}}, lazy=True, cast_types='lazy')
+        self.assertIs(CakeModel._get_schema(), schema)
+        self.assertFalse(schema.stale)
+
+    def test_abstract_model(self):
+        """ Test model classes may be combined with classes using another metaclass """
+        class AbstractModel(JSONObject, abc.ABC):
+            id: int = None
+
+            @abc.abstractmethod
+            def label(self) -> str:
+                pass
+
+        class ConcreteModel(AbstractModel):
+            def label(self) -> str:
+                return f'id {self.id}'
+
+        with self.assertRaises(TypeError):
+            AbstractModel({'id': 1})
+        self.assertEqual(ConcreteModel({'id': '1'}, cast_types=True).label(), 'id 1')
+
+    def test_union_dispatch_dates(self):
+        """ Test date and datetime members, which replace the value, in every member order """
+        members = (date, datetime, float, int, str, bool, bytes, DispatchEnum)
+        values = (5, 1.5, True, '5', 'abc', '2026-10-05', '2026-10-05 10:30:00', b'12', {'id': 1}, [1])
+        for types in itertools.permutations(members, 3):
+            if date in types or datetime in types:
+                self.assertDispatch(types, values)
+
+    def test_none_annotation(self):
+        """ Test properties annotated with values which are not classes are treated as not annotated """
+        field = NoneAnnotationModel._get_schema().fields['value']
+        self.assertEqual(field.types, ())
+        self.assertIs(field.nested_cls, JSONObject)
+
+        obj = NoneAnnotationModel({'value': '1', 'id': '2'}, cast_types=True)
+        self.assertEqual(obj.value, '1')
+        self.assertEqual(obj.id, 2)
+        obj = NoneAnnotationModel({'value': {'a': 1}})
+        self.assertIsInstance(obj.value, JSONObject)
+        self.assertEqual(obj.value.a, 1)
+        self.assertEqual(NoneAnnotationModel({'value': 3}, cast_types='lazy').value, 3)
+
+    def test_forward_references(self):
+        """ Test that forward references are resolved once the referenced class exists """
+        global LaterModel
+
+        if 'LaterModel' not in globals():
+            self.assertIn('later', ForwardRefModel._get_schema().unresolved)
+
+        class LaterModel(JSONObject):
+            value: int = None
+
+        obj = ForwardRefModel({'later': {'value': '5'}, 'later_list': [{'value': '6'}]}, cast_types=True)
+
+        self.assertFalse(ForwardRefModel._get_schema().unresolved)
+        self.assertIsInstance(obj.later, LaterModel)
+        self.assertEqual(obj.later.value, 5)
+        self.assertIsInstance(obj.later_list[0], LaterModel)
+        self.assertEqual(obj.later_list[0].value, 6)
+
+    def assertDispatch(self, types: tuple, values: tuple):
+        """ Assert casting with the dispatch table is the same as trying each annotation type in order """
+        cast = functools.partial(cast_value, types, dispatch=compile_union_dispatch(types))
+        for v in values:
+            try:
+                expected = cast_value(types, v)
+            except Exception as e:
+                with self.assertRaises(type(e), msg=(types, v)):
+                    cast(v)
+                continue
+            result = cast(v)
+            self.assertIs(type(result), type(expected), (types, v))
+            if not isinstance(expected, JSONObject):
+                self.assertEqual(result, expected, (types, v))
+
+    def test_union_dispatch(self):
+        """ Test Union annotations cast values the same as trying each annotation type in order """
+        unions = (
+            (str, int), (int, str), (int, float), (float, int), (bytes, int), (int, bytes), (bool, str),
+            (datetime, str), (int, CakeModel),
+        )
+        values = ('20', 'abc', '1.5', 20, 0, 1.5, True, b'12', {'id': 1}, [1])
+        for types in unions:
+            self.assertDispatch(types, values)
+
+        fields = PythonTypingUnionModel._get_schema().fields
+        self.assertEqual(fields['data'].cast(20), 20)
+        self.assertEqual(fields['data'].cast(1.5), '1.5')
@@ -0,0 +1,129 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import json
+from datetime import datetime
+from typing import List
+
+from python_easy_json import JSONObject, to_columns
+from tests.base_test import BaseTestCase
+
+
+class ToppingModel(JSONObject, single_storage=True):
+    id: int = None
+    type: str = None
+
+
+class DualToppingModel(JSONObject):
+    id: int = None
+    type: str = None
+
+
+class SingleStorageModel(JSONObject, single_storage=True):
+    id: int = None
+    created: datetime = None
+    name: str = 'single'
+    topping: List[ToppingModel] = None
+
+
+class DualStorageModel(JSONObject):
+    id: int = None
+    created: datetime = None
+    name: str = 'single'
+    topping: List[DualToppingModel] = None
+
+
+class SingleStorageInitModel(SingleStorageModel):
+    """ Test class for validating an overridden init method """
+
+    def __init__(self, *args, **kwargs):
+        self.method = 'POST'
+        super().__init__(*args, **kwargs)
+
+
+class SingleStoragePrivateModel(JSONObject, single_storage=True):
+    """ Test class setting a private attribute """
+    id: int = None
+    name: str = 'single'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__secret = 'hidden'
+
+    def secret(self) -> str:
+        return self.__secret
+
+
+class TestSingleStorage(BaseTestCase):
+    """ Test models storing data only in the object '__dict__' """
+
+    data = {'id': '10', 'created': '2023-03-02 19:23:00', 'topping': [{'id': '5001', 'type': 'None'}], 'extra': 1}
+
+    def test_single_storage(self):
+        """ Test data is only stored once """
+        obj = SingleStorageModel(self.data, cast_types=True)
+
+        self.assertIs(obj.__data_dict__, obj.__dict__)
+        self.assertNotIn('__data_dict__', obj.__dict__)
+        self.assertNotIn('__nested_keys__', obj.__dict__)
+        self.assertEqual(list(obj.__dict__.keys()), ['id', 'created', 'topping', 'extra', 'name'])
+
+        self.assertEqual(obj.id, 10)
+        self.assertIsInstance(obj.created, datetime)
+        self.assertIsInstance(obj.topping[0], ToppingModel)
+        self.assertEqual(obj.topping[0].id, 5001)
+        self.assertNotIn('__data_dict__', obj.topping[0].__dict__)
+
+    def test_export_matches_dual_storage(self):
+        """ Test exported data is the same as a default model """
+        obj = SingleStorageModel(self.data, cast_types=True)
+        dual = DualStorageModel(self.data, cast_types=True)
+
+        self.assertEqual(obj.to_json(), dual.to_json())
+        self.assertEqual(obj.to_dict(), dual.to_dict())
+        self.assertEqual(dict(obj), dict(dual))
+        self.assertEqual(len(obj), len(dual))
+
+    def test_update(self):
+        """ Test updating properties of a single storage object """
+        obj = SingleStorageModel(self.data)
+        obj.update({'id': 20})
+        obj.update(name='updated')
+        obj.color = 'red'
+        obj = obj + JSONObject({'size': 'large'})
+
+        self.assertEqual(obj.id, 20)
+        self.assertEqual(len(obj), 7)
+        data = json.loads(obj.to_json())
+        self.assertEqual(data['name'], 'updated')
+        self.assertEqual(data['color'], 'red')
+        self.assertEqual(data['size'], 'large')
+
+    def test_overridden_init_method(self):
+        """ Test properties set before calling the base constructor are kept """
+        obj = SingleStorageInitModel({'id': '1'}, cast_types=True)
+
+        self.assertEqual(obj.method, 'POST')
+        self.assertEqual(obj.to_dict(), {'method': 'POST', 'id': 1})
+
+    def test_empty_object(self):
+        """ Test a single storage object without data """
+        obj = SingleStorageModel()
+
+        self.assertEqual(obj.to_dict(), {'name': 'single'})
+        self.assertIsNone(obj.id)
+
+    def test_private_attributes(self):
+        """ Test private attributes are not exported """
+        obj = SingleStoragePrivateModel({'id': '10', 'extra': 1}, cast_types=True)
+        expected = {'id': 10, 'extra': 1, 'name': 'single'}
+
+        self.assertEqual(obj.secret(), 'hidden')
+        self.assertIn('_SingleStoragePrivateModel__secret', obj.__dict__)
+        self.assertEqual(obj.to_dict(), expected)
+        self.assertEqual(json.loads(obj.to_json()), expected)
+        self.assertEqual(dict(obj), expected)
+        self.assertEqual(len(obj), 3)
+        self.assertEqual({k: list(v) for k, v in to_columns([obj]).items()}, {k: [v] for k, v in expected.items()})
+        self.assertEqual(JSONObject.from_bytes(obj.to_bytes()).to_dict(), expected)
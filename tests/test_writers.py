@@ -0,0 +1,105 @@
+#
+# This file is subject to the terms and conditions defined in the
+# file 'LICENSE', which is part of this source code package.
+#
+import io
+import json
+import os
+import tempfile
+
+from python_easy_json import JSONObject, write_objects
+from tests.base_test import BaseTestCase, json_formatting
+from tests.test_compact import DualModel
+
+
+class _CountingFile(io.StringIO):
+    """ Text file recording the size of each write """
+    def __init__(self):
+        super().__init__()
+        self.writes = list()
+
+    def write(self, s):
+        self.writes.append(len(s))
+        return super().write(s)
+
+
+class TestJSONWriters(BaseTestCase):
+    """ Test writing objects to JSON files """
+
+    records = [
+        {'id': '10', 'created': '2023-03-02 19:23:00', 'topping': [{'id': '5001', 'type': 'None'}]},
+        {'id': '11', 'name': 'second'},
+        {'id': '12', 'color': 'red', 'batters': {'batter': [{'id': '1001'}]}},
+    ]
+
+    def setUp(self):
+        self.objs = [DualModel(r, cast_types=True) for r in self.records]
+
+    def test_write_json(self):
+        """ Test writing a single object matches to_json() """
+        obj = self.objs[0]
+        for indent in (None, 2):
+            text = io.StringIO()
+            obj.write_json(text, indent=indent)
+            binary = io.BytesIO()
+            obj.write_json(binary, indent=indent)
+
+            self.assertEqual(text.getvalue(), obj.to_json(indent=indent))
+            self.assertEqual(binary.getvalue().decode('utf-8'), obj.to_json(indent=indent))
+
+        # Lazily loaded values are written from the raw value, like to_json().
+        lazy_obj = JSONObject(self.records[0], lazy=True)
+        text = io.StringIO()
+        lazy_obj.write_json(text)
+        self.assertEqual(text.getvalue(), lazy_obj.to_json())
+        self.assertIn('topping', lazy_obj.__lazy__)
+
+    @json_formatting
+    def test_buffer_size(self):
+        """ Test the output is written in chunks of at least the buffer size """
+        obj = JSONObject({f'key_{x}': 'value' * 10 for x in range(1000)})
+        f = _CountingFile()
+        obj.write_json(f, buffer_size=1024)
+
+        self.assertEqual(f.getvalue(), obj.to_json())
+        self.assertGreater(len(f.writes), 10)
+        self.assertTrue(all(size >= 1024 for size in f.writes[:-1]))
+        self.assertTrue(all(size < 2048 for size in f.writes))
+
+        with self.assertRaises(ValueError):
+            obj.write_json(io.StringIO(), buffer_size=0)
+
+    @json_formatting
+    def test_write_objects_array(self):
+        """ Test writing a JSON array matches encoding a list of the objects data """
+        for indent in (None, 4):
+            expected = json.dumps([json.loads(o.to_json()) for o in self.objs], indent=indent)
+            f = io.StringIO()
+            count = write_objects((o for o in self.objs), f, indent=indent, buffer_size=16)
+
+            self.assertEqual(count, 3)
+            self.assertEqual(f.getvalue(), expected)
+
+            f = io.StringIO()
+            self.assertEqual(write_objects([], f, indent=indent), 0)
+            self.assertEqual(f.getvalue(), '[]')
+
+        # Round trip with the streaming reader, nested objects are exported as JSON strings by to_json().
+        f = io.BytesIO()
+        write_objects(self.objs, f)
+        f.seek(0)
+        self.assertEqual([o.to_json() for o in DualModel.iter_json_array(f, cast_types=True)],
+                         [o.to_json() for o in self.objs])
+
+    def test_write_objects_ndjson(self):
+        """ Test writing one object per line to a file path """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'records.ndjson')
+            count = write_objects(iter(self.objs), path, ndjson=True)
+            with open(path) as f:
+                lines = f.read().splitlines()
+            objs = list(DualModel.iter_ndjson(path, cast_types=True))
+
+        self.assertEqual(count, 3)
+        self.assertEqual(lines, [o.to_json() for o in self.objs])
+        self.assertEqual([o.to_json() for o in objs], lines)